@@ -0,0 +1,131 @@
+"""
+Asset Manager for Fantasy Squad Tactics
+
+Loads every image once and hands out ready-to-blit surfaces:
+- Served as subsurfaces of the packed atlas (graphics/atlas.png, see build_atlas.py) when it has been built,
+  so all art costs a single file read and decode; otherwise each PNG is read on first use. An atlas older than
+  any of its source images is ignored, so edited art shows up without rebuilding it.
+- Decoded, convert_alpha()'d and scaled on first use (or at startup via preload), then cached
+- Unit sprites keyed by faction and class, status icons and buttons keyed by state
+- Missing or unreadable files are recorded once and return None instead of raising every frame
+"""
+
+import json
+import os
+import sys
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import pygame
+
+Size = Tuple[int, int]
+
+ATLAS_IMAGE = "atlas.png"
+ATLAS_INDEX = "atlas.json"
+
+BUTTON_NAMES = ("move", "attack", "special")
+BUTTON_STATES = ("selected", "normal", "faded")
+STATUS_ICONS = ("attack", "move")
+
+
+def resource_path(*parts: str) -> str:
+    """Path of a bundled data file: next to the sources, or in the unpacked bundle of a PyInstaller build"""
+    base = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base, *parts)
+
+
+def faction_folder(faction: str) -> str:
+    """Folder name of a faction's sprites, e.g. 'Kingdom of Cantrell' -> 'Kingdom_of_Cantrell'"""
+    return faction.replace(" ", "_")
+
+
+class AssetManager:
+    """Cache of converted (and optionally scaled) surfaces keyed by file name and size"""
+
+    def __init__(self, root: Optional[str] = None, use_atlas: bool = True):
+        self.root = root if root is not None else resource_path("graphics")
+        self._surfaces: Dict[Tuple[str, Optional[Size]], Optional[pygame.Surface]] = {}
+        self.missing: Set[str] = set()  # Paths that failed to load
+        self.loads = 0  # Files actually read from disk
+        self.atlas: Optional[pygame.Surface] = None
+        self.atlas_rects: Dict[str, pygame.Rect] = {}
+        self._atlas_checked = not use_atlas
+
+    def load_atlas(self) -> None:
+        """Decode the packed atlas once, if it was built and is current; its images are then served as subsurfaces"""
+        self._atlas_checked = True
+        try:
+            index_path = os.path.join(self.root, ATLAS_INDEX)
+            with open(index_path) as index_file:
+                index = json.load(index_file)
+            if self.atlas_is_stale(os.path.getmtime(index_path), index["sprites"]):
+                return  # Art was edited since the atlas was built: use the individual files
+            atlas = pygame.image.load(os.path.join(self.root, index["image"])).convert_alpha()
+        except (OSError, ValueError, KeyError, pygame.error):
+            return  # No atlas: fall back to the individual files
+        self.loads += 1
+        self.atlas = atlas
+        self.atlas_rects = {name: pygame.Rect(rect) for name, rect in index["sprites"].items()}
+
+    def atlas_is_stale(self, built: float, names: Iterable[str]) -> bool:
+        """Whether any source image still on disk (a PyInstaller bundle has none) changed after the atlas was built"""
+        for name in names:
+            path = os.path.join(self.root, name)
+            if os.path.exists(path) and os.path.getmtime(path) > built:
+                return True
+        return False
+
+    def image(self, name: str, size: Optional[Size] = None) -> Optional[pygame.Surface]:
+        """Surface for graphics/<name>, scaled to size if given. None if the file is missing."""
+        key = (name, size)
+        if key in self._surfaces:
+            return self._surfaces[key]
+
+        if not self._atlas_checked:
+            self.load_atlas()
+
+        if size is not None:
+            original = self.image(name)
+            surface = pygame.transform.scale(original, size) if original else None
+        elif name in self.atlas_rects:
+            surface = self.atlas.subsurface(self.atlas_rects[name])
+        else:
+            path = os.path.join(self.root, name)
+            try:
+                surface = pygame.image.load(path).convert_alpha()
+                self.loads += 1
+            except (FileNotFoundError, pygame.error):
+                self.missing.add(path)
+                surface = None
+
+        self._surfaces[key] = surface
+        return surface
+
+    def unit_sprite(self, faction: str, unit_class: str, size: Optional[Size] = None) -> Optional[pygame.Surface]:
+        return self.image(f"{faction_folder(faction)}/{unit_class.lower()}.png", size)
+
+    def unit_portrait(self, faction: str, unit_class: str, size: Size) -> Optional[pygame.Surface]:
+        """Unit sprite for the info panel, falling back to the placeholder image"""
+        return self.unit_sprite(faction, unit_class, size) or self.image("placeholder.png", size)
+
+    def status_icon(self, kind: str, done: bool, size: Optional[Size] = None) -> Optional[pygame.Surface]:
+        """Attack/move status overlay, e.g. attack-done.png or move-available.png"""
+        return self.image(f"{kind}-{'done' if done else 'available'}.png", size)
+
+    def button(self, name: str, state: str, size: Optional[Size] = None) -> Optional[pygame.Surface]:
+        """Button image for a state: 'selected', 'normal' or 'faded'"""
+        suffix = "" if state == "normal" else f"-{state}"
+        return self.image(f"button-{name}{suffix}.png", size)
+
+    def preload(self, cell_size: int, button_size: Size, unit_types: Iterable[Tuple[str, str]] = ()) -> None:
+        """Decode and scale everything a frame needs, so the first frames don't hit the disk"""
+        for name in ("legal-moves.png", "selected-unit.png", "has-1-effect.png", "has-2-effect.png",
+                     "has-3-effect.png"):
+            self.image(name)
+        for kind in STATUS_ICONS:
+            for done in (False, True):
+                self.status_icon(kind, done, (cell_size, cell_size))
+        for name in BUTTON_NAMES:
+            for state in BUTTON_STATES:
+                self.button(name, state, button_size)
+        for faction, unit_class in unit_types:
+            self.unit_sprite(faction, unit_class)
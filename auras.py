@@ -0,0 +1,232 @@
+"""
+Aura Fields for Fantasy Squad Tactics
+
+Area-of-effect bonuses are kept as coverage grids, one per faction per aura type:
+- Passive auras (Spotter) follow their source unit and update when it is placed, moves or dies
+- Pulsed auras (Warcry, Vigilance) are stamped where they were cast and expire after a number of turns
+- Looking up a bonus is a single array read of the coverage count under a unit
+- Changes record their inverse in an attached UndoLog (see undo_log.py); pulse changes update an attached
+  Zobrist key (see zobrist.py)
+"""
+
+import copy
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+Position = Tuple[int, int]
+
+
+@dataclass
+class AuraDefinition:
+    """How an aura ability covers the board (radii match the ability registry)"""
+    radius: int
+    passive: bool  # Follows the source unit instead of being cast once
+    covers_source: bool = False  # Whether the source unit benefits from its own aura
+    turns: int = 0  # For pulsed auras: number of end_turn calls the pulse survives
+
+
+AURA_DEFINITIONS = {
+    "Spotter": AuraDefinition(radius=4, passive=True),
+    "Warcry": AuraDefinition(radius=3, passive=False, turns=1),  # Lasts until the end of the caster's turn
+    "Vigilance": AuraDefinition(radius=2, passive=False, turns=2),  # Lasts through the enemy's next turn
+}
+
+
+@dataclass
+class AuraPulse:
+    """A cast aura stamped onto the board"""
+    aura: str
+    faction: str
+    position: Position
+    source_unit_id: str
+    turns_remaining: int
+
+
+def passive_aura_of(unit) -> Optional[str]:
+    """Name of the passive aura this unit projects, if any"""
+    definition = AURA_DEFINITIONS.get(unit.ability_name)
+    return unit.ability_name if definition and definition.passive else None
+
+
+class AuraFields:
+    """Coverage count grids keyed by (aura name, faction)"""
+
+    def __init__(self, shape: Tuple[int, int]):
+        self.shape = shape
+        self.fields: Dict[Tuple[str, str], np.ndarray] = {}
+        self.sources: Dict[str, Tuple[str, str, Position]] = {}  # unit_id -> (aura, faction, position)
+        self.pulses: List[AuraPulse] = []
+        self.version = 0  # Bumped whenever any coverage changes
+        self.undo_log = None  # UndoLog recording how to reverse each change
+        self.zobrist = None  # ZobristHash told about pulse changes
+
+    def clone(self) -> "AuraFields":
+        clone = copy.copy(self)
+        clone.fields = {key: field.copy() for key, field in self.fields.items()}
+        clone.sources = dict(self.sources)
+        clone.pulses = [copy.copy(pulse) for pulse in self.pulses]
+        clone.undo_log = clone.zobrist = None
+        return clone
+
+    def _stamp(self, aura: str, faction: str, position: Position, delta: int) -> None:
+        """Add delta to every tile within the aura's radius of position"""
+        field = self.fields.get((aura, faction))
+        if field is None:
+            field = self.fields[(aura, faction)] = np.zeros(self.shape, dtype=np.int16)
+
+        radius = AURA_DEFINITIONS[aura].radius
+        row, col = position
+        field[max(0, row - radius):row + radius + 1, max(0, col - radius):col + radius + 1] += delta
+        self.version += 1
+
+    # Undo
+
+    def _record_source(self, unit_id: str) -> None:
+        if self.undo_log is not None:
+            self.undo_log.record(self._restore_source, unit_id, self.sources.get(unit_id))
+
+    def _restore_source(self, unit_id: str, source: Optional[Tuple[str, str, Position]]) -> None:
+        current = self.sources.pop(unit_id, None)
+        if current:
+            self._stamp(current[0], current[1], current[2], -1)
+        if source:
+            self.sources[unit_id] = source
+            self._stamp(source[0], source[1], source[2], 1)
+
+    def _pulses_changed(self) -> None:
+        if self.zobrist is not None:
+            self.zobrist.on_pulses_changed(self.pulses)
+
+    def _remove_last_pulse(self) -> None:
+        pulse = self.pulses.pop()
+        self._stamp(pulse.aura, pulse.faction, pulse.position, -1)
+        self._pulses_changed()
+
+    def _restore_pulses(self, pulses: List[AuraPulse], turns: List[int]) -> None:
+        for pulse, turns_remaining in zip(pulses, turns):
+            if pulse.turns_remaining <= 0:  # Expired by advance_turn
+                self._stamp(pulse.aura, pulse.faction, pulse.position, 1)
+            pulse.turns_remaining = turns_remaining
+        self.pulses = pulses
+        self._pulses_changed()
+
+    # Board events (called by UnitPositions)
+
+    def on_place(self, unit_id: str, unit) -> None:
+        aura = passive_aura_of(unit)
+        if aura:
+            self._record_source(unit_id)
+            self.sources[unit_id] = (aura, unit.faction, unit.position)
+            self._stamp(aura, unit.faction, unit.position, 1)
+
+    def on_move(self, unit_id: str, new_position: Position) -> None:
+        source = self.sources.get(unit_id)
+        if source:
+            self._record_source(unit_id)
+            aura, faction, old_position = source
+            self._stamp(aura, faction, old_position, -1)
+            self._stamp(aura, faction, new_position, 1)
+            self.sources[unit_id] = (aura, faction, new_position)
+
+    def on_remove(self, unit_id: str) -> None:
+        if unit_id in self.sources:
+            self._record_source(unit_id)
+        source = self.sources.pop(unit_id, None)
+        if source:
+            aura, faction, position = source
+            self._stamp(aura, faction, position, -1)
+
+    # Pulsed auras
+
+    def add_pulse(self, aura: str, unit) -> None:
+        """Stamp a cast aura (Warcry, Vigilance) at the caster's current position"""
+        pulse = AuraPulse(aura, unit.faction, unit.position, unit.unit_id, AURA_DEFINITIONS[aura].turns)
+        if self.undo_log is not None:
+            self.undo_log.record(self._remove_last_pulse)
+        self.pulses.append(pulse)
+        self._stamp(aura, pulse.faction, pulse.position, 1)
+        self._pulses_changed()
+
+    def restore_pulse(self, pulse: AuraPulse) -> None:
+        """Stamp a pulse carried over from a saved game"""
+        if self.undo_log is not None:
+            self.undo_log.record(self._remove_last_pulse)
+        self.pulses.append(pulse)
+        self._stamp(pulse.aura, pulse.faction, pulse.position, 1)
+        self._pulses_changed()
+
+    def advance_turn(self) -> None:
+        """Count down pulsed auras at end of turn and remove the ones that expire"""
+        if self.undo_log is not None and self.pulses:
+            self.undo_log.record(self._restore_pulses, self.pulses, [pulse.turns_remaining for pulse in self.pulses])
+        remaining = []
+        for pulse in self.pulses:
+            pulse.turns_remaining -= 1
+            if pulse.turns_remaining <= 0:
+                self._stamp(pulse.aura, pulse.faction, pulse.position, -1)
+            else:
+                remaining.append(pulse)
+        self.pulses = remaining
+        self._pulses_changed()
+
+    # Queries
+
+    def coverage(self, aura: str, faction: str, position: Position) -> int:
+        """Number of sources of this aura covering a tile for a faction"""
+        field = self.fields.get((aura, faction))
+        return int(field[position]) if field is not None else 0
+
+    def _own_sources(self, aura: str, unit) -> List[Position]:
+        """Positions where this unit projects the given aura (its passive aura and any pulses it cast)"""
+        positions = [pulse.position for pulse in self.pulses
+                     if pulse.aura == aura and pulse.source_unit_id == unit.unit_id]
+        source = self.sources.get(unit.unit_id)
+        if source and source[0] == aura:
+            positions.append(source[2])
+        return positions
+
+    def bonus_count(self, aura: str, unit) -> int:
+        """Coverage under a unit, not counting auras the unit projects itself"""
+        count = self.coverage(aura, unit.faction, unit.position)
+        if count and not AURA_DEFINITIONS[aura].covers_source:
+            radius = AURA_DEFINITIONS[aura].radius
+            row, col = unit.position
+            count -= sum(1 for r, c in self._own_sources(aura, unit)
+                         if max(abs(r - row), abs(c - col)) <= radius)
+        return count
+
+    def bonus_field(self, aura: str, unit) -> np.ndarray:
+        """Coverage grid for the unit's faction, minus the auras the unit projects itself"""
+        field = self.fields.get((aura, unit.faction))
+        field = field.copy() if field is not None else np.zeros(self.shape, dtype=np.int16)
+        if not AURA_DEFINITIONS[aura].covers_source:
+            radius = AURA_DEFINITIONS[aura].radius
+            for row, col in self._own_sources(aura, unit):
+                field[max(0, row - radius):row + radius + 1, max(0, col - radius):col + radius + 1] -= 1
+        return field
+
+    def sources_covering(self, aura: str, unit) -> List[str]:
+        """Ids of the other units whose aura covers this unit (for effect descriptions)"""
+        candidates = [(source_id, position) for source_id, (source_aura, faction, position) in self.sources.items()
+                      if source_aura == aura and faction == unit.faction]
+        candidates += [(pulse.source_unit_id, pulse.position) for pulse in self.pulses
+                       if pulse.aura == aura and pulse.faction == unit.faction]
+
+        radius = AURA_DEFINITIONS[aura].radius
+        row, col = unit.position
+        return [source_id for source_id, (r, c) in candidates
+                if source_id != unit.unit_id and max(abs(r - row), abs(c - col)) <= radius]
+
+    def range_bonus(self, unit) -> int:
+        """+1 per covering Spotter, +1 while inside a Warcry"""
+        return self.bonus_count("Spotter", unit) + (1 if self.bonus_count("Warcry", unit) else 0)
+
+    def attack_bonus(self, unit) -> int:
+        """+1 ATK while inside a Warcry"""
+        return 1 if self.bonus_count("Warcry", unit) else 0
+
+    def has_first_strike(self, unit) -> bool:
+        """Inside a friendly Vigilance (the First Strike counterattack itself is not implemented yet)"""
+        return self.bonus_count("Vigilance", unit) > 0
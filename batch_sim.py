@@ -0,0 +1,263 @@
+"""
+Batched Simulation for Fantasy Squad Tactics
+
+Steps many independent games in lockstep as stacked NumPy arrays, for fast policy rollouts:
+- GameBatch holds K games as (K, H, W) terrain codes and (K, N) unit columns (hp, atk, position, flags),
+  padded to the largest army pair in the batch
+- step() resolves one action per game for all K games at once: move, attack or end turn. Invalid actions
+  are no-ops and reported in the returned mask.
+- Moves are single steps to an orthogonal neighbour paid from moves remaining, so a multi-tile move is a
+  sequence of steps along the cheapest path (Flying steps cost 1, Trusty Steed adds a move until the unit attacks).
+  As in GameState, a unit with no moves left cannot step.
+- Attacks check Chebyshev range with the Mountain range bonus, add the Mountain attack bonus, subtract the
+  Forest and Sword & Board reductions, and deal at least 1 damage, as attack_unit does. As in GameState, a unit
+  holding the Trusty Steed bonus cannot attack.
+- End of turn restores the next army's moves and attacks and heals units on farms
+- greedy_actions() is policies.greedy_policy computed for every game at once
+
+Not modelled: active abilities and timed effects. Aura bonuses (Spotter, Warcry) are read from each game
+when the batch is built and then held fixed.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from special_abilities import AbilityId
+from terrain import ATTACK_BONUS, DEFENSE_BONUS, HEALING, MOVE_COST, RANGE_BONUS
+
+# Action kinds
+NO_ACTION = -1
+END_TURN = 0
+MOVE = 1
+ATTACK = 2
+
+STEPS = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)])  # Orthogonal neighbours, as in pathfinding
+FLIGHT_COST = np.where(np.isinf(MOVE_COST), np.inf, 1.0)  # Flying units pay 1 for anything but Lakes
+
+Actions = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]  # (kind, unit, target row, target col), each (K,)
+
+
+class GameBatch:
+    """K games of the same map size stepped together"""
+
+    def __init__(self, games: List):
+        """Copy a list of GameStates (same map shape) into stacked arrays"""
+        if not games:
+            raise ValueError("A batch needs at least one game")
+        shape = games[0].game_map.shape
+        if any(game.game_map.shape != shape for game in games):
+            raise ValueError("Every game in a batch must have the same map size")
+
+        count = len(games)
+        size = max(len(game.unit_positions) for game in games)
+        self.count = count
+        self.shape = shape
+        self.terrain = np.stack([np.asarray(game.game_map) for game in games])
+        self.unit_ids: List[List[Optional[str]]] = [[None] * size for _ in games]
+
+        def column(dtype):
+            return np.zeros((count, size), dtype=dtype)
+
+        self.hp, self.max_hp, self.atk = column(np.int32), column(np.int32), column(np.int32)
+        self.move, self.moves_remaining, self.range = column(np.int32), column(np.int32), column(np.int32)
+        self.row, self.col = column(np.int32), column(np.int32)
+        self.army, self.ability = column(np.int8), column(np.int16)
+        self.alive, self.has_attacked = column(np.bool_), column(np.bool_)
+        self.attack_bonus, self.range_bonus = column(np.int32), column(np.int32)  # Auras, fixed at build time
+        # Units the effects system tracks; only these get the Trusty Steed Bonus effect that bars attacking
+        self.has_effects = column(np.bool_)
+
+        for k, game in enumerate(games):
+            unit_positions, ability_system = game.unit_positions, game.ability_system
+            for n, (unit_id, unit) in enumerate(unit_positions.items()):
+                self.unit_ids[k][n] = unit_id
+                self.hp[k, n], self.max_hp[k, n], self.atk[k, n] = unit.hp, unit.max_hp, unit.atk
+                self.move[k, n], self.moves_remaining[k, n], self.range[k, n] = \
+                    unit.move, unit.moves_remaining, unit.range
+                self.row[k, n], self.col[k, n] = unit.position
+                self.army[k, n], self.ability[k, n] = game.army_of(unit), unit.ability_id
+                self.alive[k, n], self.has_attacked[k, n] = True, unit.has_attacked
+                self.attack_bonus[k, n] = ability_system.get_attack_modifications(unit, game.game_map,
+                                                                                  unit_positions)
+                self.range_bonus[k, n] = ability_system.get_range_modifications(unit, game.game_map, unit_positions)
+                self.has_effects[k, n] = unit_id in game.effects_system.unit_effects
+
+        self.current_turn = np.array([game.current_turn for game in games], dtype=np.int8)
+        self.turns_played = np.array([game.turns_played for game in games], dtype=np.int32)
+        self.winner = np.array([game.winner or 0 for game in games], dtype=np.int8)  # 0 while undecided
+        self._games = np.arange(count)
+
+    # Per-unit lookups, all (K, N)
+
+    def unit_terrain(self) -> np.ndarray:
+        return self.terrain[self._games[:, None], self.row, self.col]
+
+    def effective_range(self) -> np.ndarray:
+        return self.range + RANGE_BONUS[self.unit_terrain()] + self.range_bonus
+
+    def damage_reduction(self) -> np.ndarray:
+        """Forest cover plus Sword & Board for units that haven't moved this turn"""
+        sword_and_board = (self.ability == AbilityId.SWORD_AND_BOARD) & (self.moves_remaining == self.move)
+        return DEFENSE_BONUS[self.unit_terrain()] + sword_and_board
+
+    def move_budget(self) -> np.ndarray:
+        """Moves remaining plus Trusty Steed's extra move for units that haven't attacked"""
+        steed = (self.ability == AbilityId.TRUSTY_STEED) & ~self.has_attacked
+        return self.moves_remaining + steed
+
+    def can_attack(self) -> np.ndarray:
+        """Units that haven't attacked and hold no Trusty Steed bonus, as effects_system.can_unit_attack checks"""
+        steed_bonus = (self.ability == AbilityId.TRUSTY_STEED) & self.has_effects
+        return ~self.has_attacked & ~steed_bonus
+
+    def can_step(self) -> np.ndarray:
+        return self.moves_remaining > 0
+
+    def occupancy(self) -> np.ndarray:
+        """(K, H, W) index of the live unit on each tile, -1 where empty"""
+        grid = np.full((self.count,) + self.shape, -1, dtype=np.int32)
+        games, units = np.nonzero(self.alive)
+        grid[games, self.row[games, units], self.col[games, units]] = units
+        return grid
+
+    def own_units(self) -> np.ndarray:
+        return self.alive & (self.army == self.current_turn[:, None])
+
+    def enemy_units(self) -> np.ndarray:
+        return self.alive & (self.army != self.current_turn[:, None])
+
+    @property
+    def active(self) -> np.ndarray:
+        return self.winner == 0
+
+    # Stepping
+
+    def step(self, kind: np.ndarray, unit: np.ndarray, target_row: np.ndarray, target_col: np.ndarray) -> np.ndarray:
+        """Apply one action per game; returns the (K,) mask of games whose action was legal and applied"""
+        k = self._games
+        height, width = self.shape
+        own = self.active & self.alive[k, unit] & (self.army[k, unit] == self.current_turn)
+        unit_row, unit_col = self.row[k, unit], self.col[k, unit]
+        in_bounds = (target_row >= 0) & (target_row < height) & (target_col >= 0) & (target_col < width)
+        row, col = np.clip(target_row, 0, height - 1), np.clip(target_col, 0, width - 1)
+        unit_terrain, target_terrain = self.terrain[k, unit_row, unit_col], self.terrain[k, row, col]
+        occupant = self.occupancy()[k, row, col]
+
+        # Moves: one orthogonal step onto a free tile the unit can pay for
+        flying = self.ability[k, unit] == AbilityId.FLYING
+        step_cost = np.where(flying, FLIGHT_COST[target_terrain], MOVE_COST[target_terrain])
+        adjacent = np.abs(target_row - unit_row) + np.abs(target_col - unit_col) == 1
+        moves = (kind == MOVE) & own & in_bounds & adjacent & (occupant < 0) & self.can_step()[k, unit] & \
+            (step_cost <= self.move_budget()[k, unit])
+        games = np.nonzero(moves)[0]
+        movers = unit[games]
+        self.row[games, movers], self.col[games, movers] = row[games], col[games]
+        self.moves_remaining[games, movers] -= step_cost[games].astype(np.int32)
+
+        # Attacks: an enemy within effective range, by a unit that may still attack this turn
+        target = np.maximum(occupant, 0)
+        distance = np.maximum(np.abs(target_row - unit_row), np.abs(target_col - unit_col))
+        attacks = (kind == ATTACK) & own & in_bounds & (occupant >= 0) & self.can_attack()[k, unit] & \
+            (self.army[k, target] != self.current_turn) & (distance <= self.effective_range()[k, unit])
+        damage = self.atk[k, unit] + self.attack_bonus[k, unit] + \
+            np.where(ATTACK_BONUS[target_terrain] == 0, ATTACK_BONUS[unit_terrain], 0)
+        damage = np.maximum(1, damage - self.damage_reduction()[k, target])  # Minimum 1 damage
+        games = np.nonzero(attacks)[0]
+        targets = target[games]
+        self.hp[games, targets] -= damage[games]
+        self.alive[games, targets] = self.hp[games, targets] > 0
+        self.has_attacked[games, unit[games]] = True
+
+        ends = (kind == END_TURN) & self.active
+        self.end_turn(ends)
+
+        standing = [(self.alive & (self.army == army)).any(axis=1) for army in (1, 2)]
+        self.winner[self.active & standing[0] & ~standing[1]] = 1
+        self.winner[self.active & standing[1] & ~standing[0]] = 2
+        return moves | attacks | ends
+
+    def end_turn(self, games: np.ndarray) -> None:
+        """Pass the turn in the masked games: the next army gets its moves and attacks back, farms heal"""
+        self.current_turn[games] = np.where(self.current_turn[games] == 1, 2, 1)
+        self.turns_played[games] += 1
+
+        starting = games[:, None] & self.alive & (self.army == self.current_turn[:, None])
+        self.moves_remaining[starting] = self.move[starting]
+        self.has_attacked[starting] = False
+
+        # Units deployed above their class's max HP keep it; only wounded units heal
+        healing = games[:, None] & self.alive & (self.hp < self.max_hp) & (HEALING[self.unit_terrain()] > 0)
+        self.hp = np.where(healing, np.minimum(self.hp + HEALING[self.unit_terrain()], self.max_hp),
+                           self.hp).astype(np.int32)
+
+    # Policy
+
+    def greedy_actions(self, rng: np.random.Generator, games: Optional[np.ndarray] = None) -> Actions:
+        """
+        For every game (or just the given game indices): attack the weakest enemy in range, else take the step
+        that closes most distance on the nearest enemy, else end the turn. Ties are broken at random. Games
+        left out get NO_ACTION.
+        """
+        games = self._games if games is None else games
+        count, size = len(games), self.alive.shape[1]
+        height, width = self.shape
+        own, enemy = self.own_units()[games], self.enemy_units()[games]
+        row, col = self.row[games].astype(np.int16), self.col[games].astype(np.int16)
+
+        # Offsets from each unit to each enemy; anything that isn't an enemy is moved out of reach
+        far = height + width
+        enemy_rows = np.where(enemy[:, None, :], row[:, None, :] - row[:, :, None], far).astype(np.int16)
+        enemy_cols = np.where(enemy[:, None, :], col[:, None, :] - col[:, :, None], 0).astype(np.int16)
+        distance = np.maximum(np.abs(enemy_rows), np.abs(enemy_cols))  # Chebyshev, as ranges are measured
+
+        # Attacks: (game, attacker, target) pairs within effective range
+        pairs = (own & self.can_attack()[games])[:, :, None] & \
+            (distance <= self.effective_range()[games][:, :, None])
+        score = np.where(pairs, self.hp[games][:, None, :] + rng.random(pairs.shape) * 0.5, np.inf)
+        score = score.reshape(count, -1)
+        best_attack = score.argmin(axis=1)
+        can_attack = np.isfinite(score[np.arange(count), best_attack])
+        attacker, target = np.divmod(best_attack, size)
+
+        # Steps: (game, unit, direction) onto free, affordable tiles, scored by the change in distance to the
+        # nearest enemy
+        step_rows = row[:, :, None] + STEPS[:, 0].astype(np.int16)
+        step_cols = col[:, :, None] + STEPS[:, 1].astype(np.int16)
+        on_map = (step_rows >= 0) & (step_rows < height) & (step_cols >= 0) & (step_cols < width)
+        rows, cols = np.clip(step_rows, 0, height - 1), np.clip(step_cols, 0, width - 1)
+        tiles = games[:, None, None]
+        terrain = self.terrain[tiles, rows, cols]
+        flying = (self.ability[games] == AbilityId.FLYING)[:, :, None]
+        step_cost = np.where(flying, FLIGHT_COST[terrain], MOVE_COST[terrain])
+        free = self.occupancy()[tiles, rows, cols] < 0
+        steps = (own & self.can_step()[games])[:, :, None] & on_map & free & \
+            (step_cost <= self.move_budget()[games][:, :, None])
+
+        nearest_now = distance.min(axis=2)
+        nearest_after = np.maximum(np.abs(enemy_rows[:, :, None, :] - STEPS[:, 0, None].astype(np.int16)),
+                                   np.abs(enemy_cols[:, :, None, :] - STEPS[:, 1, None].astype(np.int16))).min(axis=3)
+        gain = nearest_after - nearest_now[:, :, None]
+        step_score = np.where(steps & (gain < 0), gain + rng.random(gain.shape) * 0.5, np.inf).reshape(count, -1)
+        best_step = step_score.argmin(axis=1)
+        can_step = np.isfinite(step_score[np.arange(count), best_step])
+        mover, direction = np.divmod(best_step, len(STEPS))
+
+        kind = np.full(self.count, NO_ACTION)
+        unit, target_row, target_col = np.zeros(self.count, dtype=np.intp), np.zeros_like(kind), np.zeros_like(kind)
+        kind[games] = np.where(can_attack, ATTACK, np.where(can_step, MOVE, END_TURN))
+        unit[games] = np.where(can_attack, attacker, mover)
+        picked = np.arange(count)
+        target_row[games] = np.where(can_attack, row[picked, target], step_rows[picked, mover, direction])
+        target_col[games] = np.where(can_attack, col[picked, target], step_cols[picked, mover, direction])
+        return kind, unit, target_row, target_col
+
+    def play(self, rng: np.random.Generator, max_turns: int = 200) -> int:
+        """Play every game to a win or max_turns with greedy_actions; returns the number of lockstep steps"""
+        steps = 0
+        while True:
+            playing = np.nonzero(self.active & (self.turns_played < max_turns))[0]
+            if not len(playing):
+                return steps
+            self.step(*self.greedy_actions(rng, playing))
+            steps += 1
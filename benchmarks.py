@@ -0,0 +1,223 @@
+"""
+Benchmarks for Fantasy Squad Tactics
+
+Run from the project root, e.g.:
+    python benchmarks.py reachability
+    python benchmarks.py render --sizes 10 50 100 --points 20 60
+    python benchmarks.py batch --games 1000
+    python benchmarks.py undo --sizes 10 30
+"""
+
+import argparse
+import copy
+import random
+import time
+import warnings
+
+import numpy as np
+
+from batch_sim import GameBatch
+from game_classes import GamePiece
+from headless import OffscreenGame, random_game
+from pathfinding import uniform_cost_search
+from policies import greedy_policy
+from terrain import Terrain, TERRAIN_DTYPE, MOVE_COST
+from undo_log import UndoLog
+
+
+def legacy_expansion_count(origin, budget, terrain_map, movement_costs, blocked, limit):
+    """
+    Count stack pops of the old visited-set-free walk used by calculate_legal_moves.
+    Stops at limit and returns None, since the walk grows exponentially with the budget.
+    """
+    height, width = terrain_map.shape
+    to_visit = [(origin, budget)]
+    expansions = 0
+
+    while to_visit:
+        current_pos, remaining_move = to_visit.pop()
+        expansions += 1
+        if expansions > limit:
+            return None
+
+        row, col = current_pos
+        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            new_row, new_col = row + dr, col + dc
+            new_pos = (new_row, new_col)
+            if 0 <= new_row < height and 0 <= new_col < width and new_pos not in blocked:
+                cost = movement_costs[terrain_map[new_row, new_col]]
+                if cost <= remaining_move:
+                    to_visit.append((new_pos, remaining_move - cost))
+
+    return expansions
+
+
+def benchmark_reachability(sizes=(10, 50, 200), budgets=(3, 6, 9, 12), legacy_limit=2_000_000):
+    """Compare node expansions of the legacy walk against uniform-cost search on open Plains"""
+    print(f"{'map':>9} {'budget':>6} {'reachable':>9} {'legacy pops':>12} {'ucs pops':>9} {'ucs ms':>8}")
+
+    for size in sizes:
+        terrain_map = np.full((size, size), Terrain.PLAINS, dtype=TERRAIN_DTYPE)
+        # A Knight with Trusty Steed in the middle of the map
+        knight = GamePiece("A1_0", "Heavy", "Knight", 15, 2, 1, 3, "Trusty Steed", (size // 2, size // 2),
+                           Terrain.PLAINS, "Kingdom of Cantrell")
+
+        for budget in sorted(set(budgets) | {size}):
+            legacy = legacy_expansion_count(knight.position, budget, terrain_map, MOVE_COST, set(),
+                                            legacy_limit)
+
+            start = time.perf_counter()
+            result = uniform_cost_search(knight.position, budget, terrain_map, MOVE_COST, set())
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            legacy_text = str(legacy) if legacy is not None else f">{legacy_limit}"
+            print(f"{size:>4}x{size:<4} {budget:>6} {len(result.costs):>9} {legacy_text:>12} "
+                  f"{result.expansions:>9} {elapsed_ms:>8.2f}")
+
+
+def time_ms(action, frames):
+    """Mean milliseconds per call of action over frames calls"""
+    start = time.perf_counter()
+    for _ in range(frames):
+        action()
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def benchmark_render(sizes=(10, 50, 100, 250), points=(20, 60), frames=50, seed=0):
+    """Offscreen frame times: full repaint, board and UI panel alone, and an incremental frame moving the tooltip"""
+    print(f"{'map':>9} {'points':>6} {'units':>5} {'full ms':>8} {'board ms':>8} {'ui ms':>6} {'hover ms':>8}")
+
+    for size in sizes:
+        for army_points in points:
+            try:
+                offscreen = OffscreenGame.from_seed(seed, size, size, army_points)
+            except ValueError:
+                continue  # Armies don't fit on this map
+            renderer = offscreen.renderer
+            view = offscreen.view("A1_0")
+            unit_tile = renderer.camera.tile_rect(view.selected_unit.position).center
+            hover = [unit_tile, (unit_tile[0] + renderer.camera.cell_size, unit_tile[1])]
+
+            full_ms = time_ms(lambda: offscreen.render(view), frames)
+            board_ms = time_ms(lambda: renderer.board.draw_board(view), frames)
+            ui_ms = time_ms(lambda: renderer.ui.draw(view), frames)
+            renderer.render(view, hover[0])
+            hover_ms = time_ms(lambda: renderer.render(view, hover[renderer.frames % 2]), frames)
+
+            print(f"{size:>4}x{size:<4} {army_points:>6} {len(view.unit_positions):>5} {full_ms:>8.2f} "
+                  f"{board_ms:>8.2f} {ui_ms:>6.2f} {hover_ms:>8.2f}")
+
+
+def benchmark_batch(games=1000, baseline_games=50, size=10, army_points=20, max_turns=200, seed=0):
+    """Greedy playouts per second: one GameState at a time against a GameBatch of all the games in lockstep"""
+    warnings.filterwarnings("ignore", message="Ability .* is not in the ability registry")
+
+    def seeded_games(count):
+        return [random_game(seed + index, size, size, army_points) for index in range(count)]
+
+    baseline = seeded_games(baseline_games)
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for game in baseline:
+        while not game.game_over and game.turns_played < max_turns:
+            game.apply(greedy_policy(game, rng))
+    per_game_rate = baseline_games / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    batch = GameBatch(seeded_games(games))
+    build_s = time.perf_counter() - start
+    start = time.perf_counter()
+    steps = batch.play(np.random.default_rng(seed), max_turns)
+    play_s = time.perf_counter() - start
+    batch_rate = games / play_s
+    decided = int((batch.winner > 0).sum())
+
+    print(f"map {size}x{size}, {army_points} points, greedy policy for both armies")
+    print(f"{'per game':>10}: {baseline_games:>6} games {per_game_rate:>10.1f} games/s")
+    print(f"{'batch':>10}: {games:>6} games {batch_rate:>10.1f} games/s "
+          f"({steps} lockstep steps, {decided} decided, {build_s:.2f}s to build the batch)")
+    print(f"{'speedup':>10}: {batch_rate / per_game_rate:.1f}x")
+
+
+def benchmark_undo(sizes=(10, 30), points=(20, 60), repeats=200, seed=0):
+    """Ways to explore an action and come back: deepcopy of the state, clone(), and apply + undo_to()"""
+    warnings.filterwarnings("ignore", message="Ability .* is not in the ability registry")
+    print(f"{'map':>9} {'points':>6} {'units':>5} {'deepcopy us':>11} {'clone us':>9} {'apply us':>9} "
+          f"{'make/unmake us':>14}")
+
+    for size in sizes:
+        for army_points in points:
+            try:
+                game = random_game(seed, size, size, army_points)
+            except ValueError:
+                continue  # Armies don't fit on this map
+            actions = game.legal_actions()
+            deepcopy_us = time_ms(lambda: copy.deepcopy((game.unit_positions, game.effects_system)), repeats) * 1000
+            clone_us = time_ms(game.clone, repeats) * 1000
+
+            # Every legal action applied to a fresh clone, less the cost of cloning, is what one action costs
+            clones = [game.clone() for _ in actions]
+            start = time.perf_counter()
+            for clone, action in zip(clones, actions):
+                clone.apply(action)
+            apply_us = (time.perf_counter() - start) * 1e6 / len(actions)
+
+            undo_log = UndoLog()
+            game.track_changes(undo_log)
+
+            def make_unmake():
+                for action in actions:
+                    mark = undo_log.mark()
+                    game.apply(action)
+                    game.undo_to(mark)
+
+            make_unmake_us = time_ms(make_unmake, max(1, repeats // len(actions))) * 1000 / len(actions)
+            game.track_changes(None)
+
+            print(f"{size:>4}x{size:<4} {army_points:>6} {len(game.unit_positions):>5} {deepcopy_us:>11.1f} "
+                  f"{clone_us:>9.1f} {apply_us:>9.1f} {make_unmake_us:>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fantasy Squad Tactics benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    reachability = subparsers.add_parser("reachability", help="Legacy move walk vs uniform-cost search")
+    reachability.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200])
+    reachability.add_argument("--legacy-limit", type=int, default=2_000_000)
+
+    render = subparsers.add_parser("render", help="Offscreen frame times by map size and army size")
+    render.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 250])
+    render.add_argument("--points", type=int, nargs="+", default=[20, 60])
+    render.add_argument("--frames", type=int, default=50)
+    render.add_argument("--seed", type=int, default=0)
+
+    batch = subparsers.add_parser("batch", help="Greedy playouts per game vs a lockstep GameBatch")
+    batch.add_argument("--games", type=int, default=1000, help="Games in the batch")
+    batch.add_argument("--baseline-games", type=int, default=50, help="Games played one at a time")
+    batch.add_argument("--size", type=int, default=10)
+    batch.add_argument("--points", type=int, default=20)
+    batch.add_argument("--max-turns", type=int, default=200)
+    batch.add_argument("--seed", type=int, default=0)
+
+    undo = subparsers.add_parser("undo", help="deepcopy vs clone() vs make/unmake with an UndoLog")
+    undo.add_argument("--sizes", type=int, nargs="+", default=[10, 30])
+    undo.add_argument("--points", type=int, nargs="+", default=[20, 60])
+    undo.add_argument("--repeats", type=int, default=200)
+    undo.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args()
+
+    if args.benchmark == "reachability":
+        benchmark_reachability(sizes=args.sizes, legacy_limit=args.legacy_limit)
+    elif args.benchmark == "render":
+        benchmark_render(sizes=args.sizes, points=args.points, frames=args.frames, seed=args.seed)
+    elif args.benchmark == "batch":
+        benchmark_batch(games=args.games, baseline_games=args.baseline_games, size=args.size,
+                        army_points=args.points, max_turns=args.max_turns, seed=args.seed)
+    elif args.benchmark == "undo":
+        benchmark_undo(sizes=args.sizes, points=args.points, repeats=args.repeats, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Texture Atlas Builder for Fantasy Squad Tactics
+
+Build-time step that packs the game's art into a single image:
+- Every terrain, unit, status icon, overlay, button and background PNG under graphics/
+- Shelf packing, tallest images first, into a fixed-width sheet
+- graphics/atlas.png plus graphics/atlas.json mapping each file name to its rectangle in the sheet
+- AssetManager loads the atlas in one decode and hands out subsurfaces
+
+Run from the project root after changing any art (main.spec runs it before every PyInstaller build):
+    python build_atlas.py
+"""
+
+import json
+import os
+from typing import Dict, List, Tuple
+
+import pygame
+
+from assets import ATLAS_IMAGE, ATLAS_INDEX
+
+ATLAS_WIDTH = 1024
+# Source sheets and reference images that the game never draws
+EXCLUDED = {ATLAS_IMAGE, "tileset.png"}
+EXCLUDED_PREFIXES = ("Screenshot",)
+
+Rect = Tuple[int, int, int, int]
+
+
+def atlas_sources(root: str = "graphics") -> List[str]:
+    """Names (relative to root, '/'-separated, as passed to AssetManager.image) of the images to pack"""
+    names = []
+    for folder, _, files in os.walk(root):
+        for file in files:
+            if not file.lower().endswith(".png") or file in EXCLUDED or file.startswith(EXCLUDED_PREFIXES):
+                continue
+            names.append(os.path.relpath(os.path.join(folder, file), root).replace(os.sep, "/"))
+    return sorted(names)
+
+
+def pack(sizes: Dict[str, Tuple[int, int]], width: int = ATLAS_WIDTH) -> Tuple[Dict[str, Rect], int]:
+    """Shelf-pack images into rows of the given width. Returns ({name: (x, y, w, h)}, sheet height)."""
+    rects: Dict[str, Rect] = {}
+    x = y = shelf_height = 0
+    for name in sorted(sizes, key=lambda name: (-sizes[name][1], -sizes[name][0], name)):
+        w, h = sizes[name]
+        if w > width:
+            raise ValueError(f"{name} is wider than the atlas ({w} > {width})")
+        if x + w > width:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        rects[name] = (x, y, w, h)
+        x += w
+        shelf_height = max(shelf_height, h)
+    return rects, y + shelf_height
+
+
+def build_atlas(root: str = "graphics", width: int = ATLAS_WIDTH) -> Dict[str, Rect]:
+    """Write root/atlas.png and root/atlas.json and return the packed rectangles"""
+    images = {name: pygame.image.load(os.path.join(root, name)) for name in atlas_sources(root)}
+    rects, height = pack({name: image.get_size() for name, image in images.items()}, width)
+
+    sheet = pygame.Surface((width, max(height, 1)), pygame.SRCALPHA)
+    sheet.fill((0, 0, 0, 0))
+    for name, (x, y, _, _) in rects.items():
+        sheet.blit(images[name], (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+
+    pygame.image.save(sheet, os.path.join(root, ATLAS_IMAGE))
+    with open(os.path.join(root, ATLAS_INDEX), "w") as index_file:
+        json.dump({"image": ATLAS_IMAGE, "sprites": rects}, index_file, sort_keys=True)
+    return rects
+
+
+if __name__ == "__main__":
+    packed = build_atlas()
+    print(f"Packed {len(packed)} images into graphics/{ATLAS_IMAGE}")
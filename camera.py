@@ -0,0 +1,148 @@
+"""
+Camera for Fantasy Squad Tactics
+
+A scrollable, zoomable view of a map larger than the window:
+- The viewport is the screen rectangle the board is drawn in; the camera offset is in board pixels at the current zoom
+- Fixed zoom levels, so scaled tiles and sprites can be cached per level
+- Screen <-> tile conversion for drawing, hover and clicks
+- The range of visible tiles, so only those are drawn
+"""
+
+from typing import Iterator, List, Optional, Tuple
+
+import pygame
+
+Position = Tuple[int, int]
+Size = Tuple[int, int]
+
+ZOOM_LEVELS = (0.25, 0.375, 0.5, 0.75, 1.0, 1.5, 2.0)
+
+
+class Camera:
+    """Maps between screen pixels and board tiles for a viewport onto the map"""
+
+    def __init__(self, viewport: pygame.Rect, map_shape: Tuple[int, int], base_cell_size: int = 80,
+                 zoom_levels: Tuple[float, ...] = ZOOM_LEVELS):
+        self.viewport = pygame.Rect(viewport)
+        self.map_shape = map_shape
+        self.base_cell_size = base_cell_size
+        self.zoom_levels = zoom_levels
+        self.zoom_index = zoom_levels.index(1.0) if 1.0 in zoom_levels else 0
+        self.offset = (0, 0)  # Board pixel at the viewport's top-left corner
+        self.version = 0  # Bumped on every pan or zoom
+        self.clamp()
+
+    @property
+    def zoom(self) -> float:
+        return self.zoom_levels[self.zoom_index]
+
+    @property
+    def cell_size(self) -> int:
+        return round(self.base_cell_size * self.zoom)
+
+    @property
+    def zoomed(self) -> bool:
+        """Whether images need scaling (False at 100%)"""
+        return self.cell_size != self.base_cell_size
+
+    def scaled_size(self, size: Size) -> Size:
+        """Size of an image drawn at base_cell_size, at the current zoom"""
+        return round(size[0] * self.zoom), round(size[1] * self.zoom)
+
+    def state(self) -> tuple:
+        return self.cell_size, self.offset
+
+    def set_map(self, map_shape: Tuple[int, int]) -> None:
+        self.map_shape = map_shape
+        self.clamp()
+
+    def clamp(self) -> None:
+        """Keep the map in view: centred on an axis where it is smaller than the viewport, else no empty margin"""
+        cell_size = self.cell_size
+        offset = []
+        for board, view, current in ((self.map_shape[1] * cell_size, self.viewport.width, self.offset[0]),
+                                     (self.map_shape[0] * cell_size, self.viewport.height, self.offset[1])):
+            if board <= view:
+                offset.append(-((view - board) // 2))
+            else:
+                offset.append(min(max(current, 0), board - view))
+        offset = tuple(offset)
+        if offset != self.offset:
+            self.offset = offset
+            self.version += 1
+
+    def pan(self, dx: int, dy: int) -> None:
+        """Move the view by (dx, dy) screen pixels"""
+        self.offset = (self.offset[0] + int(dx), self.offset[1] + int(dy))
+        self.version += 1
+        self.clamp()
+
+    def center_on(self, position: Position) -> None:
+        cell_size = self.cell_size
+        self.offset = (position[1] * cell_size + cell_size // 2 - self.viewport.width // 2,
+                       position[0] * cell_size + cell_size // 2 - self.viewport.height // 2)
+        self.version += 1
+        self.clamp()
+
+    def zoom_by(self, steps: int, anchor: Optional[Tuple[int, int]] = None) -> bool:
+        """Change zoom level by steps, keeping the board point under anchor (default: view centre) in place"""
+        zoom_index = min(max(self.zoom_index + steps, 0), len(self.zoom_levels) - 1)
+        if zoom_index == self.zoom_index:
+            return False
+
+        if anchor is None or not self.viewport.collidepoint(anchor):
+            anchor = self.viewport.center
+        local_x, local_y = anchor[0] - self.viewport.x, anchor[1] - self.viewport.y
+        old_cell_size = self.cell_size
+        tile_x = (self.offset[0] + local_x) / old_cell_size
+        tile_y = (self.offset[1] + local_y) / old_cell_size
+
+        self.zoom_index = zoom_index
+        cell_size = self.cell_size
+        self.offset = (round(tile_x * cell_size) - local_x, round(tile_y * cell_size) - local_y)
+        self.version += 1
+        self.clamp()
+        return True
+
+    def screen_to_tile(self, pos: Tuple[int, int]) -> Optional[Position]:
+        """Tile under a screen pixel, or None outside the viewport or the map"""
+        if not self.viewport.collidepoint(pos):
+            return None
+        cell_size = self.cell_size
+        row = (pos[1] - self.viewport.y + self.offset[1]) // cell_size
+        col = (pos[0] - self.viewport.x + self.offset[0]) // cell_size
+        if 0 <= row < self.map_shape[0] and 0 <= col < self.map_shape[1]:
+            return row, col
+        return None
+
+    def tile_rect(self, position: Position) -> pygame.Rect:
+        """Screen rectangle of a tile (may lie partly or wholly outside the viewport)"""
+        cell_size = self.cell_size
+        return pygame.Rect(self.viewport.x + position[1] * cell_size - self.offset[0],
+                           self.viewport.y + position[0] * cell_size - self.offset[1], cell_size, cell_size)
+
+    def visible_range(self, rect: Optional[pygame.Rect] = None) -> Tuple[int, int, int, int]:
+        """(first_row, end_row, first_col, end_col) of the tiles overlapping rect (default: the viewport)"""
+        rect = self.viewport if rect is None else pygame.Rect(rect).clip(self.viewport)
+        if not rect.width or not rect.height:
+            return 0, 0, 0, 0
+        cell_size = self.cell_size
+        left = rect.left - self.viewport.x + self.offset[0]
+        top = rect.top - self.viewport.y + self.offset[1]
+        first_row, first_col = max(top // cell_size, 0), max(left // cell_size, 0)
+        end_row = min((top + rect.height - 1) // cell_size + 1, self.map_shape[0])
+        end_col = min((left + rect.width - 1) // cell_size + 1, self.map_shape[1])
+        return first_row, max(end_row, first_row), first_col, max(end_col, first_col)
+
+    def visible_tiles(self, rect: Optional[pygame.Rect] = None) -> Iterator[Position]:
+        first_row, end_row, first_col, end_col = self.visible_range(rect)
+        for row in range(first_row, end_row):
+            for col in range(first_col, end_col):
+                yield row, col
+
+    def tiles_in_rect(self, rect) -> List[Position]:
+        return list(self.visible_tiles(rect))
+
+    def is_visible(self, position: Position) -> bool:
+        first_row, end_row, first_col, end_col = self.visible_range()
+        return first_row <= position[0] < end_row and first_col <= position[1] < end_col
@@ -6,12 +6,17 @@ This module handles all temporary and conditional effects on units:
 - Buffs from other units (like Spotter range bonus)
 - Temporary status effects (like poison, stun, etc.)
 - Visual indicators for affected units
+- Changes record their inverse in an attached UndoLog (see undo_log.py) and update an attached Zobrist key
+  (see zobrist.py)
 """
 
-from typing import Dict, List, Set, Optional, Any
+import copy
+from typing import Dict, List, Set, Optional, Any, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from special_abilities import AbilityId
+
 
 class EffectType(Enum):
     """Types of effects that can be applied to units"""
@@ -53,16 +58,111 @@ class Effect:
             raise ValueError("Timed effects must have turns_remaining > 0")
 
 
+def _spotter_effect(count: int, source_unit_id: Optional[str]) -> Effect:
+    return Effect(
+        effect_type=EffectType.RANGE_BONUS,
+        name="Spotter Bonus",
+        description=f"+{count} effective range from Spotter",
+        value=count,
+        duration=EffectDuration.CONDITIONAL,
+        source_unit_id=source_unit_id,
+        condition="within_spotter_range"
+    )
+
+
+def _warcry_effect(count: int, source_unit_id: Optional[str]) -> Effect:
+    return Effect(
+        effect_type=EffectType.ATTACK_BONUS,
+        name="Warcry",
+        description="+1 ATK and +1 effective range from Warcry",
+        value=1,
+        duration=EffectDuration.CONDITIONAL,
+        source_unit_id=source_unit_id,
+        condition="within_warcry"
+    )
+
+
+def _vigilance_effect(count: int, source_unit_id: Optional[str]) -> Effect:
+    return Effect(
+        effect_type=EffectType.FIRST_STRIKE,
+        name="First Strike",
+        description="First Strike from Vigilance",
+        value=1,
+        duration=EffectDuration.CONDITIONAL,
+        source_unit_id=source_unit_id,
+        condition="within_vigilance"
+    )
+
+
+# Aura name (see auras.py) -> (effect name, builder) for the effect shown on covered units
+AURA_EFFECTS = {
+    "Spotter": ("Spotter Bonus", _spotter_effect),
+    "Warcry": ("Warcry", _warcry_effect),
+    "Vigilance": ("First Strike", _vigilance_effect),
+}
+
+
 class EffectsSystem:
     """Manages all effects on all units"""
 
     def __init__(self):
-        self.unit_effects: Dict[str, List[Effect]] = {}  # unit_id -> list of effects
+        self.unit_effects: Dict[str, Dict[str, Effect]] = {}  # unit_id -> effect name -> effect
+        self._totals: Dict[str, Dict[EffectType, Any]] = {}  # unit_id -> running total per effect type
+        self.version = 0  # Bumped on every change to any unit's effects
+        self.unit_versions: Dict[str, int] = {}  # unit_id -> version of its last change
+        self.undo_log = None  # UndoLog recording each unit's effects before they change
+        self.zobrist = None  # ZobristHash told about every change to a unit's effects
+
+    def clone(self) -> "EffectsSystem":
+        """Copy with its own effects, for another search or worker"""
+        clone = copy.copy(self)
+        clone.unit_effects = {unit_id: {name: copy.copy(effect) for name, effect in effects.items()}
+                              for unit_id, effects in self.unit_effects.items()}
+        clone._totals = {unit_id: dict(totals) for unit_id, totals in self._totals.items()}
+        clone.unit_versions = dict(self.unit_versions)
+        clone.undo_log = clone.zobrist = None
+        return clone
+
+    def _record(self, unit_id: str) -> None:
+        """Save a unit's effects (and their values and countdowns) before they change"""
+        if self.undo_log is None:
+            return
+        effects = self.unit_effects.get(unit_id)
+        saved = None if effects is None else [(effect, effect.value, effect.turns_remaining)
+                                              for effect in effects.values()]
+        totals = self._totals.get(unit_id)
+        self.undo_log.record(self._restore, unit_id, saved, None if totals is None else dict(totals))
+
+    def _restore(self, unit_id: str, saved: Optional[List[Tuple[Effect, Any, int]]],
+                 totals: Optional[Dict[EffectType, Any]]) -> None:
+        if saved is None:
+            self.unit_effects.pop(unit_id, None)
+        else:
+            for effect, value, turns_remaining in saved:
+                effect.value, effect.turns_remaining = value, turns_remaining
+            self.unit_effects[unit_id] = {effect.name: effect for effect, _, _ in saved}
+        if totals is None:
+            self._totals.pop(unit_id, None)
+        else:
+            self._totals[unit_id] = totals
+        self._touch(unit_id)
+
+    def _touch(self, unit_id: str) -> None:
+        """Record that a unit's effects changed"""
+        self.version += 1
+        self.unit_versions[unit_id] = self.version
+        if self.zobrist is not None:
+            self.zobrist.on_effects_changed(unit_id, self.unit_effects.get(unit_id))
+
+    def _adjust_total(self, unit_id: str, effect_type: EffectType, delta) -> None:
+        totals = self._totals.setdefault(unit_id, {})
+        totals[effect_type] = totals.get(effect_type, 0) + delta
 
     def add_effect(self, unit_id: str, effect: Effect) -> None:
         """Add an effect to a unit"""
+        self._record(unit_id)
         if unit_id not in self.unit_effects:
-            self.unit_effects[unit_id] = []
+            self.unit_effects[unit_id] = {}
 
         # Check if this effect already exists (avoid duplicates)
         existing = self.get_effect(unit_id, effect.name)
@@ -71,39 +171,61 @@ class EffectsSystem:
             if effect.duration == EffectDuration.TIMED:
                 existing.turns_remaining = max(existing.turns_remaining, effect.turns_remaining)
             else:
+                self._adjust_total(unit_id, existing.effect_type, effect.value - existing.value)
                 existing.value = effect.value  # Refresh the effect
         else:
-            self.unit_effects[unit_id].append(effect)
+            self.unit_effects[unit_id][effect.name] = effect
+            self._adjust_total(unit_id, effect.effect_type, effect.value)
+        self._touch(unit_id)
 
     def remove_effect(self, unit_id: str, effect_name: str) -> bool:
         """Remove a specific effect from a unit. Returns True if removed."""
-        if unit_id in self.unit_effects:
-            for i, effect in enumerate(self.unit_effects[unit_id]):
-                if effect.name == effect_name:
-                    del self.unit_effects[unit_id][i]
-                    return True
-        return False
+        if effect_name not in self.unit_effects.get(unit_id, {}):
+            return False
+        self._record(unit_id)
+        effect = self.unit_effects[unit_id].pop(effect_name)
+
+        self._adjust_total(unit_id, effect.effect_type, -effect.value)
+        self._touch(unit_id)
+        return True
 
     def get_effect(self, unit_id: str, effect_name: str) -> Optional[Effect]:
         """Get a specific effect on a unit"""
-        if unit_id in self.unit_effects:
-            for effect in self.unit_effects[unit_id]:
-                if effect.name == effect_name:
-                    return effect
-        return None
+        return self.unit_effects.get(unit_id, {}).get(effect_name)
 
     def get_all_effects(self, unit_id: str) -> List[Effect]:
         """Get all effects on a unit"""
-        return self.unit_effects.get(unit_id, [])
+        return list(self.unit_effects.get(unit_id, {}).values())
+
+    def get_effect_count(self, unit_id: str) -> int:
+        """Number of effects on a unit"""
+        return len(self.unit_effects.get(unit_id, {}))
 
     def has_any_effects(self, unit_id: str) -> bool:
         """Check if a unit has any effects (for visual indicator)"""
-        return len(self.get_all_effects(unit_id)) > 0
+        return bool(self.unit_effects.get(unit_id))
+
+    def get_unit_version(self, unit_id: str) -> int:
+        """Version of a unit's last effect change; compare against a cached value to detect changes"""
+        return self.unit_versions.get(unit_id, 0)
 
     def clear_unit_effects(self, unit_id: str) -> None:
         """Remove all effects from a unit"""
         if unit_id in self.unit_effects:
-            self.unit_effects[unit_id] = []
+            self._record(unit_id)
+            self.unit_effects[unit_id] = {}
+            self._totals.pop(unit_id, None)
+            self._touch(unit_id)
+
+    def clear(self) -> None:
+        """Remove all effects from all units (new game)"""
+        unit_ids = list(self.unit_effects)
+        for unit_id in unit_ids:
+            self._record(unit_id)
+        self.unit_effects = {}
+        self._totals = {}
+        for unit_id in unit_ids:
+            self._touch(unit_id)
 
     def process_turn_start(self, unit_id: str, current_turn: int) -> List[str]:
         """Process effects at the start of a unit's turn. Returns list of messages."""
@@ -113,7 +235,7 @@ class EffectsSystem:
 
         effects_to_remove = []
 
-        for effect in self.unit_effects[unit_id]:
+        for effect in self.unit_effects[unit_id].values():
             # Handle regeneration effects
             if effect.effect_type == EffectType.REGENERATION:
                 # This would need integration with the main game to actually heal
@@ -125,7 +247,9 @@ class EffectsSystem:
 
             # Countdown timed effects
             if effect.duration == EffectDuration.TIMED:
+                self._record(unit_id)
                 effect.turns_remaining -= 1
+                self._touch(unit_id)
                 if effect.turns_remaining <= 0:
                     effects_to_remove.append(effect.name)
 
@@ -148,7 +272,7 @@ class EffectsSystem:
 
         effects_to_remove = []
 
-        for effect in self.unit_effects[unit_id]:
+        for effect in self.unit_effects[unit_id].values():
             if effect.duration == EffectDuration.UNTIL_END_OF_TURN:
                 effects_to_remove.append(effect.name)
 
@@ -168,7 +292,7 @@ class EffectsSystem:
         effects_to_add = []
 
         # Check for Sword & Board effect
-        if "Sword & Board" in unit.special:
+        if unit.ability_id == AbilityId.SWORD_AND_BOARD:
             sword_board_effect = self.get_effect(unit_id, "Sword & Board Defense")
 
             # Unit hasn't moved this turn
@@ -190,7 +314,7 @@ class EffectsSystem:
                     effects_to_remove.append("Sword & Board Defense")
 
         # Check for Trusty Steed effect
-        if "Trusty Steed" in unit.special:
+        if unit.ability_id == AbilityId.TRUSTY_STEED:
             steed_effect = self.get_effect(unit_id, "Trusty Steed Bonus")
 
             # Unit hasn't attacked this turn
@@ -218,47 +342,26 @@ class EffectsSystem:
             self.remove_effect(unit_id, effect_name)
 
     def check_aura_effects(self, unit_positions: Dict, ability_system) -> None:
-        """Check and update aura effects (like Spotter) based on unit positions"""
-        # Clear all aura effects first
-        for unit_id in self.unit_effects:
-            effects_to_remove = []
-            for effect in self.unit_effects[unit_id]:
-                if effect.source_unit_id:  # This is an aura effect from another unit
-                    effects_to_remove.append(effect.name)
-
-            for effect_name in effects_to_remove:
-                self.remove_effect(unit_id, effect_name)
-
-        # Reapply aura effects
-        for spotter_id, spotter_unit in unit_positions.items():
-            if "Spotter" in spotter_unit.special:
-                # Find all friendly units within range 4
-                for target_id, target_unit in unit_positions.items():
-                    if (target_unit.faction == spotter_unit.faction and
-                        target_unit != spotter_unit):
-
-                        distance = max(abs(spotter_unit.position[0] - target_unit.position[0]),
-                                     abs(spotter_unit.position[1] - target_unit.position[1]))
-
-                        if distance <= 4:
-                            effect = Effect(
-                                effect_type=EffectType.RANGE_BONUS,
-                                name="Spotter Bonus",
-                                description="+1 effective range from Spotter",
-                                value=1,
-                                duration=EffectDuration.CONDITIONAL,
-                                source_unit_id=spotter_id,
-                                condition="within_spotter_range"
-                            )
-                            self.add_effect(target_id, effect)
+        """Sync aura effects (Spotter, Warcry, Vigilance) with the board's aura coverage fields"""
+        auras = unit_positions.auras
+
+        for unit_id, unit in unit_positions.items():
+            for aura, (effect_name, make_effect) in AURA_EFFECTS.items():
+                count = auras.bonus_count(aura, unit)
+                existing = self.get_effect(unit_id, effect_name)
+
+                if not count:
+                    if existing:
+                        self.remove_effect(unit_id, effect_name)
+                elif not existing or existing.value != make_effect(count, None).value:
+                    # Newly covered, or covered by a different number of sources
+                    sources = auras.sources_covering(aura, unit)
+                    self.remove_effect(unit_id, effect_name)
+                    self.add_effect(unit_id, make_effect(count, sources[0] if sources else None))
 
     def get_total_effect_value(self, unit_id: str, effect_type: EffectType) -> int:
         """Get the total value of all effects of a specific type on a unit"""
-        total = 0
-        for effect in self.get_all_effects(unit_id):
-            if effect.effect_type == effect_type:
-                total += effect.value
-        return total
+        return self._totals.get(unit_id, {}).get(effect_type, 0)
 
     def get_effect_summary(self, unit_id: str) -> List[str]:
         """Get a human-readable summary of all effects on a unit"""
@@ -320,7 +423,7 @@ def can_unit_attack(unit, effects_system) -> bool:
         return False
 
     # Special case for Trusty Steed: if unit has the effect, they can't attack
-    if "Trusty Steed" in unit.special:
+    if unit.ability_id == AbilityId.TRUSTY_STEED:
         steed_effect = effects_system.get_effect(unit.unit_id, "Trusty Steed Bonus")
         if steed_effect:  # Unit is using Trusty Steed bonus, so can't attack
             return False
@@ -1,18 +1,125 @@
+from terrain import terrain_name
+from unit_table import UnitTable
+
+
 class GamePiece:
-    def __init__(self, unit_id, unit_class, name, hp, move, range, atk, special, position, terrain, faction):
+    """
+    A unit on the board. Stats live in a shared UnitTable row; this object is a
+    lightweight view onto that row plus the unit's text fields.
+    """
+
+    __slots__ = ("table", "index", "unit_id", "name", "special", "ability_id", "ability_name")
+
+    def __init__(self, unit_id, unit_class, name, hp, move, range, atk, special, position, terrain, faction,
+                 table=None, army=0):
+        self.table = table if table is not None else UnitTable(capacity=1)
+        self.index = self.table.add(unit_class, hp, move, range, atk, position, terrain, faction, army, unit_id)
         self.unit_id = unit_id
-        self.unit_class = unit_class
         self.name = name
-        self.hp = hp
-        self.move = move
-        self.moves_remaining = move  # New attribute
-        self.range = range
-        self.atk = atk
         self.special = special
-        self.position = position  # Tuple (row, col)
-        self.terrain = terrain  # Type of terrain the unit is on
-        self.faction = faction  # Faction name
-        self.has_attacked = False  # Track if unit has attacked this turn
+        self.ability_id = 0  # AbilityId, resolved once by SpecialAbilitySystem.bind_ability
+        self.ability_name = None  # Ability name parsed from special
+
+    def view_in(self, table):
+        """The same unit as a view onto another table with the same rows, such as a clone of this one"""
+        piece = GamePiece.__new__(GamePiece)
+        for slot in GamePiece.__slots__:
+            setattr(piece, slot, getattr(self, slot))
+        piece.table = table
+        return piece
+
+    def _set(self, column, value):
+        """Every stat write goes through here so the table version (and undo log) tracks all changes"""
+        self.table.set(column, self.index, value)
+
+    @property
+    def hp(self):
+        return self.table.hp[self.index].item()
+
+    @hp.setter
+    def hp(self, value):
+        self._set("hp", value)
+
+    @property
+    def max_hp(self):
+        return self.table.max_hp[self.index].item()
+
+    @property
+    def atk(self):
+        return self.table.atk[self.index].item()
+
+    @atk.setter
+    def atk(self, value):
+        self._set("atk", value)
+
+    @property
+    def move(self):
+        return self.table.move[self.index].item()
+
+    @move.setter
+    def move(self, value):
+        self._set("move", value)
+
+    @property
+    def moves_remaining(self):
+        return self.table.moves_remaining[self.index].item()
+
+    @moves_remaining.setter
+    def moves_remaining(self, value):
+        self._set("moves_remaining", value)
+
+    @property
+    def range(self):
+        return self.table.range[self.index].item()
+
+    @range.setter
+    def range(self, value):
+        self._set("range", value)
+
+    @property
+    def position(self):
+        """Tuple (row, col)"""
+        return self.table.row[self.index].item(), self.table.col[self.index].item()
+
+    @position.setter
+    def position(self, value):
+        self.table.set("row", self.index, value[0])
+        self.table.set("col", self.index, value[1])
+
+    @property
+    def terrain(self):
+        """Terrain code of the tile the unit is on"""
+        return self.table.terrain[self.index].item()
+
+    @terrain.setter
+    def terrain(self, value):
+        self._set("terrain", value)
+
+    @property
+    def faction(self):
+        """Faction name"""
+        return self.table.faction_names[self.table.faction[self.index]]
+
+    @property
+    def unit_class(self):
+        return self.table.class_names[self.table.unit_class[self.index]]
+
+    @property
+    def has_attacked(self):
+        """Track if unit has attacked this turn"""
+        return self.table.has_attacked[self.index].item()
+
+    @has_attacked.setter
+    def has_attacked(self, value):
+        self._set("has_attacked", value)
+
+    @property
+    def alive(self):
+        return self.table.alive[self.index].item()
+
+    @alive.setter
+    def alive(self, value):
+        self._set("alive", value)
 
     def __repr__(self):
-        return f"{self.name} (HP: {self.hp}, Pos: {self.position}, Terrain: {self.terrain}, Moves Remaining: {self.moves_remaining})"
\ No newline at end of file
+        return f"{self.name} (HP: {self.hp}, Pos: {self.position}, Terrain: {terrain_name(self.terrain)}, Moves Remaining: {self.moves_remaining})"
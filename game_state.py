@@ -0,0 +1,268 @@
+"""
+Game State for Fantasy Squad Tactics
+
+A whole battle with no window, for the game UI, headless rendering and simulations:
+- GameState owns the terrain map, the units, the ability and effects systems and whose turn it is
+- legal_actions() lists every move, attack, ability use and turn end open to the side to move
+- apply(action) checks an action is legal and performs it, with the same effect, aura and healing
+  updates the game window has always run
+- The battle is won when the other army has no units left
+- For search: track_changes() with an UndoLog lets undo_to() take back actions in time proportional to what
+  they changed, and clone() makes an independent copy for another worker far faster than deepcopy
+- position_key() is a 64-bit Zobrist key of the position (see zobrist.py) for transposition tables and caches
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from effects_system import EffectsSystem
+from legal_cache import LegalActionCache, game_state_version
+from populate import DEFAULT_TERRAIN_WEIGHTS, build_random_armies, generate_game_map, place_units_on_map
+from rules import MOVEMENT_COSTS, attack_unit, calculate_legal_ability_targets, calculate_legal_attacks, \
+    calculate_legal_moves, move_unit
+from special_abilities import SpecialAbilitySystem
+from terrain import HEALING
+from undo_log import UndoLog
+from zobrist import ZobristHash
+
+Position = Tuple[int, int]
+
+# Action kinds
+MOVE = "move"
+ATTACK = "attack"
+ABILITY = "ability"
+END_TURN = "end_turn"
+
+
+@dataclass(frozen=True)
+class Action:
+    """One player action. Moves, attacks and ability uses name the acting unit and the target tile."""
+    kind: str
+    unit_id: Optional[str] = None
+    target: Optional[Position] = None
+
+
+class GameState:
+    """Terrain, units, effects and turn of one battle, advanced one action at a time"""
+
+    def __init__(self, game_map, unit_positions, current_turn: int = 1,
+                 ability_system: Optional[SpecialAbilitySystem] = None,
+                 effects_system: Optional[EffectsSystem] = None, hp_bucket: int = 1):
+        self.game_map = game_map
+        self.unit_positions = unit_positions
+        self.current_turn = current_turn  # Army to act: 1 or 2
+        self.turns_played = 0  # Turns ended so far, counting both armies
+        self.ability_system = ability_system or SpecialAbilitySystem()
+        self.effects_system = effects_system or EffectsSystem()
+        self.legal_cache = LegalActionCache()
+        self.undo_log: Optional[UndoLog] = None
+        self.zobrist: Optional[ZobristHash] = None  # Attached by the first position_key() call
+        self.hp_bucket = hp_bucket  # HP hashed as hp // hp_bucket, so near-equal positions can share a key
+
+    @classmethod
+    def new_game(cls, faction_file: str, height: int, width: int, army_points: int = 20,
+                 terrain_weights: Optional[Dict[str, float]] = None, orient: str = "north-south",
+                 ability_system: Optional[SpecialAbilitySystem] = None,
+                 effects_system: Optional[EffectsSystem] = None, hp_bucket: int = 1) -> "GameState":
+        """Two random armies on a random map, with starting effects applied. Reused effects systems are cleared."""
+        armies = build_random_armies(faction_file, army_points=army_points)
+        game_map = generate_game_map(height, width, terrain_weights or DEFAULT_TERRAIN_WEIGHTS)
+        ability_system = ability_system or SpecialAbilitySystem()
+        unit_positions = place_units_on_map(game_map, armies["faction1"]["army"], armies["faction2"]["army"],
+                                            orient=orient, ability_system=ability_system)
+        if effects_system is not None:
+            effects_system.clear()
+        game = cls(game_map, unit_positions, ability_system=ability_system, effects_system=effects_system,
+                   hp_bucket=hp_bucket)
+        game.refresh_effects()
+        return game
+
+    def clone(self) -> "GameState":
+        """Independent copy of the battle. The terrain map and ability system are shared; play never changes them."""
+        game = GameState(self.game_map, self.unit_positions.clone(), self.current_turn, self.ability_system,
+                         self.effects_system.clone(), self.hp_bucket)
+        game.turns_played = self.turns_played
+        return game
+
+    # Make/unmake
+
+    def track_changes(self, undo_log: Optional[UndoLog]) -> None:
+        """
+        Record every change from now on in undo_log (None stops recording). Usage:
+            mark = undo_log.mark(); game.apply(action); ...; game.undo_to(mark)
+        """
+        self.undo_log = undo_log
+        self.unit_positions.undo_log = undo_log
+        self.unit_positions.table.undo_log = undo_log
+        self.unit_positions.auras.undo_log = undo_log
+        self.effects_system.undo_log = undo_log
+
+    def undo_to(self, mark: int) -> None:
+        """Take back every change made since undo_log.mark() returned mark"""
+        self.undo_log.undo_to(mark)
+
+    def _restore_turn(self, current_turn: int, turns_played: int) -> None:
+        self.current_turn, self.turns_played = current_turn, turns_played
+
+    # Queries
+
+    def position_key(self) -> int:
+        """
+        64-bit key of units, effects, auras and side to move: equal positions reached by different move orders
+        share it, as do positions whose HP differ only within an hp_bucket. The first call computes it in full;
+        after that it is kept current as the game changes.
+        """
+        if self.zobrist is None:
+            self.zobrist = ZobristHash(self.hp_bucket)
+            self.zobrist.attach(self.unit_positions, self.effects_system)
+        return self.zobrist.key(self.current_turn)
+
+    def version(self) -> Tuple[int, ...]:
+        return game_state_version(self.unit_positions, self.effects_system)
+
+    def army_of(self, unit) -> int:
+        return int(self.unit_positions.table.army[unit.index])
+
+    def is_own_unit(self, unit) -> bool:
+        """Whether the unit belongs to the army whose turn it is"""
+        return self.army_of(unit) == self.current_turn
+
+    def units_of(self, army: int) -> List[Any]:
+        return [unit for unit in self.unit_positions.values() if self.army_of(unit) == army]
+
+    @property
+    def winner(self) -> Optional[int]:
+        """The army still standing once the other has no units left, else None"""
+        table = self.unit_positions.table
+        standing = [army for army in (1, 2) if table.army_mask(army).any()]
+        return standing[0] if len(standing) == 1 else None
+
+    @property
+    def game_over(self) -> bool:
+        return self.winner is not None
+
+    def legal_moves(self, unit) -> Dict[Position, int]:
+        return self.legal_cache.get(unit.unit_id, "moves", self.version(),
+                                    lambda: calculate_legal_moves(unit, self.game_map, MOVEMENT_COSTS,
+                                                                  self.unit_positions, self.ability_system))
+
+    def legal_attacks(self, unit) -> Set[Position]:
+        return self.legal_cache.get(unit.unit_id, "attacks", self.version(),
+                                    lambda: calculate_legal_attacks(unit, self.game_map, self.unit_positions,
+                                                                    self.ability_system, self.effects_system))
+
+    def available_abilities(self, unit) -> List[Dict[str, Any]]:
+        return self.ability_system.get_available_active_abilities(unit, self.game_map, self.unit_positions)
+
+    def legal_ability_targets(self, unit, ability_name: str) -> Set[Position]:
+        return self.legal_cache.get(unit.unit_id, ("ability", ability_name), self.version(),
+                                    lambda: calculate_legal_ability_targets(unit, ability_name, self.game_map,
+                                                                            self.unit_positions, self.ability_system))
+
+    def legal_actions(self, unit_id: Optional[str] = None) -> List[Action]:
+        """Every action open to the side to move (or to one of its units), ending the turn last"""
+        if self.game_over:
+            return []
+        if unit_id is None:
+            units = [unit for unit in self.unit_positions.values() if self.is_own_unit(unit)]
+        else:
+            unit = self.unit_positions.get(unit_id)
+            units = [unit] if unit is not None and self.is_own_unit(unit) else []
+
+        actions = []
+        for unit in units:
+            actions.extend(Action(MOVE, unit.unit_id, target) for target in sorted(self.legal_moves(unit)))
+            actions.extend(Action(ATTACK, unit.unit_id, target) for target in sorted(self.legal_attacks(unit)))
+            abilities = self.available_abilities(unit)
+            if abilities:
+                targets = self.legal_ability_targets(unit, abilities[0]["name"])
+                actions.extend(Action(ABILITY, unit.unit_id, target) for target in sorted(targets))
+        actions.append(Action(END_TURN))
+        return actions
+
+    # Actions
+
+    def apply(self, action: Action) -> Optional[Dict[str, Any]]:
+        """
+        Perform a legal action and return the attack or ability result for UI feedback (None for moves and
+        turn ends). Raises ValueError for an illegal action, leaving the state unchanged.
+        """
+        if self.game_over:
+            raise ValueError("The game is over")
+        if action.kind == END_TURN:
+            self.end_turn()
+            return None
+
+        unit = self.unit_positions.get(action.unit_id)
+        if unit is None or not self.is_own_unit(unit):
+            raise ValueError(f"{action.unit_id} cannot act this turn")
+        effects_system = self.effects_system
+
+        if action.kind == MOVE:
+            legal_moves = self.legal_moves(unit)
+            if action.target not in legal_moves:
+                raise ValueError(f"{unit.unit_id} cannot move to {action.target}")
+            move_unit(unit.unit_id, action.target, self.unit_positions, self.game_map, MOVEMENT_COSTS,
+                      legal_moves[action.target])
+            unit.moves_remaining -= legal_moves[action.target]
+
+            # Update conditional and aura effects after movement
+            effects_system.check_conditional_effects(unit.unit_id, unit, {})
+            effects_system.check_aura_effects(self.unit_positions, self.ability_system)
+            return None
+
+        if action.kind == ATTACK:
+            if action.target not in self.legal_attacks(unit):
+                raise ValueError(f"{unit.unit_id} cannot attack {action.target}")
+            result = attack_unit(unit.unit_id, action.target, self.unit_positions, self.game_map,
+                                 self.ability_system)
+            effects_system.check_aura_effects(self.unit_positions, self.ability_system)
+            return result
+
+        if action.kind == ABILITY:
+            abilities = self.available_abilities(unit)
+            if not abilities or action.target not in self.legal_ability_targets(unit, abilities[0]["name"]):
+                raise ValueError(f"{unit.unit_id} cannot use an ability on {action.target}")
+            target_pos = action.target if action.target != unit.position else None  # Self-centred abilities
+            result = self.ability_system.execute_active_ability(unit, abilities[0]["name"], target_pos,
+                                                                self.game_map, self.unit_positions)
+            effects_system.check_aura_effects(self.unit_positions, self.ability_system)
+            return result
+
+        raise ValueError(f"Unknown action: {action.kind}")
+
+    def end_turn(self) -> None:
+        """Pass the turn: expire effects and auras, restore the next army's moves and attacks, heal on farms"""
+        unit_positions, effects_system = self.unit_positions, self.effects_system
+        if self.undo_log is not None:
+            self.undo_log.record(self._restore_turn, self.current_turn, self.turns_played)
+
+        # Process end-of-turn effects for current player's units
+        for unit_id, unit in unit_positions.items():
+            if self.is_own_unit(unit):
+                effects_system.process_turn_end(unit_id, self.current_turn)
+
+        self.current_turn = 2 if self.current_turn == 1 else 1
+        self.turns_played += 1
+
+        # Reset movement and attack status for new current player's units
+        unit_table = unit_positions.table
+        unit_table.start_turn(self.current_turn)
+
+        # Process start-of-turn effects
+        for unit_id, unit in unit_positions.items():
+            if self.is_own_unit(unit):
+                effects_system.process_turn_start(unit_id, self.current_turn)
+
+        # Apply healing for units on farms, capped at each unit's max HP
+        unit_table.apply_healing(HEALING)
+
+        # Expire cast auras (Warcry, Vigilance), then update all conditional and aura effects
+        unit_positions.auras.advance_turn()
+        self.refresh_effects()
+
+    def refresh_effects(self) -> None:
+        """Re-evaluate every unit's conditional and aura effects"""
+        for unit_id, unit in self.unit_positions.items():
+            self.effects_system.check_conditional_effects(unit_id, unit, {})
+        self.effects_system.check_aura_effects(self.unit_positions, self.ability_system)
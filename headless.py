@@ -0,0 +1,180 @@
+"""
+Headless Rendering for Fantasy Squad Tactics
+
+Draws the game without a window, under SDL's dummy video driver:
+- OffscreenGame renders the board, UI panel and tooltips into an offscreen Surface the size of the game window
+- Games come from a save file (F5 in the game) or a random seed, so a snapshot can be reproduced on any machine
+- PNG snapshots, and a pixel diff against a reference image for regression checks on machines with no display
+- `python benchmarks.py render` times frames through the same path
+
+Examples:
+    python headless.py --seed 7 --out snapshot.png
+    python headless.py --state quicksave.json --select A1_0 --mode attack --out attack.png
+    python headless.py --seed 7 --compare reference.png
+"""
+
+import argparse
+import os
+import random
+import sys
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pygame
+
+from assets import AssetManager, resource_path
+from camera import Camera
+from effects_system import EffectsSystem
+from game_state import GameState
+from main import CELL_SIZE, army_center, window_layout
+from renderer import GameRenderer, ViewState, action_availability
+from rules import MOVEMENT_COSTS
+from savegame import load_game, save_game
+from special_abilities import SpecialAbilitySystem
+from terrain import Terrain
+from text_cache import FontRegistry
+from threat_map import ThreatMaps
+
+OFF_BOARD = (-1, -1)  # Mouse position that hovers nothing
+MODES = ("move", "attack", "ability")
+
+
+def init_headless() -> None:
+    """Start pygame on the dummy video and audio drivers unless a real one was requested"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))  # Image conversion needs a display mode, even a dummy one
+
+
+def random_game(seed: int, height: int = 10, width: int = 10, army_points: int = 20,
+                faction_file: Optional[str] = None, terrain_weights: Optional[Dict[str, float]] = None) -> GameState:
+    """The game a new battle with this seed starts with"""
+    random.seed(seed)
+    np.random.seed(seed)
+    return GameState.new_game(faction_file or resource_path("factions.json"), height, width, army_points,
+                              terrain_weights)
+
+
+def pixel_diff(a: pygame.Surface, b: pygame.Surface) -> int:
+    """Number of pixels whose RGB colour differs between two surfaces of the same size"""
+    if a.get_size() != b.get_size():
+        raise ValueError(f"Cannot compare a {a.get_size()} image with a {b.get_size()} image")
+    return int(np.any(pygame.surfarray.array3d(a) != pygame.surfarray.array3d(b), axis=2).sum())
+
+
+class OffscreenGame:
+    """A GameState drawn by GameRenderer into an offscreen surface instead of the window"""
+
+    def __init__(self, game: GameState, cell_size: int = CELL_SIZE):
+        init_headless()
+        self.game = game
+        self.threat_maps = ThreatMaps(MOVEMENT_COSTS, game.ability_system, game.effects_system)
+
+        width, board_height, height = window_layout(game.game_map.shape, cell_size)
+        self.surface = pygame.Surface((width, height))
+
+        assets = AssetManager()
+        assets.preload(cell_size, (100, 50),
+                       {(unit.faction, unit.unit_class) for unit in game.unit_positions.values()})
+        terrain_tiles = [assets.image(f'{terrain.label}.png') for terrain in Terrain]
+        gameboard_bg = assets.image('gameboard.png', (width, board_height))
+
+        self.camera = Camera(pygame.Rect(0, 0, width, board_height), game.game_map.shape, cell_size)
+        self.renderer = GameRenderer(self.surface, self.camera, assets, FontRegistry().game_fonts(),
+                                     game.ability_system, game.effects_system, present=False)
+        self.renderer.set_map(game.game_map, gameboard_bg, terrain_tiles)
+        self.camera.center_on(army_center(game.unit_positions, game.current_turn))
+
+    @classmethod
+    def from_save(cls, path: str, cell_size: int = CELL_SIZE) -> "OffscreenGame":
+        ability_system, effects_system = SpecialAbilitySystem(), EffectsSystem()
+        game_map, unit_positions, current_turn = load_game(path, ability_system, effects_system)
+        return cls(GameState(game_map, unit_positions, current_turn, ability_system, effects_system), cell_size)
+
+    @classmethod
+    def from_seed(cls, seed: int, height: int = 10, width: int = 10, army_points: int = 20,
+                  cell_size: int = CELL_SIZE) -> "OffscreenGame":
+        return cls(random_game(seed, height, width, army_points), cell_size)
+
+    def view(self, selected_unit: Optional[str] = None, mode: str = "move") -> ViewState:
+        """What the game window would show with this unit selected in this mode"""
+        game = self.game
+        unit = game.unit_positions[selected_unit] if selected_unit else None
+        can_move, can_attack, available_abilities = action_availability(unit, game.game_map, game.unit_positions,
+                                                                         game.ability_system, game.effects_system)
+        legal_moves, legal_attacks, legal_ability_targets = {}, set(), set()
+        if unit and mode == "move":
+            legal_moves = game.legal_moves(unit)
+        elif unit and mode == "attack":
+            legal_attacks = game.legal_attacks(unit)
+        elif unit and mode == "ability" and available_abilities:
+            legal_ability_targets = game.legal_ability_targets(unit, available_abilities[0]["name"])
+        return ViewState(
+            game_map=game.game_map,
+            unit_positions=game.unit_positions,
+            current_turn=game.current_turn,
+            mode=mode,
+            state_version=game.version(),
+            selected_unit=unit,
+            legal_moves=legal_moves,
+            legal_attacks=legal_attacks,
+            legal_ability_targets=legal_ability_targets,
+            move_threat=self.threat_maps.for_unit(unit, game.game_map, game.unit_positions) if legal_moves else None,
+            can_move=can_move,
+            can_attack=can_attack,
+            available_abilities=available_abilities,
+            winner=game.winner,
+        )
+
+    def render(self, view: Optional[ViewState] = None, mouse_pos: Tuple[int, int] = OFF_BOARD) -> pygame.Surface:
+        """Paint a whole frame and return the offscreen surface"""
+        self.renderer.invalidate()
+        self.renderer.render(view or self.view(), mouse_pos)
+        return self.surface
+
+    def save(self, path: str) -> None:
+        game = self.game
+        save_game(path, game.game_map, game.unit_positions, game.current_turn, game.effects_system)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Render Fantasy Squad Tactics snapshots without a display")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--state", help="Saved game to render (F5 in the game writes quicksave.json)")
+    source.add_argument("--seed", type=int, default=0, help="Seed of a new random game to render")
+    parser.add_argument("--height", type=int, default=10, help="Map rows of a seeded game")
+    parser.add_argument("--width", type=int, default=10, help="Map columns of a seeded game")
+    parser.add_argument("--points", type=int, default=20, help="Army points per side of a seeded game")
+    parser.add_argument("--select", help="Unit id to show as selected, e.g. A1_0")
+    parser.add_argument("--mode", choices=MODES, default="move", help="Overlay shown for the selected unit")
+    parser.add_argument("--hover", type=int, nargs=2, metavar=("X", "Y"), help="Mouse position for a tooltip")
+    parser.add_argument("--out", default="snapshot.png", help="PNG file to write")
+    parser.add_argument("--save-state", help="Also write the rendered game state to this file")
+    parser.add_argument("--compare", help="Reference PNG; exit with status 1 if any pixel differs")
+    args = parser.parse_args(argv)
+
+    if args.state:
+        offscreen = OffscreenGame.from_save(args.state)
+    else:
+        offscreen = OffscreenGame.from_seed(args.seed, args.height, args.width, args.points)
+    if args.select and args.select not in offscreen.game.unit_positions:
+        parser.error(f"No unit {args.select} in play")
+
+    surface = offscreen.render(offscreen.view(args.select, args.mode), tuple(args.hover) if args.hover else OFF_BOARD)
+    pygame.image.save(surface, args.out)
+    print(f"Wrote {args.out} ({surface.get_width()}x{surface.get_height()})")
+    if args.save_state:
+        offscreen.save(args.save_state)
+        print(f"Wrote {args.save_state}")
+
+    if args.compare:
+        differing = pixel_diff(surface, pygame.image.load(args.compare))
+        print(f"{differing} pixels differ from {args.compare}")
+        return 1 if differing else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
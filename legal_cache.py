@@ -0,0 +1,63 @@
+"""
+Legal Action Cache for Fantasy Squad Tactics
+
+Memoizes legal moves, attacks and ability targets per unit:
+- Entries are keyed by (unit_id, kind) and tagged with the game-state version they were computed at
+- The version changes whenever a unit moves, dies, attacks, changes stats, or gains or loses an effect
+- Bounded size with least-recently-used eviction, plus hit/miss counters
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+
+
+def game_state_version(unit_positions, effects_system=None) -> Tuple[int, ...]:
+    """Tuple that changes whenever anything legal actions depend on changes"""
+    return (
+        unit_positions.version,  # Placements, moves and removals
+        unit_positions.table.version,  # Stat writes: moves remaining, has_attacked, hp, ...
+        unit_positions.auras.version,  # Aura coverage
+        effects_system.version if effects_system is not None else 0,
+    )
+
+
+class LegalActionCache:
+    """Bounded LRU cache of legal action sets. Returned values are shared; treat them as read-only."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[Hashable, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, unit_id: str, kind: Hashable, version: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for (unit_id, kind) if it was computed at this version, else compute it"""
+        key = (unit_id, kind)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        value = compute()
+        self._entries[key] = (version, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -1,231 +1,64 @@
+import argparse
+import numpy as np
 import pygame
 from game_classes import GamePiece
-from populate import generate_game_map, build_random_armies, place_units_on_map
-from special_abilities import SpecialAbilitySystem, get_unit_effective_range, apply_damage_reductions, \
-    get_movement_modifications
+from populate import DEFAULT_TERRAIN_WEIGHTS, generate_game_map, build_random_armies, place_units_on_map
+from special_abilities import SpecialAbilitySystem
 from effects_system import EffectsSystem, apply_effects_to_damage, apply_effects_to_range, apply_effects_to_movement, \
-    apply_effects_to_attack, can_unit_attack
+    apply_effects_to_attack
+from threat_map import ThreatMaps
+from game_state import GameState, Action, MOVE, ATTACK, ABILITY, END_TURN
+# The rules moved to rules.py; re-exported here for scripts that import them from main
+from rules import MOVEMENT_COSTS, move_unit, attack_unit, calculate_legal_moves, calculate_effective_range, \
+    calculate_legal_attacks, calculate_legal_ability_targets
+from assets import AssetManager, resource_path
+from camera import Camera
+from savegame import save_game
+from renderer import GameRenderer, ViewState, action_availability
+from text_cache import FontRegistry, TextCache
+from terrain import Terrain, TerrainNameView
 import math
 
 selected_tile = None
 
-MOVEMENT_COSTS = {"Plains": 1, "Forest": 2, "Mountain": 3, "Lake": float('inf'), "River": 3, "Farm": 1, "Village": 1,
-                  "City": 2}
+# Frame pacing
+FRAME_RATE_CAP = 60  # Upper bound on frames per second while animating
+MESSAGE_DURATION = 3.0  # Seconds an attack/ability result stays on screen
+PROJECTILE_SPEED = 9.0  # Fraction of the flight covered per second (a projectile lands in ~0.11s)
 
+# Board view: larger maps scroll and zoom inside a window of at most this size
+CELL_SIZE = 80
+MAX_BOARD_VIEW = (1280, 800)
+UI_PANEL_HEIGHT = 300
+PAN_KEYS = {
+    pygame.K_LEFT: (-1, 0), pygame.K_a: (-1, 0),
+    pygame.K_RIGHT: (1, 0), pygame.K_d: (1, 0),
+    pygame.K_UP: (0, -1), pygame.K_w: (0, -1),
+    pygame.K_DOWN: (0, 1), pygame.K_s: (0, 1),
+}
+ZOOM_KEYS = {pygame.K_PLUS: 1, pygame.K_EQUALS: 1, pygame.K_KP_PLUS: 1, pygame.K_MINUS: -1, pygame.K_KP_MINUS: -1}
+QUICKSAVE_FILE = "quicksave.json"  # Written with F5; render it with `python headless.py --state quicksave.json`
 
-def move_unit(unit_id, new_position, unit_positions, terrain_map, movement_costs):
-    row, col = new_position
-    if row < 0 or row >= terrain_map.shape[0] or col < 0 or col >= terrain_map.shape[1]:
-        raise ValueError("Position out of bounds")
 
-    terrain = terrain_map[row, col]
-    cost = movement_costs.get(terrain, float('inf'))
 
-    if terrain in {"Lake"}:
-        raise ValueError("Terrain not passable")
+def window_layout(map_shape, cell_size=CELL_SIZE):
+    """(width, board height, window height): the board fits the map up to MAX_BOARD_VIEW, the UI panel sits below"""
+    width = min(map_shape[1] * cell_size, MAX_BOARD_VIEW[0])
+    board_height = min(map_shape[0] * cell_size, MAX_BOARD_VIEW[1])
+    return width, board_height, board_height + UI_PANEL_HEIGHT
 
-    unit = unit_positions[unit_id]
-    if cost > unit.moves_remaining:
-        raise ValueError("Not enough movement points")
 
-    unit.position = new_position
-    unit.terrain = terrain
-    unit_positions[unit_id] = unit
-
-
-def attack_unit(attacker_id, target_position, unit_positions, terrain_map, ability_system):
-    """
-    Performs an attack from attacker to target at target_position.
-    Returns a dictionary with attack results for UI feedback.
-    """
-    attacker = unit_positions[attacker_id]
-
-    # Check if unit has already attacked this turn
-    if attacker.has_attacked:
-        raise ValueError("Unit has already attacked this turn")
-
-    # Find the target unit at the given position
-    target = None
-    target_id = None
-    for uid, unit in unit_positions.items():
-        if unit.position == target_position:
-            target = unit
-            target_id = uid
-            break
-
-    if not target:
-        raise ValueError("No target found at specified position")
-
-    if target.faction == attacker.faction:
-        raise ValueError("Cannot attack friendly units")
-
-    # Calculate base damage
-    base_damage = attacker.atk
-
-    # Apply terrain modifiers
-    attacker_terrain = terrain_map[attacker.position[0], attacker.position[1]]
-    target_terrain = terrain_map[target.position[0], target.position[1]]
-
-    # Mountain bonus: +1 damage when attacking from mountain
-    damage_bonus = 0
-    if attacker_terrain == "Mountain" and target_terrain != "Mountain":
-        damage_bonus += 1
-
-    # Apply damage reductions using ability system
-    preliminary_damage = base_damage + damage_bonus
-    final_damage = apply_damage_reductions(target, preliminary_damage, terrain_map, ability_system)
-
-    # Apply damage
-    target.hp -= final_damage
-
-    # Mark attacker as having attacked
-    attacker.has_attacked = True
-
-    # Calculate if this is a ranged attack (distance > 1)
-    distance = max(abs(attacker.position[0] - target.position[0]),
-                   abs(attacker.position[1] - target.position[1]))
-    is_ranged = distance > 1
-
-    # Prepare result info
-    result = {
-        "attacker": attacker.name,
-        "target": target.name,
-        "damage": final_damage,
-        "target_remaining_hp": target.hp,
-        "target_defeated": target.hp <= 0,
-        "terrain_bonus": damage_bonus,
-        "terrain_reduction": preliminary_damage - final_damage,
-        "is_ranged": is_ranged,
-        "attacker_pos": attacker.position,
-        "target_pos": target.position
-    }
-
-    # Remove defeated unit
-    if target.hp <= 0:
-        del unit_positions[target_id]
-
-    # Check for triggered abilities (like Double Tap)
-    ability_name = attacker.special.split(" - ")[0] if " - " in attacker.special else attacker.special
-    if ability_name == "Double tap" and target.hp <= 0:
-        result["triggered_ability"] = "Double tap available"
-
-    return result
-
-
-def calculate_legal_moves(unit, terrain_map, movement_costs, unit_positions, ability_system):
-    height, width = terrain_map.shape
-    legal_moves = {}
-
-    # Get movement modifications from abilities
-    move_bonus, special_movement = get_movement_modifications(unit, terrain_map, unit_positions, ability_system)
-    effective_moves = unit.moves_remaining + move_bonus
-
-    to_visit = [(unit.position, effective_moves)]
-    occupied_positions = {u.position for u in unit_positions.values() if u != unit}
-
-    while to_visit:
-        current_pos, remaining_move = to_visit.pop()
-        move_cost = effective_moves - remaining_move
-
-        if current_pos != unit.position and (current_pos not in legal_moves or move_cost < legal_moves[current_pos]):
-            legal_moves[current_pos] = move_cost
-
-        row, col = current_pos
-        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            new_row, new_col = row + dr, col + dc
-            new_pos = (new_row, new_col)
-
-            if (
-                    0 <= new_row < height
-                    and 0 <= new_col < width
-                    and new_pos not in occupied_positions
-            ):
-                terrain = terrain_map[new_row, new_col]
-                cost = movement_costs.get(terrain, float('inf'))
-
-                # Check for special movement abilities
-                if "flight" in special_movement:
-                    if terrain == "Lake":
-                        continue  # Can fly over but not end turn here
-                    cost = 1  # All terrain costs 1 for flying units
-
-                if cost <= remaining_move:
-                    to_visit.append((new_pos, remaining_move - cost))
-
-    return legal_moves
-
-
-def calculate_effective_range(unit, terrain_map, unit_positions, ability_system):
-    """Calculate the effective range of a unit including all bonuses."""
-    return get_unit_effective_range(unit, terrain_map, unit_positions, ability_system)
-
-
-def calculate_legal_attacks(unit, terrain_map, unit_positions, ability_system):
-    # Can't attack if already attacked this turn
-    if unit.has_attacked:
-        return set()
-
-    height, width = terrain_map.shape
-    legal_attacks = set()
-    row, col = unit.position
-
-    effective_range = calculate_effective_range(unit, terrain_map, unit_positions, ability_system)
-
-    for dr in range(-effective_range, effective_range + 1):
-        for dc in range(-effective_range, effective_range + 1):
-            new_row, new_col = row + dr, col + dc
-            if 0 <= new_row < height and 0 <= new_col < width and (dr != 0 or dc != 0):
-                distance = max(abs(dr), abs(dc))
-
-                if distance <= effective_range:
-                    target_pos = (new_row, new_col)
-                    for target in unit_positions.values():
-                        if target.position == target_pos and target.faction != unit.faction:
-                            legal_attacks.add(target_pos)
-
-    return legal_attacks
-
-
-def calculate_legal_ability_targets(unit, ability_name, terrain_map, unit_positions, ability_system):
-    """Calculate valid targets for a special ability"""
-    ability = ability_system.get_ability_info(ability_name)
-    if not ability:
-        return set()
-
-    legal_targets = set()
-    ability_range = ability.get("range", 0)
-
-    if ability_range == 0:
-        return {unit.position}  # Self-targeted or area effect
-
-    height, width = terrain_map.shape
-    row, col = unit.position
-
-    for dr in range(-ability_range, ability_range + 1):
-        for dc in range(-ability_range, ability_range + 1):
-            new_row, new_col = row + dr, col + dc
-            if 0 <= new_row < height and 0 <= new_col < width:
-                distance = max(abs(dr), abs(dc))
-                if distance <= ability_range:
-                    target_pos = (new_row, new_col)
-
-                    # Different abilities target different things
-                    if ability_name in ["Lure"]:  # Area effect abilities
-                        legal_targets.add(target_pos)
-                    elif ability_name in ["Grab"]:  # Enemy-targeting abilities
-                        for target in unit_positions.values():
-                            if target.position == target_pos and target.faction != unit.faction:
-                                legal_targets.add(target_pos)
-                    elif ability_name in ["For the King!", "Strategic Savant"]:  # Ally-targeting abilities
-                        for target in unit_positions.values():
-                            if target.position == target_pos and target.faction == unit.faction and target != unit:
-                                legal_targets.add(target_pos)
-
-    return legal_targets
+def army_center(unit_positions, army_id):
+    """Tile at the middle of an army's units, where the camera starts"""
+    positions = [unit.position for unit_id, unit in unit_positions.items() if f"A{army_id}" in unit_id]
+    if not positions:
+        return unit_positions.occupancy.shape[0] // 2, unit_positions.occupancy.shape[1] // 2
+    rows, cols = zip(*positions)
+    return sum(rows) // len(rows), sum(cols) // len(cols)
 
 
 def render_combined_map(terrain_map, unit_positions):
-    combined_map = terrain_map.copy()
+    combined_map = np.array(TerrainNameView(terrain_map))
 
     for unit in unit_positions.values():
         row, col = unit.position
@@ -236,61 +69,46 @@ def render_combined_map(terrain_map, unit_positions):
 
 
 def display_game_with_pygame(game_map, unit_positions, faction_file, map_height, map_width, terrain_weights,
-                             army_points):
+                             army_points, frame_rate_cap=FRAME_RATE_CAP):
     pygame.init()
-    cell_size = 80
-    width = game_map.shape[1] * cell_size
-    height = game_map.shape[0] * cell_size + 300  # Increased height even more for ability description
+    cell_size = CELL_SIZE
+    # The window fits the map up to MAX_BOARD_VIEW; beyond that the camera scrolls
+    width, board_height, height = window_layout(game_map.shape, cell_size)
 
-    # Initialize ability system and effects system
+    # Initialize ability system and effects system; the rules run in GameState, the window only draws and clicks
     ability_system = SpecialAbilitySystem()
     effects_system = EffectsSystem()
+    game = GameState(game_map, unit_positions, ability_system=ability_system, effects_system=effects_system)
+    game.refresh_effects()
+    threat_maps = ThreatMaps(MOVEMENT_COSTS, ability_system, effects_system)
 
     try:
         screen = pygame.display.set_mode((width, height))
         pygame.display.set_caption("Fantasy Squad Tactics @==|========>")  # CHANGED TITLE TO VERIFY UPDATE
 
-        # Load graphical tiles
-        terrain_tiles = {
-            'Plains': pygame.image.load('graphics/Plains.png').convert_alpha(),
-            'Forest': pygame.image.load('graphics/Forest.png').convert_alpha(),
-            'Mountain': pygame.image.load('graphics/Mountain.png').convert_alpha(),
-            'Lake': pygame.image.load('graphics/Lake.png').convert_alpha(),
-            'River': pygame.image.load('graphics/River.png').convert_alpha(),
-            'Farm': pygame.image.load('graphics/Farm.png').convert_alpha(),
-            'Village': pygame.image.load('graphics/Village.png').convert_alpha(),
-            'City': pygame.image.load('graphics/City.png').convert_alpha()
-        }
-
-        # Load gameboard background
-        try:
-            gameboard_bg = pygame.image.load('graphics/gameboard.png').convert_alpha()
-            gameboard_bg = pygame.transform.scale(gameboard_bg, (width, game_map.shape[0] * cell_size))
-        except FileNotFoundError:
-            gameboard_bg = None  # Fallback to green if not found
-
-        # Load UI graphics
-        try:
-            legal_moves_icon = pygame.image.load('graphics/legal-moves.png').convert_alpha()
-        except FileNotFoundError:
-            legal_moves_icon = None  # Fallback to yellow square if image not found
+        # Decode, convert and scale every image once; frames only blit cached surfaces
+        assets = AssetManager()
+        button_size = (100, 50)
+        assets.preload(cell_size, button_size, {(unit.faction, unit.unit_class) for unit in unit_positions.values()})
 
-        try:
-            selected_unit_icon = pygame.image.load('graphics/selected-unit.png').convert_alpha()
-        except FileNotFoundError:
-            selected_unit_icon = None  # Fallback to green circle if image not found
-
-        # Load effect indicator graphics
-        effect_icons = {}
-        for i in range(1, 4):  # Load has-1-effect.png through has-3-effect.png
-            try:
-                effect_icons[i] = pygame.image.load(f'graphics/has-{i}-effect.png').convert_alpha()
-            except FileNotFoundError:
-                effect_icons[i] = None
-
-        font = pygame.font.Font('IMFellEnglishSC-Regular.ttf', 24)
-        small_font = pygame.font.Font('IMFellEnglishSC-Regular.ttf', 18)
-        current_turn = 1
+        # Load graphical tiles
+        # Indexed by terrain code
+        terrain_tiles = [assets.image(f'{terrain.label}.png') for terrain in Terrain]
+
+        # Load gameboard background (None falls back to green)
+        gameboard_bg = assets.image('gameboard.png', (width, board_height))
+
+        # Each font face is opened once; rendered strings are cached by (font, text, color)
+        font_registry = FontRegistry()
+        text_cache = TextCache()
+        fonts = font_registry.game_fonts()
+
+        # Retained-mode renderer: only tiles, panels and tooltips that changed are repainted
+        camera = Camera(pygame.Rect(0, 0, width, board_height), game_map.shape, cell_size)
+        renderer = GameRenderer(screen, camera, assets, fonts, ability_system, effects_system, text_cache)
+        renderer.set_map(game_map, gameboard_bg, terrain_tiles)
+        camera.center_on(army_center(unit_positions, 1))
+        pygame.key.set_repeat(200, 30)  # Held arrow keys keep panning
         running = True
 
         selected_unit = None
@@ -302,37 +120,13 @@ def display_game_with_pygame(game_map, unit_positions, faction_file, map_height,
         # Combat feedback variables
         last_attack_result = None
         last_ability_result = None
-        attack_message_timer = 0
+        attack_message_timer = 0.0  # Seconds left to show the last result
 
         # Animation variables
         projectile_animations = []
 
-        def reset_game():
-            nonlocal game_map, unit_positions, selected_unit, legal_moves, legal_attacks, legal_ability_targets, last_attack_result, last_ability_result, projectile_animations
-            armies = build_random_armies(faction_file, army_points=army_points)
-            army1 = armies["faction1"]["army"]
-            army2 = armies["faction2"]["army"]
-
-            game_map_data = generate_game_map(
-                height=map_height,
-                width=map_width,
-                terrain_weights=terrain_weights
-            )
-            game_map = game_map_data
-
-            unit_positions = place_units_on_map(
-                terrain_map=game_map,
-                army1=army1,
-                army2=army2,
-                orient="north-south"
-            )
-
-            # Remove the test effect code
-            effects_system.unit_effects = {}  # Clear all effects
-            for unit_id, unit in unit_positions.items():
-                effects_system.check_conditional_effects(unit_id, unit, {})
-            effects_system.check_aura_effects(unit_positions, ability_system)
-
+        def clear_selection():
+            nonlocal selected_unit, legal_moves, legal_attacks, legal_ability_targets, last_attack_result, last_ability_result, projectile_animations
             selected_unit = None
             legal_moves = {}
             legal_attacks = set()
@@ -341,456 +135,87 @@ def display_game_with_pygame(game_map, unit_positions, faction_file, map_height,
             last_ability_result = None
             projectile_animations = []
 
-        def end_turn():
-            nonlocal current_turn, selected_unit, legal_moves, legal_attacks, legal_ability_targets, last_attack_result, last_ability_result, projectile_animations
-
-            # Process end-of-turn effects for current player's units
-            for unit_id, unit in unit_positions.items():
-                if (current_turn == 1 and "A1" in unit_id) or (current_turn == 2 and "A2" in unit_id):
-                    effects_system.process_turn_end(unit_id, current_turn)
-
-            current_turn = 2 if current_turn == 1 else 1
-            selected_unit = None
-            legal_moves = {}
-            legal_attacks = set()
-            legal_ability_targets = set()
-            last_attack_result = None
-            last_ability_result = None
-            projectile_animations = []
-
-            # Reset movement and attack status for new current player's units
-            for unit_id, unit in unit_positions.items():
-                if (current_turn == 1 and "A1" in unit_id) or (current_turn == 2 and "A2" in unit_id):
-                    unit.moves_remaining = unit.move
-                    unit.has_attacked = False
-
-                    # Process start-of-turn effects
-                    effects_system.process_turn_start(unit_id, current_turn)
-
-                # Apply healing for units on farms
-                if unit.terrain == "Farm":
-                    max_hp = get_max_hp_for_unit(unit)
-                    if unit.hp < max_hp:
-                        unit.hp = min(unit.hp + 1, max_hp)
-
-            # Update all conditional and aura effects
-            for unit_id, unit in unit_positions.items():
-                effects_system.check_conditional_effects(unit_id, unit, {})
-            effects_system.check_aura_effects(unit_positions, ability_system)
-
-        def get_max_hp_for_unit(unit):
-            """Get the original max HP for a unit by looking up its stats."""
-            max_hp_by_class = {
-                "Scout": 7, "Ranger": 10, "Melee": 15, "Heavy": 22, "Artillery": 12, "Leader": 24
-            }
-            return max_hp_by_class.get(unit.unit_class, unit.hp)
-
-        def draw_map():
-            # Draw gameboard background first
-            if gameboard_bg:
-                screen.blit(gameboard_bg, (0, 0))
-
-            for row in range(game_map.shape[0]):
-                for col in range(game_map.shape[1]):
-                    terrain = game_map[row, col]
-                    tile = terrain_tiles.get(terrain, None)
-                    if tile:
-                        # Remove the green background since we're using gameboard.png
-                        screen.blit(tile, (col * cell_size, row * cell_size))
-
-                    if (row, col) in legal_moves:
-                        if legal_moves_icon:
-                            # Use the legal-moves.png graphic
-                            screen.blit(legal_moves_icon, (col * cell_size, row * cell_size))
-                        else:
-                            # Fallback to yellow square if image not found
-                            pygame.draw.rect(
-                                screen, (255, 255, 0),
-                                (col * cell_size + 2, row * cell_size + 2, cell_size - 4, cell_size - 4),
-                                width=2
-                            )
-
-                        # Still show move cost number
-                        move_cost_text = small_font.render(str(legal_moves[(row, col)]), True, (0, 0, 0))
-                        screen.blit(move_cost_text, (col * cell_size + 5, row * cell_size + 5))
-
-                    if (row, col) in legal_attacks:
-                        pygame.draw.rect(
-                            screen, (255, 0, 0),
-                            (col * cell_size, row * cell_size, cell_size, cell_size),
-                            width=3
-                        )
-
-                    if (row, col) in legal_ability_targets:
-                        pygame.draw.rect(
-                            screen, (128, 0, 255),
-                            (col * cell_size, row * cell_size, cell_size, cell_size),
-                            width=3
-                        )
-
-            for piece in unit_positions.values():
-                row, col = piece.position
-                faction = piece.faction.replace(" ", "_")
-                tile_path = f"graphics/{faction}/{piece.unit_class.lower()}.png"
-
-                try:
-                    tile = pygame.image.load(tile_path).convert_alpha()
-                    background = pygame.Surface((cell_size, cell_size), pygame.SRCALPHA)
-                    if piece == selected_unit:
-                        if selected_unit_icon:
-                            # Use the selected-unit.png graphic
-                            screen.blit(selected_unit_icon, (col * cell_size, row * cell_size))
-                        else:
-                            # Fallback to green circle if image not found
-                            pygame.draw.circle(
-                                background,
-                                (0, 255, 0),
-                                (cell_size // 2, cell_size // 2),
-                                cell_size // 2,
-                                5
-                            )
-                            screen.blit(background, (col * cell_size, row * cell_size))
-                    else:
-                        screen.blit(background, (col * cell_size, row * cell_size))
-                    screen.blit(tile, (col * cell_size, row * cell_size))
-
-                    # Draw HP indicator
-                    hp_text = small_font.render(str(piece.hp), True, (255, 255, 255))
-                    hp_bg = pygame.Surface((hp_text.get_width() + 4, hp_text.get_height() + 2))
-                    hp_bg.fill((0, 0, 0))
-                    hp_bg.set_alpha(128)
-                    screen.blit(hp_bg, (col * cell_size + cell_size - hp_text.get_width() - 6, row * cell_size + 2))
-                    screen.blit(hp_text, (col * cell_size + cell_size - hp_text.get_width() - 4, row * cell_size + 3))
-
-                    # Draw attack status indicator (bottom-left corner) - only for current player's units
-                    if ((current_turn == 1 and "A1" in piece.unit_id) or (current_turn == 2 and "A2" in piece.unit_id)):
-                        try:
-                            if piece.has_attacked:
-                                attack_icon = pygame.image.load("graphics/attack-done.png").convert_alpha()
-                            else:
-                                attack_icon = pygame.image.load("graphics/attack-available.png").convert_alpha()
-                            # Scale to 80x80 and position to align with the unit tile
-                            attack_icon = pygame.transform.scale(attack_icon, (80, 80))
-                            screen.blit(attack_icon, (col * cell_size, row * cell_size))
-                        except FileNotFoundError:
-                            # Fallback to colored squares if images not found
-                            attack_indicator = pygame.Surface((15, 15))
-                            if piece.has_attacked:
-                                attack_indicator.fill((255, 0, 0))  # Red for used attack
-                            else:
-                                attack_indicator.fill((0, 255, 0))  # Green for available attack
-                            attack_indicator.set_alpha(180)
-                            screen.blit(attack_indicator, (col * cell_size + 2, row * cell_size + cell_size - 17))
-
-                    # Draw move status indicator (bottom-right corner) - only for current player's units
-                    if ((current_turn == 1 and "A1" in piece.unit_id) or (current_turn == 2 and "A2" in piece.unit_id)):
-                        try:
-                            if piece.moves_remaining <= 0:
-                                move_icon = pygame.image.load("graphics/move-done.png").convert_alpha()
-                            else:
-                                move_icon = pygame.image.load("graphics/move-available.png").convert_alpha()
-                            # Scale to 80x80 and position to align with the unit tile
-                            move_icon = pygame.transform.scale(move_icon, (80, 80))
-                            screen.blit(move_icon, (col * cell_size, row * cell_size))
-                        except FileNotFoundError:
-                            # Fallback to colored squares if images not found
-                            move_indicator = pygame.Surface((15, 15))
-                            if piece.moves_remaining <= 0:
-                                move_indicator.fill((255, 0, 0))  # Red for no moves left
-                            else:
-                                move_indicator.fill((0, 255, 0))  # Green for moves available
-                            move_indicator.set_alpha(180)
-                            screen.blit(move_indicator,
-                                        (col * cell_size + cell_size - 17, row * cell_size + cell_size - 17))
-
-                    # Draw effects indicator - use appropriate effect graphic based on number of effects
-                    if effects_system.has_any_effects(piece.unit_id):
-                        effect_count = len(effects_system.get_all_effects(piece.unit_id))
-                        # Cap at 3 effects for graphics (use has-3-effect.png for 3+ effects)
-                        effect_level = min(effect_count, 3)
-
-                        if effect_icons.get(effect_level):
-                            screen.blit(effect_icons[effect_level], (col * cell_size, row * cell_size))
-                        else:
-                            # Fallback to yellow dot if image not found
-                            pygame.draw.circle(screen, (255, 255, 0),
-                                               (col * cell_size + cell_size - 8, row * cell_size + 8), 6)
-                            pygame.draw.circle(screen, (0, 0, 0),
-                                               (col * cell_size + cell_size - 8, row * cell_size + 8), 6, 1)
-
-                except FileNotFoundError:
-                    pass
-
-            # Draw projectile animations
-            for projectile in projectile_animations[:]:
-                projectile['progress'] += projectile['speed']
-
-                if projectile['progress'] >= 1.0:
-                    projectile_animations.remove(projectile)
-                else:
-                    start_x = projectile['start'][1] * cell_size + cell_size // 2
-                    start_y = projectile['start'][0] * cell_size + cell_size // 2
-                    end_x = projectile['end'][1] * cell_size + cell_size // 2
-                    end_y = projectile['end'][0] * cell_size + cell_size // 2
-
-                    current_x = start_x + (end_x - start_x) * projectile['progress']
-                    current_y = start_y + (end_y - start_y) * projectile['progress']
-
-                    pygame.draw.circle(screen, projectile['color'], (int(current_x), int(current_y)), 6)
-                    pygame.draw.circle(screen, (255, 255, 255), (int(current_x), int(current_y)), 6, 2)
-
-        def draw_ui():
-            pygame.draw.rect(screen, (50, 50, 50), (0, game_map.shape[0] * cell_size + 75, width, 125))
-
-            large_font = pygame.font.Font('IMFellEnglishSC-Regular.ttf', 35)
-            turn_text = large_font.render(f"Player {current_turn}'s Turn", True, (200, 200, 200))
-            screen.blit(turn_text, (width // 2 - turn_text.get_width() // 2, game_map.shape[0] * cell_size + 10))
-
-            panel_x = 20
-            panel_y = game_map.shape[0] * cell_size + 65
-            panel_width = 300
-            panel_height = 130
-            pygame.draw.rect(screen, (80, 80, 80), (panel_x, panel_y, panel_width, panel_height))
-            pygame.draw.rect(screen, (200, 200, 200), (panel_x, panel_y, panel_width, panel_height), 2)
-
-            if selected_unit:
-                unit_name_text = font.render(selected_unit.name, True, (255, 255, 255))
-
-                # Create colored text for stats - labels in 66% gray (168, 168, 168), values in white
-                hp_label = font.render("hp: ", True, (168, 168, 168))
-                hp_value = font.render(str(selected_unit.hp), True, (255, 255, 255))
-                atk_label = font.render("  atk: ", True, (168, 168, 168))
-                atk_value = font.render(str(selected_unit.atk), True, (255, 255, 255))
-                range_label = font.render("  range: ", True, (168, 168, 168))
-                range_value = font.render(
-                    str(calculate_effective_range(selected_unit, game_map, unit_positions, ability_system)), True,
-                    (255, 255, 255))
-
-                moves_label = font.render("moves: ", True, (168, 168, 168))
-                moves_value = font.render(f"{selected_unit.moves_remaining}/{selected_unit.move}", True,
-                                          (255, 255, 255))
-
-                attacked_label = font.render("attacked: ", True, (168, 168, 168))
-                attacked_value = font.render('yes' if selected_unit.has_attacked else 'no', True,
-                                             (255, 0, 0) if selected_unit.has_attacked else (0, 255, 0))
-
-                # Show available abilities with better messaging
-                available_abilities = ability_system.get_available_active_abilities(selected_unit, game_map,
-                                                                                    unit_positions)
-                ability_name = selected_unit.special.split(" - ")[
-                    0] if " - " in selected_unit.special else selected_unit.special
-
-                if available_abilities:
-                    ability_label = small_font.render("ability: ", True, (168, 168, 168))
-                    ability_value = small_font.render(ability_name, True, (255, 255, 255))
-                else:
-                    # Check if unit has an ability but can't use it right now
-                    ability_info = ability_system.get_ability_info(ability_name)
-                    if ability_info and ability_system.is_active_ability(ability_name):
-                        ability_label = small_font.render("ability: ", True, (168, 168, 168))
-                        ability_value = small_font.render(f"{ability_name} (not currently usable)", True,
-                                                          (128, 128, 128))
-                    else:
-                        ability_label = small_font.render("ability: ", True, (168, 168, 168))
-                        ability_value = small_font.render(f"{ability_name} (passive)", True, (255, 255, 255))
-
-                faction = selected_unit.faction.replace(" ", "_")
-                unit_icon_path = f"graphics/{faction}/{selected_unit.unit_class.lower()}.png"
-
-                try:
-                    unit_icon = pygame.image.load(unit_icon_path).convert_alpha()
-                except FileNotFoundError:
-                    unit_icon = pygame.image.load("graphics/placeholder.png").convert_alpha()
-
-                icon_size = (50, 50)
-                unit_icon = pygame.transform.scale(unit_icon, icon_size)
-                screen.blit(unit_icon, (panel_x + 10, panel_y + 15))
-
-                screen.blit(unit_name_text, (panel_x + 70, panel_y + 10))
-
-                # Draw stats line with colored labels and values
-                stats_y = panel_y + 35
-                current_x = panel_x + 70
-                screen.blit(hp_label, (current_x, stats_y))
-                current_x += hp_label.get_width()
-                screen.blit(hp_value, (current_x, stats_y))
-                current_x += hp_value.get_width()
-                screen.blit(atk_label, (current_x, stats_y))
-                current_x += atk_label.get_width()
-                screen.blit(atk_value, (current_x, stats_y))
-                current_x += atk_value.get_width()
-                screen.blit(range_label, (current_x, stats_y))
-                current_x += range_label.get_width()
-                screen.blit(range_value, (current_x, stats_y))
-
-                # Draw moves line with colored labels and values
-                moves_y = panel_y + 60
-                current_x = panel_x + 70
-                screen.blit(moves_label, (current_x, moves_y))
-                current_x += moves_label.get_width()
-                screen.blit(moves_value, (current_x, moves_y))
-
-                # Draw attacked line with colored labels and values
-                attacked_y = panel_y + 85
-                current_x = panel_x + 70
-                screen.blit(attacked_label, (current_x, attacked_y))
-                current_x += attacked_label.get_width()
-                screen.blit(attacked_value, (current_x, attacked_y))
-
-                # Draw ability line with colored labels and values
-                ability_y = panel_y + 110
-                current_x = panel_x + 70
-                screen.blit(ability_label, (current_x, ability_y))
-                current_x += ability_label.get_width()
-                screen.blit(ability_value, (current_x, ability_y))
-            else:
-                no_unit_text = font.render("No unit selected", True, (255, 255, 255))
-                screen.blit(no_unit_text, (panel_x + 10, panel_y + 10))
-
-            # Check if selected unit can move, attack, or use abilities
-            can_move = selected_unit and selected_unit.moves_remaining > 0
-            can_attack = selected_unit and can_unit_attack(selected_unit, effects_system)
-            available_abilities = ability_system.get_available_active_abilities(selected_unit, game_map,
-                                                                                unit_positions) if selected_unit else []
-            can_use_ability = len(available_abilities) > 0
-
-            # Buttons repositioned - moved back 75px left with 15px spacing (reduced from 35px)
-            # Move button with graphics
-            move_button = pygame.Rect(width - 435, game_map.shape[0] * cell_size + 65, 100, 50)
-            if can_move and mode == "move":
-                move_button_img = pygame.image.load('graphics/button-move-selected.png').convert_alpha()
-            elif can_move:
-                move_button_img = pygame.image.load('graphics/button-move.png').convert_alpha()
-            else:
-                move_button_img = pygame.image.load('graphics/button-move-faded.png').convert_alpha()
-
-            move_button_img = pygame.transform.scale(move_button_img, (100, 50))
-            screen.blit(move_button_img, (width - 435, game_map.shape[0] * cell_size + 65))
-
-            # Attack button with graphics
-            attack_button = pygame.Rect(width - 320, game_map.shape[0] * cell_size + 65, 100, 50)
-            if can_attack and mode == "attack":
-                attack_button_img = pygame.image.load('graphics/button-attack-selected.png').convert_alpha()
-            elif can_attack:
-                attack_button_img = pygame.image.load('graphics/button-attack.png').convert_alpha()
-            else:
-                attack_button_img = pygame.image.load('graphics/button-attack-faded.png').convert_alpha()
-
-            attack_button_img = pygame.transform.scale(attack_button_img, (100, 50))
-            screen.blit(attack_button_img, (width - 320, game_map.shape[0] * cell_size + 65))
-
-            # Special button with graphics
-            ability_button = pygame.Rect(width - 205, game_map.shape[0] * cell_size + 65, 100, 50)
-            if can_use_ability and mode == "ability":
-                special_button_img = pygame.image.load('graphics/button-special-selected.png').convert_alpha()
-            elif can_use_ability:
-                special_button_img = pygame.image.load('graphics/button-special.png').convert_alpha()
-            else:
-                special_button_img = pygame.image.load('graphics/button-special-faded.png').convert_alpha()
-
-            special_button_img = pygame.transform.scale(special_button_img, (100, 50))
-            screen.blit(special_button_img, (width - 205, game_map.shape[0] * cell_size + 65))
-
-            # End Turn button moved to next line
-            end_button = pygame.Rect(width - 240, game_map.shape[0] * cell_size + 125, 100, 50)
-            pygame.draw.rect(screen, (200, 0, 0), end_button)
-            end_text = font.render("End Turn", True, (255, 255, 255))
-            screen.blit(end_text, (width - 230, game_map.shape[0] * cell_size + 140))
-
-            # Reset button moved to upper left corner (tiny)
-            reset_button = pygame.Rect(10, 10, 50, 25)
-            pygame.draw.rect(screen, (0, 0, 200), reset_button)
-            tiny_font = pygame.font.Font('IMFellEnglishSC-Regular.ttf', 12)
-            reset_text = tiny_font.render("Reset", True, (255, 255, 255))
-            screen.blit(reset_text, (15, 15))
-
-            # Display results if available
-            message_y = game_map.shape[0] * cell_size + 45
-            if last_attack_result and attack_message_timer > 0:
-                result_text = f"{last_attack_result['attacker']} attacks {last_attack_result['target']} for {last_attack_result['damage']} damage!"
-                if last_attack_result['target_defeated']:
-                    result_text += f" {last_attack_result['target']} defeated!"
-
-                result_surface = small_font.render(result_text, True, (255, 255, 0))
-                result_rect = result_surface.get_rect(center=(width // 2, message_y))
-
-                bg_rect = result_rect.inflate(10, 5)
-                pygame.draw.rect(screen, (0, 0, 0), bg_rect)
-                pygame.draw.rect(screen, (255, 255, 0), bg_rect, 2)
-
-                screen.blit(result_surface, result_rect)
-
-            elif last_ability_result and attack_message_timer > 0:
-                result_text = last_ability_result.get("message", "Ability used!")
-
-                result_surface = small_font.render(result_text, True, (128, 0, 255))
-                result_rect = result_surface.get_rect(center=(width // 2, message_y))
-
-                bg_rect = result_rect.inflate(10, 5)
-                pygame.draw.rect(screen, (0, 0, 0), bg_rect)
-                pygame.draw.rect(screen, (128, 0, 255), bg_rect, 2)
-
-                screen.blit(result_surface, result_rect)
+        def reset_game():
+            nonlocal game
+            game = GameState.new_game(faction_file, map_height, map_width, army_points, terrain_weights,
+                                      ability_system=ability_system, effects_system=effects_system)
+            renderer.set_map(game.game_map, gameboard_bg, terrain_tiles)
+            camera.center_on(army_center(game.unit_positions, 1))
+            threat_maps.invalidate()
+            clear_selection()
 
-            return end_button, reset_button, move_button, attack_button, ability_button, can_move, can_attack, can_use_ability
+        def end_turn():
+            if game.game_over:
+                return  # Nothing left to play; the banner keeps showing the winner until Reset
+            game.apply(Action(END_TURN))
+            clear_selection()
+
+        def build_view():
+            """Snapshot of what the renderer draws this frame"""
+            can_move, can_attack, available_abilities = action_availability(selected_unit, game.game_map,
+                                                                             game.unit_positions, ability_system,
+                                                                             effects_system)
+            move_threat = threat_maps.for_unit(selected_unit, game.game_map, game.unit_positions) \
+                if selected_unit and legal_moves else None
+            return ViewState(
+                game_map=game.game_map,
+                unit_positions=game.unit_positions,
+                current_turn=game.current_turn,
+                mode=mode,
+                state_version=game.version(),
+                selected_unit=selected_unit,
+                legal_moves=legal_moves,
+                legal_attacks=legal_attacks,
+                legal_ability_targets=legal_ability_targets,
+                move_threat=move_threat,
+                projectiles=projectile_animations,
+                last_attack_result=last_attack_result,
+                last_ability_result=last_ability_result,
+                show_message=attack_message_timer > 0,
+                can_move=can_move,
+                can_attack=can_attack,
+                available_abilities=available_abilities,
+                winner=game.winner,
+            )
 
         def handle_click(pos):
-            nonlocal selected_unit, legal_moves, legal_attacks, legal_ability_targets, mode, last_attack_result, last_ability_result, attack_message_timer, projectile_animations
-            col, row = pos[0] // cell_size, pos[1] // cell_size
-            clicked_pos = (row, col)
+            nonlocal selected_unit, legal_moves, legal_attacks, legal_ability_targets, mode, last_attack_result, last_ability_result, attack_message_timer
+            clicked_pos = camera.screen_to_tile(pos)  # None outside the board
 
             # Handle ability usage first (but only if clicking on a valid ability target)
             if selected_unit and mode == "ability" and clicked_pos in legal_ability_targets:
                 try:
-                    available_abilities = ability_system.get_available_active_abilities(selected_unit, game_map,
-                                                                                        unit_positions)
-                    if available_abilities:
-                        ability_name = available_abilities[0]["name"]
-                        target_pos = clicked_pos if clicked_pos != selected_unit.position else None
-
-                        last_ability_result = ability_system.execute_active_ability(
-                            selected_unit, ability_name, target_pos, game_map, unit_positions
-                        )
-                        attack_message_timer = 180
+                    last_ability_result = game.apply(Action(ABILITY, selected_unit.unit_id, clicked_pos))
+                    attack_message_timer = MESSAGE_DURATION
 
-                        # Refresh legal targets after ability use
-                        available_abilities = ability_system.get_available_active_abilities(selected_unit, game_map,
-                                                                                            unit_positions)
-                        if available_abilities:
-                            legal_ability_targets = calculate_legal_ability_targets(
-                                selected_unit, available_abilities[0]["name"], game_map, unit_positions, ability_system
-                            )
-                        else:
-                            legal_ability_targets = set()
+                    # Refresh legal targets after ability use
+                    available_abilities = game.available_abilities(selected_unit)
+                    if available_abilities:
+                        legal_ability_targets = game.legal_ability_targets(selected_unit,
+                                                                           available_abilities[0]["name"])
+                    else:
+                        legal_ability_targets = set()
 
                 except Exception as e:
                     pass
                 return
 
             # Check if clicking on a friendly unit (unit selection has priority over other actions)
-            for unit_id, unit in unit_positions.items():
-                if unit.position == clicked_pos and (
-                        (current_turn == 1 and "A1" in unit.unit_id) or (current_turn == 2 and "A2" in unit.unit_id)):
-                    selected_unit = unit
-                    # Switch to move mode when selecting a new unit
-                    mode = "move"
-                    legal_moves = calculate_legal_moves(selected_unit, game_map, MOVEMENT_COSTS, unit_positions,
-                                                        ability_system)
-                    legal_attacks = set()
-                    legal_ability_targets = set()
-                    return
+            unit = game.unit_positions.unit_at(clicked_pos) if clicked_pos else None
+            if unit and game.is_own_unit(unit):
+                selected_unit = unit
+                # Switch to move mode when selecting a new unit
+                mode = "move"
+                legal_moves = game.legal_moves(selected_unit)
+                legal_attacks = set()
+                legal_ability_targets = set()
+                return
 
             # Handle movement
             if selected_unit and mode == "move" and clicked_pos in legal_moves:
                 try:
-                    move_unit(selected_unit.unit_id, clicked_pos, unit_positions, game_map, MOVEMENT_COSTS)
-                    selected_unit.moves_remaining -= legal_moves[clicked_pos]
-
-                    # Update conditional effects after movement
-                    effects_system.check_conditional_effects(selected_unit.unit_id, selected_unit, {})
-
-                    legal_moves = calculate_legal_moves(selected_unit, game_map, MOVEMENT_COSTS, unit_positions,
-                                                        ability_system)
+                    game.apply(Action(MOVE, selected_unit.unit_id, clicked_pos))
+                    legal_moves = game.legal_moves(selected_unit)
                 except ValueError as e:
                     pass
                 return
@@ -799,9 +224,8 @@ def display_game_with_pygame(game_map, unit_positions, faction_file, map_height,
             if selected_unit and mode == "attack":
                 if clicked_pos in legal_attacks:
                     try:
-                        last_attack_result = attack_unit(selected_unit.unit_id, clicked_pos, unit_positions, game_map,
-                                                         ability_system)
-                        attack_message_timer = 180
+                        last_attack_result = game.apply(Action(ATTACK, selected_unit.unit_id, clicked_pos))
+                        attack_message_timer = MESSAGE_DURATION
 
                         # Create projectile animation for ranged attacks
                         if last_attack_result['is_ranged']:
@@ -815,288 +239,99 @@ def display_game_with_pygame(game_map, unit_positions, faction_file, map_height,
                                 'start': last_attack_result['attacker_pos'],
                                 'end': last_attack_result['target_pos'],
                                 'progress': 0.0,
-                                'speed': 0.15,
+                                'speed': PROJECTILE_SPEED,
                                 'color': projectile_color
                             })
 
-                        legal_attacks = calculate_legal_attacks(selected_unit, game_map, unit_positions, ability_system)
+                        legal_attacks = game.legal_attacks(selected_unit)
 
                     except ValueError as e:
                         pass
                 return
 
-            # Handle ability usage
-            if selected_unit and mode == "ability":
-                if clicked_pos in legal_ability_targets:
-                    try:
-                        available_abilities = ability_system.get_available_active_abilities(selected_unit, game_map,
-                                                                                            unit_positions)
-                        if available_abilities:
-                            ability_name = available_abilities[0]["name"]
-                            target_pos = clicked_pos if clicked_pos != selected_unit.position else None
-
-                            last_ability_result = ability_system.execute_active_ability(
-                                selected_unit, ability_name, target_pos, game_map, unit_positions
-                            )
-                            attack_message_timer = 180
-
-                            # Refresh legal targets after ability use
-                            available_abilities = ability_system.get_available_active_abilities(selected_unit, game_map,
-                                                                                                unit_positions)
-                            if available_abilities:
-                                legal_ability_targets = calculate_legal_ability_targets(
-                                    selected_unit, available_abilities[0]["name"], game_map, unit_positions,
-                                    ability_system
-                                )
-                            else:
-                                legal_ability_targets = set()
-
-                    except Exception as e:
-                        pass
-                return
-
             # Deselect if clicking elsewhere
             selected_unit = None
             legal_moves = {}
             legal_attacks = set()
             legal_ability_targets = set()
 
-        def display_hover_info(pos):
-            col, row = pos[0] // cell_size, pos[1] // cell_size
-            hover_pos = (row, col)
-
-            # Check for mode-specific hover tooltips first
-            if selected_unit:
-                if mode == "move" and hover_pos in legal_moves:
-                    # Show move tooltip
-                    move_cost = legal_moves[hover_pos]
-                    tooltip_text = f"Click to move (Cost: {move_cost})"
-                    tooltip_surface = small_font.render(tooltip_text, True, (255, 255, 255))
-
-                    # Position tooltip
-                    tooltip_x = min(pos[0] + 15, width - tooltip_surface.get_width() - 10)
-                    tooltip_y = max(pos[1] - 30, 10)
-
-                    # Draw tooltip background
-                    tooltip_bg = pygame.Surface((tooltip_surface.get_width() + 10, tooltip_surface.get_height() + 6))
-                    tooltip_bg.fill((40, 40, 40))
-                    tooltip_bg.set_alpha(240)
-                    screen.blit(tooltip_bg, (tooltip_x - 5, tooltip_y - 3))
-
-                    # Draw tooltip border and text
-                    pygame.draw.rect(screen, (255, 255, 0), (
-                    tooltip_x - 5, tooltip_y - 3, tooltip_surface.get_width() + 10, tooltip_surface.get_height() + 6),
-                                     1)
-                    screen.blit(tooltip_surface, (tooltip_x, tooltip_y))
-                    return
-
-                elif mode == "attack" and hover_pos in legal_attacks:
-                    # Show attack tooltip with target unit info
-                    target_unit = None
-                    for unit in unit_positions.values():
-                        if unit.position == hover_pos:
-                            target_unit = unit
-                            break
-
-                    tooltip_lines = ["Click to attack"]
-                    if target_unit:
-                        effective_range = calculate_effective_range(target_unit, game_map, unit_positions,
-                                                                    ability_system)
-                        tooltip_lines.append(
-                            f"{target_unit.name} (HP: {target_unit.hp}, ATK: {target_unit.atk}, Range: {effective_range})")
-
-                        # Add effects if target has any
-                        if effects_system.has_any_effects(target_unit.unit_id):
-                            effect_summary = effects_system.get_effect_summary(target_unit.unit_id)
-                            tooltip_lines.append("Effects:")
-                            tooltip_lines.extend([f"  {effect}" for effect in effect_summary])
-
-                    # Calculate tooltip size
-                    line_height = 18
-                    tooltip_width = max(small_font.size(line)[0] for line in tooltip_lines) + 20
-                    tooltip_height = len(tooltip_lines) * line_height + 10
-
-                    # Position tooltip
-                    tooltip_x = min(pos[0] + 15, width - tooltip_width - 10)
-                    tooltip_y = max(pos[1] - tooltip_height - 15, 10)
-
-                    # Draw tooltip background
-                    tooltip_bg = pygame.Surface((tooltip_width, tooltip_height))
-                    tooltip_bg.fill((40, 40, 40))
-                    tooltip_bg.set_alpha(240)
-                    screen.blit(tooltip_bg, (tooltip_x, tooltip_y))
-
-                    # Draw tooltip border
-                    pygame.draw.rect(screen, (255, 0, 0), (tooltip_x, tooltip_y, tooltip_width, tooltip_height), 2)
-
-                    # Draw tooltip text
-                    for i, line in enumerate(tooltip_lines):
-                        text_surface = small_font.render(line, True, (255, 255, 255))
-                        screen.blit(text_surface, (tooltip_x + 10, tooltip_y + 5 + i * line_height))
-                    return
-
-                elif mode == "ability" and hover_pos in legal_ability_targets:
-                    # Show ability tooltip
-                    available_abilities = ability_system.get_available_active_abilities(selected_unit, game_map,
-                                                                                        unit_positions)
-                    if available_abilities:
-                        ability_name = available_abilities[0]["name"]
-                        tooltip_text = f"Click to use {ability_name}"
-                    else:
-                        tooltip_text = "Click to use ability"
-
-                    tooltip_surface = small_font.render(tooltip_text, True, (255, 255, 255))
-
-                    # Position tooltip
-                    tooltip_x = min(pos[0] + 15, width - tooltip_surface.get_width() - 10)
-                    tooltip_y = max(pos[1] - 30, 10)
-
-                    # Draw tooltip background
-                    tooltip_bg = pygame.Surface((tooltip_surface.get_width() + 10, tooltip_surface.get_height() + 6))
-                    tooltip_bg.fill((40, 40, 40))
-                    tooltip_bg.set_alpha(240)
-                    screen.blit(tooltip_bg, (tooltip_x - 5, tooltip_y - 3))
-
-                    # Draw tooltip border and text
-                    pygame.draw.rect(screen, (128, 0, 255), (
-                    tooltip_x - 5, tooltip_y - 3, tooltip_surface.get_width() + 10, tooltip_surface.get_height() + 6),
-                                     1)
-                    screen.blit(tooltip_surface, (tooltip_x, tooltip_y))
-                    return
-
-            # Check for unit hover (only if not hovering over action targets)
-            for unit in unit_positions.values():
-                if unit.position == hover_pos:
-                    # Show unit info with effects merged in
-                    effective_range = calculate_effective_range(unit, game_map, unit_positions, ability_system)
-                    tooltip_lines = [f"{unit.name} (HP: {unit.hp}, ATK: {unit.atk}, Range: {effective_range})"]
-
-                    # Add effects if unit has any
-                    if effects_system.has_any_effects(unit.unit_id):
-                        effect_summary = effects_system.get_effect_summary(unit.unit_id)
-                        tooltip_lines.append("Effects:")
-                        tooltip_lines.extend([f"  {effect}" for effect in effect_summary])
-
-                    # Calculate tooltip size
-                    line_height = 18
-                    tooltip_width = max(small_font.size(line)[0] for line in tooltip_lines) + 20
-                    tooltip_height = len(tooltip_lines) * line_height + 10
-
-                    # Position tooltip
-                    tooltip_x = min(pos[0] + 15, width - tooltip_width - 10)
-                    tooltip_y = max(pos[1] - tooltip_height - 15, 10)
-
-                    # Draw tooltip background
-                    tooltip_bg = pygame.Surface((tooltip_width, tooltip_height))
-                    tooltip_bg.fill((40, 40, 40))
-                    tooltip_bg.set_alpha(240)
-                    screen.blit(tooltip_bg, (tooltip_x, tooltip_y))
-
-                    # Draw tooltip border (white for regular unit info)
-                    pygame.draw.rect(screen, (200, 200, 200), (tooltip_x, tooltip_y, tooltip_width, tooltip_height), 2)
-
-                    # Draw tooltip text
-                    for i, line in enumerate(tooltip_lines):
-                        text_surface = small_font.render(line, True, (255, 255, 255))
-                        screen.blit(text_surface, (tooltip_x + 10, tooltip_y + 5 + i * line_height))
-                    return
-
-        # Main game loop
+        # Main game loop: capped at frame_rate_cap while animating, blocked on input when idle
+        clock = pygame.time.Clock()
         while running:
-            screen.fill((0, 0, 0))
-            draw_map()
-            end_button, reset_button, move_button, attack_button, ability_button, can_move, can_attack, can_use_ability = draw_ui()
-
-            # ABILITY DESCRIPTION - Show ability description for selected unit
-            if selected_unit:
-                # Always show ability description, regardless of availability
-                ability_name = selected_unit.special.split(" - ")[
-                    0] if " - " in selected_unit.special else selected_unit.special
-
-                # Get the full description from the ability system or use the original special text
-                ability_info = ability_system.get_ability_info(ability_name)
-                if ability_info:
-                    ability_description = f"{ability_name}: {ability_info.get('description', selected_unit.special)}"
-                else:
-                    ability_description = selected_unit.special
-
-                # Draw ability description background
-                desc_lines = []
-                words = ability_description.split()
-                current_line = ""
-                max_width = width - 40  # Leave some margin
-
-                for word in words:
-                    test_line = current_line + (" " if current_line else "") + word
-                    test_surface = small_font.render(test_line, True, (255, 255, 255))
-                    if test_surface.get_width() <= max_width:
-                        current_line = test_line
-                    else:
-                        if current_line:
-                            desc_lines.append(current_line)
-                        current_line = word
-
-                if current_line:
-                    desc_lines.append(current_line)
+            dt = clock.tick(frame_rate_cap) / 1000.0
 
-                # Calculate description height and position
-                desc_height = max(60, len(desc_lines) * 22 + 15)
-                ability_desc_y = game_map.shape[0] * cell_size + 200  # Position below UI
-
-                # Draw background for description
-                pygame.draw.rect(screen, (80, 80, 120), (20, ability_desc_y, width - 40, desc_height))
-                pygame.draw.rect(screen, (255, 255, 255), (20, ability_desc_y, width - 40, desc_height), 2)
-
-                # Draw description text
-                for i, line in enumerate(desc_lines):
-                    line_surface = small_font.render(line, True, (255, 255, 255))
-                    text_y = ability_desc_y + 8 + i * 22
-                    screen.blit(line_surface, (25, text_y))
-
-            mouse_pos = pygame.mouse.get_pos()
-            display_hover_info(mouse_pos)
-
-            # Update timers and animations
+            # Update timers and animations by wall-clock time
             if attack_message_timer > 0:
-                attack_message_timer -= 1
+                attack_message_timer = max(0.0, attack_message_timer - dt)
+            for projectile in projectile_animations[:]:
+                projectile['progress'] += projectile['speed'] * dt
+                if projectile['progress'] >= 1.0:
+                    projectile_animations.remove(projectile)
 
-            pygame.display.flip()
+            mouse_pos = pygame.mouse.get_pos()
+            view = build_view()
+            renderer.fps = clock.get_fps()
+            renderer.render(view, mouse_pos)
 
-            for event in pygame.event.get():
+            if projectile_animations:
+                events = pygame.event.get()
+            else:
+                # Nothing is moving: sleep until input arrives or the result message expires
+                timeout = int(attack_message_timer * 1000) + 1 if attack_message_timer > 0 else 0
+                event = pygame.event.wait(timeout) if timeout else pygame.event.wait()
+                events = ([event] if event.type != pygame.NOEVENT else []) + pygame.event.get()
+                # Time asleep counts towards the message timer, but not towards animations started by this input
+                attack_message_timer = max(0.0, attack_message_timer - clock.tick() / 1000.0)
+
+            ui = renderer.ui
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    if end_button.collidepoint(event.pos):
+                elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    renderer.invalidate()
+                elif event.type == pygame.MOUSEWHEEL:
+                    camera.zoom_by(event.y, pygame.mouse.get_pos())
+                elif event.type == pygame.MOUSEMOTION and (event.buttons[1] or event.buttons[2]):
+                    # Middle- or right-drag pans the board
+                    camera.pan(-event.rel[0], -event.rel[1])
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_F3:
+                        renderer.toggle_profile()
+                    elif event.key == pygame.K_F5:
+                        save_game(QUICKSAVE_FILE, game.game_map, game.unit_positions, game.current_turn,
+                                  effects_system)
+                    elif event.key in PAN_KEYS:
+                        dx, dy = PAN_KEYS[event.key]
+                        camera.pan(dx * camera.cell_size, dy * camera.cell_size)
+                    elif event.key in ZOOM_KEYS:
+                        camera.zoom_by(ZOOM_KEYS[event.key])
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    can_move, can_attack, available_abilities = action_availability(
+                        selected_unit, game.game_map, game.unit_positions, ability_system, effects_system)
+                    if ui.end_button.collidepoint(event.pos):
                         end_turn()
-                    elif reset_button.collidepoint(event.pos):
+                    elif ui.reset_button.collidepoint(event.pos):
                         reset_game()
-                    elif move_button.collidepoint(event.pos):
+                    elif ui.move_button.collidepoint(event.pos):
                         # Only allow mode change if unit is selected and can move
                         if selected_unit and can_move:
                             mode = "move"
-                            legal_moves = calculate_legal_moves(selected_unit, game_map, MOVEMENT_COSTS, unit_positions,
-                                                                ability_system)
+                            legal_moves = game.legal_moves(selected_unit)
                             legal_attacks = set()
                             legal_ability_targets = set()
-                    elif attack_button.collidepoint(event.pos):
+                    elif ui.attack_button.collidepoint(event.pos):
                         # Only allow mode change if unit is selected and can attack
                         if selected_unit and can_attack:
                             mode = "attack"
-                            legal_attacks = calculate_legal_attacks(selected_unit, game_map, unit_positions,
-                                                                    ability_system)
+                            legal_attacks = game.legal_attacks(selected_unit)
                             legal_moves = {}
                             legal_ability_targets = set()
-                    elif ability_button.collidepoint(event.pos):
+                    elif ui.ability_button.collidepoint(event.pos):
                         # Only allow mode change if unit is selected and can use ability
-                        if selected_unit and can_use_ability:
+                        if selected_unit and available_abilities:
                             mode = "ability"
-                            available_abilities = ability_system.get_available_active_abilities(selected_unit, game_map,
-                                                                                                unit_positions)
-                            if available_abilities:
-                                ability_name = available_abilities[0]["name"]
-                                legal_ability_targets = calculate_legal_ability_targets(
-                                    selected_unit, ability_name, game_map, unit_positions, ability_system
-                                )
+                            ability_name = available_abilities[0]["name"]
+                            legal_ability_targets = game.legal_ability_targets(selected_unit, ability_name)
                             legal_moves = {}
                             legal_attacks = set()
                     else:
@@ -1109,23 +344,21 @@ def display_game_with_pygame(game_map, unit_positions, faction_file, map_height,
 
 
 if __name__ == "__main__":
-    faction_file = "factions.json"
+    faction_file = resource_path("factions.json")
+
+    terrain_weights = DEFAULT_TERRAIN_WEIGHTS
 
-    terrain_weights = {
-        "Plains": 0.4,
-        "Forest": 0.2,
-        "Mountain": 0.1,
-        "Lake": 0.01,
-        "River": 0.01,
-        "Farm": 0.05,
-        "Village": 0.005,
-        "City": 0.005,
-    }
+    parser = argparse.ArgumentParser(description="Fantasy Squad Tactics")
+    parser.add_argument("--height", type=int, default=10, help="Map rows")
+    parser.add_argument("--width", type=int, default=10, help="Map columns")
+    parser.add_argument("--points", type=int, default=20, help="Army points per side")
+    args = parser.parse_args()
 
-    map_height = 10
-    map_width = 10
+    map_height = args.height
+    map_width = args.width
+    army_points = args.points
 
-    armies = build_random_armies(faction_file, army_points=20)
+    armies = build_random_armies(faction_file, army_points=army_points)
     army1 = armies["faction1"]["army"]
     army2 = armies["faction2"]["army"]
 
@@ -1141,5 +374,5 @@ if __name__ == "__main__":
         map_height=map_height,
         map_width=map_width,
         terrain_weights=terrain_weights,
-        army_points=20
+        army_points=army_points
     )
\ No newline at end of file
@@ -1,11 +1,25 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import sys
+
+# Repack the art so the bundle carries one atlas image instead of every individual PNG. Paths are anchored
+# to the spec's folder so the build works from any working directory.
+sys.path.insert(0, SPECPATH)
+from build_atlas import build_atlas
+graphics = os.path.join(SPECPATH, 'graphics')
+build_atlas(graphics)
 
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[
+        (os.path.join(graphics, 'atlas.png'), 'graphics'),
+        (os.path.join(graphics, 'atlas.json'), 'graphics'),
+        ('IMFellEnglishSC-Regular.ttf', '.'),
+        ('factions.json', '.'),
+    ],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
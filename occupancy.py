@@ -0,0 +1,196 @@
+"""
+Occupancy tracking for Fantasy Squad Tactics
+
+Keeps an index of which unit stands on which tile so that finding
+"the unit at (row, col)" is a constant-time lookup:
+- OccupancyGrid: a tile -> unit_id grid the size of the terrain map
+- UnitPositions: the unit_id -> GamePiece dict, which keeps the grid in sync
+- Aura coverage fields (see auras.py), updated as units are placed, moved and removed
+- The shared UnitTable (see unit_table.py) holding the stats of every unit in the battle
+- Optional consistency checking that tests can switch on
+- Placements, moves and removals record their inverse in an attached UndoLog (see undo_log.py)
+"""
+
+import os
+from typing import Any, Callable, Optional, Tuple
+
+import numpy as np
+
+from auras import AuraFields
+from unit_table import UnitTable
+
+Position = Tuple[int, int]
+
+# Verify the grid against every unit after each mutation. Slow, meant for tests and debugging.
+DEBUG_CONSISTENCY_CHECKS = os.environ.get("FST_DEBUG_OCCUPANCY") == "1"
+
+
+def enable_consistency_checks(enabled: bool = True) -> None:
+    """Turn the occupancy consistency checker on or off"""
+    global DEBUG_CONSISTENCY_CHECKS
+    DEBUG_CONSISTENCY_CHECKS = enabled
+
+
+class OccupancyGrid:
+    """Grid of unit ids (None for empty tiles)"""
+
+    def __init__(self, shape: Tuple[int, int]):
+        self.shape = shape
+        self.cells = np.full(shape, None, dtype=object)
+
+    def in_bounds(self, position: Position) -> bool:
+        row, col = position
+        return 0 <= row < self.shape[0] and 0 <= col < self.shape[1]
+
+    def get(self, position: Position) -> Optional[str]:
+        """Unit id at position, or None if the tile is empty or off the map"""
+        if not self.in_bounds(position):
+            return None
+        return self.cells[position]
+
+    def __contains__(self, position: Position) -> bool:
+        """True if the tile is occupied"""
+        return self.get(position) is not None
+
+    def place(self, position: Position, unit_id: str) -> None:
+        if not self.in_bounds(position):
+            raise ValueError("Position out of bounds")
+        occupant = self.cells[position]
+        if occupant is not None and occupant != unit_id:
+            raise ValueError(f"Position {position} already occupied by {occupant}")
+        self.cells[position] = unit_id
+
+    def clear(self, position: Position, unit_id: str) -> None:
+        if self.get(position) == unit_id:
+            self.cells[position] = None
+
+    def occupied_mask(self) -> np.ndarray:
+        """Boolean grid, True where a unit stands"""
+        return self.cells != None  # noqa: E711 - elementwise comparison
+
+
+class UnitPositions(dict):
+    """
+    Dict of unit_id -> GamePiece that maintains an OccupancyGrid.
+
+    Units must be moved with relocate() (or re-assigned with unit_positions[unit_id] = unit
+    after changing unit.position) and removed with del, so the grid never goes stale.
+    """
+
+    def __init__(self, shape: Tuple[int, int], table: Optional[UnitTable] = None):
+        super().__init__()
+        self.occupancy = OccupancyGrid(shape)
+        self.table = table if table is not None else UnitTable()
+        self.auras = AuraFields(shape)
+        self._positions = {}  # unit_id -> position currently recorded in the grid
+        self.version = 0  # Bumped whenever a unit is placed, moved or removed
+        self._derived = {}  # key -> (version, value) for data derived from unit positions
+        self.undo_log = None  # UndoLog recording the inverse of each placement, move and removal
+
+    def clone(self) -> "UnitPositions":
+        """Copy with its own grid, auras, unit table and GamePiece views onto it"""
+        table = self.table.clone()
+        clone = UnitPositions(self.occupancy.shape, table)
+        clone.occupancy.cells = self.occupancy.cells.copy()
+        clone.auras = self.auras.clone()
+        clone._positions = dict(self._positions)
+        clone.version = self.version
+        dict.update(clone, ((unit_id, unit.view_in(table)) for unit_id, unit in self.items()))
+        return clone
+
+    def _record(self, unit_id: str, order: Optional[int] = None) -> None:
+        """Record how to put unit_id back where the grid has it now (order: its place in iteration order)"""
+        if self.undo_log is not None:
+            self.undo_log.record(self._restore, unit_id, self.get(unit_id), self._positions.get(unit_id), order)
+
+    def _restore(self, unit_id: str, unit, position: Optional[Position], order: Optional[int]) -> None:
+        current = self._positions.pop(unit_id, None)
+        if current is not None:
+            self.occupancy.clear(current, unit_id)
+        if position is None:
+            dict.pop(self, unit_id, None)  # Undo a placement
+        else:
+            self.occupancy.place(position, unit_id)
+            self._positions[unit_id] = position
+            if order is not None:  # Undo a removal, keeping the iteration order units act in
+                items = list(self.items())
+                items.insert(order, (unit_id, unit))
+                dict.clear(self)
+                dict.update(self, items)
+        self.version += 1
+
+    def __setitem__(self, unit_id: str, unit) -> None:
+        self._record(unit_id)
+        old_position = self._positions.get(unit_id)
+        if old_position is not None and old_position != unit.position:
+            self.occupancy.clear(old_position, unit_id)
+        self.occupancy.place(unit.position, unit_id)
+        self._positions[unit_id] = unit.position
+        super().__setitem__(unit_id, unit)
+        if old_position is None:
+            self.auras.on_place(unit_id, unit)
+        elif old_position != unit.position:
+            self.auras.on_move(unit_id, unit.position)
+        self.version += 1
+        self._debug_check()
+
+    def __delitem__(self, unit_id: str) -> None:
+        if self.undo_log is not None:
+            self._record(unit_id, list(self).index(unit_id))
+        self.occupancy.clear(self._positions.pop(unit_id), unit_id)
+        self[unit_id].alive = False
+        super().__delitem__(unit_id)
+        self.auras.on_remove(unit_id)
+        self.version += 1
+        self._debug_check()
+
+    def pop(self, unit_id: str, *default):
+        if unit_id not in self:
+            return super().pop(unit_id, *default)
+        unit = self[unit_id]
+        del self[unit_id]
+        return unit
+
+    def relocate(self, unit_id: str, new_position: Position) -> None:
+        """Move a unit to a new tile. Raises ValueError if the tile is occupied or off the map."""
+        unit = self[unit_id]
+        self.occupancy.place(new_position, unit_id)
+        self._record(unit_id)
+        old_position = self._positions[unit_id]
+        if old_position != new_position:
+            self.occupancy.clear(old_position, unit_id)
+        self._positions[unit_id] = new_position
+        unit.position = new_position
+        self.auras.on_move(unit_id, new_position)
+        self.version += 1
+        self._debug_check()
+
+    def derived(self, key: str, build: Callable[["UnitPositions"], Any]) -> Any:
+        """Return build(self), cached until the next place, move or removal"""
+        cached = self._derived.get(key)
+        if cached is None or cached[0] != self.version:
+            cached = (self.version, build(self))
+            self._derived[key] = cached
+        return cached[1]
+
+    def unit_id_at(self, position: Position) -> Optional[str]:
+        return self.occupancy.get(position)
+
+    def unit_at(self, position: Position):
+        """GamePiece standing at position, or None"""
+        unit_id = self.occupancy.get(position)
+        return self.get(unit_id) if unit_id is not None else None
+
+    def check_consistency(self) -> None:
+        """Raise AssertionError if the grid and the units disagree"""
+        for unit_id, unit in self.items():
+            assert self._positions.get(unit_id) == unit.position, \
+                f"{unit_id} recorded at {self._positions.get(unit_id)} but stands at {unit.position}"
+            assert self.occupancy.get(unit.position) == unit_id, \
+                f"Grid has {self.occupancy.get(unit.position)} at {unit.position}, expected {unit_id}"
+        occupied = int(np.count_nonzero(self.occupancy.occupied_mask()))
+        assert occupied == len(self), f"Grid has {occupied} occupied tiles for {len(self)} units"
+
+    def _debug_check(self) -> None:
+        if DEBUG_CONSISTENCY_CHECKS:
+            self.check_consistency()
@@ -0,0 +1,116 @@
+"""
+Pathfinding for Fantasy Squad Tactics
+
+This module answers "where can this unit move and how":
+- Uniform-cost (Dijkstra) reachability from a unit's position
+- Minimum movement cost for every reachable tile
+- Predecessor links so the UI or a bot can rebuild the actual path
+"""
+
+import heapq
+from dataclasses import dataclass, field
+from typing import Container, Dict, List, Tuple
+
+import numpy as np
+
+from special_abilities import get_movement_modifications
+from terrain import Terrain
+
+Position = Tuple[int, int]
+
+NEIGHBOR_OFFSETS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+@dataclass
+class ReachabilityResult:
+    """Minimum cost and predecessor for every tile a unit can reach"""
+    origin: Position
+    costs: Dict[Position, int] = field(default_factory=dict)  # Includes origin at cost 0
+    predecessors: Dict[Position, Position] = field(default_factory=dict)
+    expansions: int = 0  # Number of tiles popped and expanded (each tile at most once)
+
+    def legal_moves(self) -> Dict[Position, int]:
+        """Reachable tiles (excluding the origin) mapped to their minimum move cost"""
+        return {pos: cost for pos, cost in self.costs.items() if pos != self.origin}
+
+    def path_to(self, target: Position) -> List[Position]:
+        """Rebuild the cheapest path from the origin to target (inclusive). Empty if unreachable."""
+        if target not in self.costs:
+            return []
+
+        path = [target]
+        while path[-1] != self.origin:
+            path.append(self.predecessors[path[-1]])
+        path.reverse()
+        return path
+
+
+def uniform_cost_search(origin: Position, budget, terrain_map, movement_costs,
+                        blocked: Container[Position], flight: bool = False) -> ReachabilityResult:
+    """
+    Expand tiles in order of increasing cost from origin until the move budget runs out.
+    Each tile is expanded at most once, so the work is linear in the number of reachable tiles.
+    """
+    height, width = terrain_map.shape
+    result = ReachabilityResult(origin=origin)
+    result.costs[origin] = 0
+
+    # Every step costs at least 1, so only the box within budget of the origin can be reached
+    # (plus one ring of neighbours that get priced and rejected). Look up step costs for that
+    # window in one vectorized operation. A spent-out unit (negative budget) can't step at all.
+    reach = int(min(max(budget, 0), max(height, width))) + 1
+    top, left = max(0, origin[0] - reach), max(0, origin[1] - reach)
+    window = terrain_map[top:origin[0] + reach + 1, left:origin[1] + reach + 1]
+    if flight:
+        # Flying units treat every tile as cost 1 but still can't enter Lakes
+        step_costs = np.where(window == Terrain.LAKE, np.inf, 1.0)
+    else:
+        step_costs = np.asarray(movement_costs)[window]
+    step_costs = step_costs.tolist()
+
+    # (cost, tie-breaker, position) - the counter keeps ordering stable between equal costs
+    counter = 0
+    frontier = [(0, counter, origin)]
+
+    while frontier:
+        cost, _, current_pos = heapq.heappop(frontier)
+        if cost > result.costs[current_pos]:
+            continue  # Stale entry, a cheaper route was already expanded
+
+        result.expansions += 1
+        row, col = current_pos
+        for dr, dc in NEIGHBOR_OFFSETS:
+            new_row, new_col = row + dr, col + dc
+            new_pos = (new_row, new_col)
+
+            if not (0 <= new_row < height and 0 <= new_col < width) or new_pos in blocked:
+                continue
+
+            new_cost = cost + step_costs[new_row - top][new_col - left]
+            if new_cost > budget:
+                continue
+
+            new_cost = int(new_cost)
+            if new_pos not in result.costs or new_cost < result.costs[new_pos]:
+                result.costs[new_pos] = new_cost
+                result.predecessors[new_pos] = current_pos
+                counter += 1
+                heapq.heappush(frontier, (new_cost, counter, new_pos))
+
+    return result
+
+
+def find_reachable_tiles(unit, terrain_map, movement_costs, unit_positions, ability_system,
+                         next_turn: bool = False) -> ReachabilityResult:
+    """
+    Run reachability for a unit, applying its movement abilities and blocking occupied tiles. With next_turn,
+    reach is as at the start of the unit's next turn: full moves, and no attack made yet (Trusty Steed).
+    """
+    move_bonus, special_movement = get_movement_modifications(unit, terrain_map, unit_positions, ability_system,
+                                                              next_turn)
+    budget = (unit.move if next_turn else unit.moves_remaining) + move_bonus
+
+    # The occupancy grid answers "is this tile taken" directly; the unit's own tile is the
+    # origin, which is already settled at cost 0, so blocking it changes nothing
+    return uniform_cost_search(unit.position, budget, terrain_map, movement_costs, unit_positions.occupancy,
+                               flight="flight" in special_movement)
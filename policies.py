@@ -0,0 +1,56 @@
+"""
+Policies for Fantasy Squad Tactics
+
+Computer players for simulated matches. A policy picks the next action for the side to move:
+    policy(game: GameState, rng: random.Random) -> Action
+- random: any legal action, uniformly
+- greedy: attack the weakest enemy in range, else make the move that closes most distance on the
+  nearest enemy, else end the turn
+Policies draw randomness only from rng, so a seeded match replays exactly.
+"""
+
+import random
+from typing import Callable, Dict, List
+
+from game_state import ATTACK, END_TURN, MOVE, Action, GameState
+
+Policy = Callable[[GameState, random.Random], Action]
+
+
+def random_policy(game: GameState, rng: random.Random) -> Action:
+    return rng.choice(game.legal_actions())
+
+
+def nearest_enemy_distance(position, enemy_positions: List) -> int:
+    """Chebyshev distance (the distance ranges are measured in) from position to the closest enemy"""
+    row, col = position
+    return min(max(abs(row - enemy_row), abs(col - enemy_col)) for enemy_row, enemy_col in enemy_positions)
+
+
+def greedy_policy(game: GameState, rng: random.Random) -> Action:
+    actions = game.legal_actions()
+    unit_positions = game.unit_positions
+
+    # Focus fire: the lowest-HP enemy in reach of any unit
+    attacks = [action for action in actions if action.kind == ATTACK]
+    if attacks:
+        return min(attacks, key=lambda action: (unit_positions.unit_at(action.target).hp, rng.random()))
+
+    enemy_positions = [unit.position for unit in game.units_of(2 if game.current_turn == 1 else 1)]
+    moves = [action for action in actions if action.kind == MOVE]
+    if moves and enemy_positions:
+        def gain(action):
+            before = nearest_enemy_distance(unit_positions[action.unit_id].position, enemy_positions)
+            return nearest_enemy_distance(action.target, enemy_positions) - before
+
+        best = min(moves, key=lambda action: (gain(action), rng.random()))
+        if gain(best) < 0:
+            return best
+
+    return Action(END_TURN)
+
+
+POLICIES: Dict[str, Policy] = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+}
@@ -2,13 +2,31 @@ import json
 import random
 import numpy as np
 from game_classes import GamePiece
+from occupancy import UnitPositions
+from special_abilities import SpecialAbilitySystem
+from terrain import TERRAIN_DTYPE, terrain_code
+from unit_table import UnitTable
+
+# Relative frequency of each terrain on a generated map
+DEFAULT_TERRAIN_WEIGHTS = {
+    "Plains": 0.4,
+    "Forest": 0.2,
+    "Mountain": 0.1,
+    "Lake": 0.01,
+    "River": 0.01,
+    "Farm": 0.05,
+    "Village": 0.005,
+    "City": 0.005,
+}
 
 def generate_game_map(height, width, terrain_weights):
+    """Generate a map of terrain codes (uint8) from weights keyed by terrain name."""
     terrain_types = list(terrain_weights.keys())
     terrain_probs = [terrain_weights[t] for t in terrain_types]
     terrain_probs = np.array(terrain_probs) / sum(terrain_probs)
+    terrain_codes = np.array([terrain_code(t) for t in terrain_types], dtype=TERRAIN_DTYPE)
 
-    return np.random.choice(terrain_types, size=(height, width), p=terrain_probs)
+    return np.random.choice(terrain_codes, size=(height, width), p=terrain_probs)
 
 
 def build_army(faction, points):
@@ -58,11 +76,14 @@ def build_army(faction, points):
     return army
 
 
-def build_random_armies(file_path, army_points=20):
+def load_factions(file_path):
+    """The faction definitions (name, units, ...) from a factions file"""
     with open(file_path, 'r') as file:
-        data = json.load(file)
+        return json.load(file)["factions"]
+
 
-    factions = data["factions"]
+def build_random_armies(file_path, army_points=20):
+    factions = load_factions(file_path)
 
     # Select two random factions
     faction1, faction2 = random.sample(factions, 2)
@@ -81,17 +102,37 @@ def build_random_armies(file_path, army_points=20):
             "army": army2
         }
     }
-def place_units_on_map(terrain_map, army1, army2, orient="north-south"):
+
+
+def deployment_slots(count, line_length, map_depth):
+    """
+    (depth, offset) slots for an army along its map edge: centred lines of at most line_length units,
+    wrapping onto the next line inward when the army is wider than the map
+    """
+    slots = []
+    depth = 0
+    while len(slots) < count:
+        if depth >= map_depth // 2:
+            raise ValueError(f"Map is too small to deploy {count} units")
+        in_line = min(line_length, count - len(slots))
+        center_start = line_length // 2 - in_line // 2
+        slots.extend((depth, center_start + i) for i in range(in_line))
+        depth += 1
+    return slots
+
+
+def place_units_on_map(terrain_map, army1, army2, orient="north-south", ability_system=None):
     height, width = terrain_map.shape
-    unit_positions = {}
+    unit_positions = UnitPositions(terrain_map.shape, UnitTable(capacity=len(army1) + len(army2)))
+    ability_system = ability_system or SpecialAbilitySystem()
 
     def assign_positions(army, start_positions, army_id):
         for idx, unit in enumerate(army):
             position = start_positions[idx]
             row, col = position
-            terrain = terrain_map[row, col]
+            terrain = int(terrain_map[row, col])
             unit_id = f"A{army_id}_{idx}"
-            unit_positions[unit_id] = GamePiece(
+            piece = GamePiece(
                 unit_id=unit_id,
                 unit_class=unit["unit_class"],
                 name=unit["name"],
@@ -102,19 +143,20 @@ def place_units_on_map(terrain_map, army1, army2, orient="north-south"):
                 special=unit["special"],
                 position=position,
                 terrain=terrain,
-                faction=unit["faction"]
+                faction=unit["faction"],
+                table=unit_positions.table,
+                army=army_id
             )
+            # Parse the special text once; everything else dispatches on piece.ability_id
+            ability_system.bind_ability(piece)
+            unit_positions[unit_id] = piece
 
     if orient == "north-south":
-        center_start = width // 2 - len(army1) // 2
-        army1_positions = [(0, center_start + i) for i in range(len(army1))]
-        center_start = width // 2 - len(army2) // 2
-        army2_positions = [(height - 1, center_start + i) for i in range(len(army2))]
+        army1_positions = [(depth, i) for depth, i in deployment_slots(len(army1), width, height)]
+        army2_positions = [(height - 1 - depth, i) for depth, i in deployment_slots(len(army2), width, height)]
     elif orient == "east-west":
-        center_start = height // 2 - len(army1) // 2
-        army1_positions = [(center_start + i, 0) for i in range(len(army1))]
-        center_start = height // 2 - len(army2) // 2
-        army2_positions = [(center_start + i, width - 1) for i in range(len(army2))]
+        army1_positions = [(i, depth) for depth, i in deployment_slots(len(army1), height, width)]
+        army2_positions = [(i, width - 1 - depth) for depth, i in deployment_slots(len(army2), height, width)]
     else:
         raise ValueError("Invalid orientation. Use 'north-south' or 'east-west'.")
 
@@ -0,0 +1,156 @@
+"""
+Range Queries for Fantasy Squad Tactics
+
+Vectorized Chebyshev-distance queries used for attack and ability targeting:
+- Unit position/faction arrays built once per board change
+- Enemy, ally and empty-tile masks within distance r of a unit
+- Batch queries (many attackers against many targets in one call)
+- Chebyshev dilation of tile masks (every tile within r of any selected tile)
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from special_abilities import get_unit_effective_range
+
+Position = Tuple[int, int]
+
+
+@dataclass
+class UnitArrays:
+    """Parallel arrays describing every unit on the board"""
+    unit_ids: List[str]
+    positions: np.ndarray  # (N, 2) int rows/cols
+    factions: np.ndarray  # (N,) faction index into faction_names
+    faction_names: List[str]
+    index: Dict[str, int]  # unit_id -> row in the arrays
+
+    def faction_code(self, faction_name: str) -> int:
+        """Index of a faction, or -1 if it has no units on the board"""
+        try:
+            return self.faction_names.index(faction_name)
+        except ValueError:
+            return -1
+
+    def positions_of(self, mask: np.ndarray) -> Set[Position]:
+        """Positions of the units selected by a boolean mask"""
+        return {(int(row), int(col)) for row, col in self.positions[mask]}
+
+
+def build_unit_arrays(unit_positions) -> UnitArrays:
+    unit_ids = list(unit_positions.keys())
+    faction_names = []
+    faction_lookup = {}
+    positions = np.empty((len(unit_ids), 2), dtype=np.int32)
+    factions = np.empty(len(unit_ids), dtype=np.int16)
+
+    for i, unit in enumerate(unit_positions.values()):
+        positions[i] = unit.position
+        if unit.faction not in faction_lookup:
+            faction_lookup[unit.faction] = len(faction_names)
+            faction_names.append(unit.faction)
+        factions[i] = faction_lookup[unit.faction]
+
+    return UnitArrays(unit_ids, positions, factions, faction_names,
+                      {unit_id: i for i, unit_id in enumerate(unit_ids)})
+
+
+def get_unit_arrays(unit_positions) -> UnitArrays:
+    """Unit arrays for the board, rebuilt only after a unit is placed, moved or removed"""
+    return unit_positions.derived("unit_arrays", build_unit_arrays)
+
+
+def chebyshev_distances(center: Position, positions: np.ndarray) -> np.ndarray:
+    """Chebyshev distance from center to every position in an (N, 2) array"""
+    return np.abs(positions - np.asarray(center)).max(axis=1)
+
+
+def pairwise_chebyshev(from_positions: np.ndarray, to_positions: np.ndarray) -> np.ndarray:
+    """(A, B) matrix of Chebyshev distances between two position arrays"""
+    return np.abs(from_positions[:, None, :] - to_positions[None, :, :]).max(axis=2)
+
+
+def units_in_range(unit, radius: int, unit_positions, relation: str = "enemy") -> np.ndarray:
+    """
+    Boolean mask over get_unit_arrays(unit_positions) selecting units within radius of unit.
+    relation is "enemy", "ally" (never includes the unit itself) or "any".
+    """
+    arrays = get_unit_arrays(unit_positions)
+    mask = chebyshev_distances(unit.position, arrays.positions) <= radius
+
+    faction = arrays.faction_code(unit.faction)
+    if relation == "enemy":
+        mask &= arrays.factions != faction
+    elif relation == "ally":
+        mask &= arrays.factions == faction
+        self_index = arrays.index.get(unit.unit_id)
+        if self_index is not None:
+            mask[self_index] = False
+    elif relation != "any":
+        raise ValueError(f"Unknown relation: {relation}")
+
+    return mask
+
+
+def unit_positions_in_range(unit, radius: int, unit_positions, relation: str = "enemy") -> Set[Position]:
+    """Positions of enemy/ally units within radius of unit"""
+    mask = units_in_range(unit, radius, unit_positions, relation)
+    return get_unit_arrays(unit_positions).positions_of(mask)
+
+
+def tiles_in_range(center: Position, radius: int, shape: Tuple[int, int]) -> np.ndarray:
+    """(H, W) boolean mask of on-map tiles within radius of center (including center)"""
+    rows = np.abs(np.arange(shape[0]) - center[0]) <= radius
+    cols = np.abs(np.arange(shape[1]) - center[1]) <= radius
+    return rows[:, None] & cols[None, :]
+
+
+def chebyshev_dilate(mask: np.ndarray, radius: int) -> np.ndarray:
+    """(H, W) boolean mask of tiles within radius of any True tile in mask (separable max filter)"""
+    if radius <= 0:
+        return mask.copy()
+
+    window = 2 * radius + 1
+    padded = np.pad(mask, ((radius, radius), (0, 0)))
+    rows = sliding_window_view(padded, window, axis=0).any(axis=-1)
+    padded = np.pad(rows, ((0, 0), (radius, radius)))
+    return sliding_window_view(padded, window, axis=1).any(axis=-1)
+
+
+def empty_tiles_in_range(center: Position, radius: int, unit_positions) -> np.ndarray:
+    """(H, W) boolean mask of unoccupied tiles within radius of center"""
+    occupancy = unit_positions.occupancy
+    return tiles_in_range(center, radius, occupancy.shape) & ~occupancy.occupied_mask()
+
+
+def mask_to_positions(mask: np.ndarray) -> Set[Position]:
+    """Convert an (H, W) tile mask to a set of (row, col) positions"""
+    return {(int(row), int(col)) for row, col in np.argwhere(mask)}
+
+
+def batch_in_range(from_positions: np.ndarray, radii: np.ndarray, to_positions: np.ndarray) -> np.ndarray:
+    """(A, B) boolean matrix: is target b within radii[a] of source a"""
+    return pairwise_chebyshev(from_positions, to_positions) <= np.asarray(radii)[:, None]
+
+
+def attack_matrix(faction: str, terrain_map, unit_positions, ability_system) -> Tuple[List[str], List[str], np.ndarray]:
+    """
+    Score every attacker of a faction against every enemy in one call.
+    Returns (attacker_ids, target_ids, in_range) where in_range[a, t] is True if
+    attacker a can reach target t with its effective range. Ignores has_attacked.
+    """
+    arrays = get_unit_arrays(unit_positions)
+    faction_code = arrays.faction_code(faction)
+    attackers = np.flatnonzero(arrays.factions == faction_code)
+    targets = np.flatnonzero(arrays.factions != faction_code)
+
+    radii = np.array([
+        get_unit_effective_range(unit_positions[arrays.unit_ids[i]], terrain_map, unit_positions, ability_system)
+        for i in attackers
+    ], dtype=np.int32)
+
+    in_range = batch_in_range(arrays.positions[attackers], radii, arrays.positions[targets])
+    return ([arrays.unit_ids[i] for i in attackers], [arrays.unit_ids[i] for i in targets], in_range)
@@ -0,0 +1,859 @@
+"""
+Renderer for Fantasy Squad Tactics
+
+Retained-mode drawing with dirty-rectangle tracking:
+- BoardRenderer redraws only the tiles whose terrain overlay, unit or effect indicator changed
+- The board is seen through a Camera; only visible tiles and units are drawn, from images pre-scaled per zoom level
+- Background and visible terrain are composited into a board layer once per camera position; legal move,
+  attack and ability overlays are baked into an overlay layer rebuilt only when those sets change
+- UIRenderer redraws the panel below the board only when the selection, turn or game state changed
+- Tooltips are pre-rendered per hovered unit or tile and game state, then only moved with the cursor
+- Tooltip and projectile rectangles are repainted as the mouse and animations move
+- HP plates and fallback indicators come from a SurfacePool instead of being allocated per draw
+- GameRenderer ties them together and pushes just the changed rectangles with pygame.display.update;
+  F3 shows a profiling overlay with the last frame's render time, pushed rectangles and allocations
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+import pygame
+
+from camera import Camera
+from effects_system import can_unit_attack
+from special_abilities import get_unit_effective_range
+from surface_pool import SurfacePool
+from text_cache import TextCache
+
+Position = Tuple[int, int]
+Size = Tuple[int, int]
+
+FULL_REDRAW_RECTS = 64  # Past this many dirty rectangles, a single full update is cheaper
+LABEL_MIN_CELL_SIZE = 40  # Below this zoomed cell size, HP and move cost numbers are left out
+
+
+def is_current_player(unit_id: str, current_turn: int) -> bool:
+    return (current_turn == 1 and "A1" in unit_id) or (current_turn == 2 and "A2" in unit_id)
+
+
+@dataclass
+class ViewState:
+    """Everything the renderers read to draw one frame"""
+    game_map: Any
+    unit_positions: Any
+    current_turn: int
+    mode: str
+    state_version: Hashable  # Changes whenever units, effects or auras change
+    selected_unit: Any = None
+    legal_moves: Dict[Position, int] = field(default_factory=dict)
+    legal_attacks: Set[Position] = field(default_factory=set)
+    legal_ability_targets: Set[Position] = field(default_factory=set)
+    move_threat: Any = None  # ThreatMap against the selected unit's faction, while showing moves
+    projectiles: List[dict] = field(default_factory=list)
+    last_attack_result: Optional[dict] = None
+    last_ability_result: Optional[dict] = None
+    show_message: bool = False
+    can_move: bool = False
+    can_attack: bool = False
+    available_abilities: List[dict] = field(default_factory=list)
+    winner: Optional[int] = None  # Army left standing once the battle is over
+
+
+def action_availability(unit, game_map, unit_positions, ability_system, effects_system):
+    """(can_move, can_attack, available active abilities) for the selected unit"""
+    if not unit:
+        return False, False, []
+    return (unit.moves_remaining > 0, can_unit_attack(unit, effects_system),
+            ability_system.get_available_active_abilities(unit, game_map, unit_positions))
+
+
+class DirtyTracker:
+    """Screen rectangles that need repainting this frame"""
+
+    def __init__(self, screen_rect: pygame.Rect):
+        self.screen_rect = screen_rect
+        self.rects: List[pygame.Rect] = []
+        self.full = True  # The first frame paints everything
+
+    def mark(self, rect) -> None:
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if rect.width and rect.height:
+            self.rects.append(rect)
+
+    def mark_all(self) -> None:
+        self.full = True
+
+    def collides(self, rect) -> bool:
+        return self.full or pygame.Rect(rect).collidelist(self.rects) != -1
+
+    def take(self) -> List[pygame.Rect]:
+        """Rectangles to push to the display, then reset for the next frame"""
+        rects = [self.screen_rect] if self.full or len(self.rects) > FULL_REDRAW_RECTS else self.rects
+        self.rects = []
+        self.full = False
+        return rects
+
+
+class BoardRenderer:
+    """Draws the visible part of the map one tile at a time and remembers what each tile showed"""
+
+    def __init__(self, screen, camera: Camera, assets, fonts: Dict[str, pygame.font.Font], text: TextCache,
+                 effects_system, pool: Optional[SurfacePool] = None):
+        self.screen = screen
+        self.camera = camera
+        self.assets = assets
+        self.fonts = fonts
+        self.text = text
+        self.effects_system = effects_system
+        self.pool = pool if pool is not None else SurfacePool()
+        self._hp_plates: Dict[str, Tuple[int, pygame.Surface, pygame.Surface]] = {}  # unit_id -> (hp, plate, text)
+        self.game_map = None
+        self.background = None
+        self.terrain_tiles = []
+        self._terrain_by_size: Dict[int, List[Optional[pygame.Surface]]] = {}  # Terrain pre-scaled per zoom level
+        self.board_layer: Optional[pygame.Surface] = None  # Background + visible terrain
+        self.overlay_layer: Optional[pygame.Surface] = None  # Board layer + legal action overlays
+        self._camera_key = None
+        self._overlay_key = None
+        self._overlay_tiles: Set[Position] = set()
+        self.signatures: Dict[Position, tuple] = {}  # What each non-plain tile last showed
+        self._signature_key = None
+        self.projectile_rects: List[pygame.Rect] = []
+        self.tiles_drawn = 0
+
+    def set_map(self, game_map, background, terrain_tiles) -> None:
+        self.game_map = game_map
+        self.background = background
+        self.terrain_tiles = terrain_tiles
+        self._terrain_by_size = {}
+        self._hp_plates = {}
+        self.signatures = {}
+        self._signature_key = None
+        self.camera.set_map(game_map.shape)
+        self._camera_key = None
+        self.sync_camera()
+
+    @property
+    def cell_size(self) -> int:
+        return self.camera.cell_size
+
+    @property
+    def rect(self) -> pygame.Rect:
+        """Screen area of the board"""
+        return self.camera.viewport
+
+    def sync_camera(self) -> bool:
+        """Rebuild the layers for the visible tiles after a pan or zoom. Returns whether the view moved."""
+        key = self.camera.state()
+        if key == self._camera_key:
+            return False
+        self._camera_key = key
+        self.board_layer = self.build_board_layer()
+        self.overlay_layer = self.pool.surface(self.rect.size, 0, self.screen)
+        self.overlay_layer.blit(self.board_layer, (0, 0))
+        self._overlay_key = None
+        self._overlay_tiles = set()
+        return True
+
+    def zoomed(self, load: Callable[[Optional[Size]], Optional[pygame.Surface]]) -> Optional[pygame.Surface]:
+        """An image at its own size at 100%, otherwise pre-scaled for the zoom level (cached by the asset manager)"""
+        surface = load(None)
+        if surface is None or not self.camera.zoomed:
+            return surface
+        return load(self.camera.scaled_size(surface.get_size()))
+
+    def terrain_at_zoom(self) -> List[Optional[pygame.Surface]]:
+        cell_size = self.cell_size
+        tiles = self._terrain_by_size.get(cell_size)
+        if tiles is None:
+            tiles = self._terrain_by_size[cell_size] = [
+                pygame.transform.scale(tile, self.camera.scaled_size(tile.get_size()))
+                if tile and self.camera.zoomed else tile
+                for tile in self.terrain_tiles]
+        return tiles
+
+    def build_board_layer(self) -> pygame.Surface:
+        """Gameboard background with the visible terrain tiles on top, composited once per camera position"""
+        layer = self.pool.surface(self.rect.size, 0, self.screen)
+        layer.fill((0, 0, 0))
+        if self.background:
+            layer.blit(self.background, (0, 0))
+
+        tiles = self.terrain_at_zoom()
+        game_map = self.game_map
+        layer.blits([(tiles[game_map[position]], self.layer_rect(position))
+                     for position in self.camera.visible_tiles() if tiles[game_map[position]]], False)
+        return layer
+
+    def update_overlay_layer(self, view: ViewState) -> None:
+        """Re-bake the legal move/attack/ability overlays when the sets being shown change"""
+        key = self.overlay_key(view)
+        if key == self._overlay_key:
+            return
+        self._overlay_key = key
+
+        tiles = {position for position in set(view.legal_moves) | view.legal_attacks | view.legal_ability_targets
+                 if self.camera.is_visible(position)}
+        for position in self._overlay_tiles - tiles:
+            layer_rect = self.layer_rect(position)
+            self.overlay_layer.blit(self.board_layer, layer_rect, layer_rect)
+        for position in tiles:
+            self.draw_overlay(self.overlay_layer, view, position)
+        self._overlay_tiles = tiles
+
+    def tile_rect(self, position: Position) -> pygame.Rect:
+        return self.camera.tile_rect(position)
+
+    def layer_rect(self, position: Position) -> pygame.Rect:
+        """A tile's rectangle on the viewport-sized layers"""
+        return self.camera.tile_rect(position).move(-self.rect.x, -self.rect.y)
+
+    def tiles_in_rect(self, rect) -> List[Position]:
+        return self.camera.tiles_in_rect(rect)
+
+    def visible_changed_tiles(self, view: ViewState) -> Set[Position]:
+        return {position for position in self.changed_tiles(view) if self.camera.is_visible(position)}
+
+    def tile_signatures(self, view: ViewState) -> Dict[Position, tuple]:
+        """Per-tile description of everything drawn over the terrain. Tiles showing only terrain are omitted."""
+        signatures: Dict[Position, tuple] = {}
+        for position, cost in view.legal_moves.items():
+            threat = view.move_threat.damage_at(position) if view.move_threat else 0
+            signatures[position] = ("move", cost, threat)
+        for position in view.legal_attacks:
+            signatures[position] = signatures.get(position, ()) + ("attack",)
+        for position in view.legal_ability_targets:
+            signatures[position] = signatures.get(position, ()) + ("ability",)
+
+        for unit_id, piece in view.unit_positions.items():
+            status = (piece.has_attacked, piece.moves_remaining <= 0) \
+                if is_current_player(unit_id, view.current_turn) else None
+            signatures[piece.position] = signatures.get(piece.position, ()) + (
+                unit_id, piece.hp, piece is view.selected_unit, status,
+                min(self.effects_system.get_effect_count(unit_id), 3))
+        return signatures
+
+    @staticmethod
+    def overlay_key(view: ViewState) -> tuple:
+        """What the legal move/attack/ability sets and the threat map are computed from"""
+        selected_id = view.selected_unit.unit_id if view.selected_unit else None
+        return view.state_version, view.current_turn, selected_id, view.mode
+
+    def changed_tiles(self, view: ViewState) -> Set[Position]:
+        """Tiles whose overlay or unit changed since the last call"""
+        key = self.overlay_key(view)
+        if key == self._signature_key:
+            return set()
+        self._signature_key = key
+
+        signatures = self.tile_signatures(view)
+        changed = {position for position in signatures.keys() | self.signatures.keys()
+                   if signatures.get(position) != self.signatures.get(position)}
+        self.signatures = signatures
+        return changed
+
+    def draw_overlay(self, surface: pygame.Surface, view: ViewState, position: Position) -> None:
+        """Terrain plus this tile's legal move/attack/ability markers, drawn onto a layer"""
+        cell_size = self.cell_size
+        tile_rect = self.layer_rect(position)
+        x, y = tile_rect.topleft
+        small_font = self.fonts["small"]
+        show_labels = cell_size >= LABEL_MIN_CELL_SIZE
+
+        surface.blit(self.board_layer, tile_rect, tile_rect)
+
+        if position in view.legal_moves:
+            legal_moves_icon = self.zoomed(lambda size: self.assets.image('legal-moves.png', size))
+            if legal_moves_icon:
+                surface.blit(legal_moves_icon, (x, y))
+            else:
+                # Fallback to yellow square if image not found
+                pygame.draw.rect(surface, (255, 255, 0), (x + 2, y + 2, cell_size - 4, cell_size - 4), width=2)
+
+            if show_labels:
+                # Still show move cost number
+                move_cost_text = self.text.render(small_font, str(view.legal_moves[position]), (0, 0, 0))
+                surface.blit(move_cost_text, (x + 5, y + 5))
+
+                # Potential damage from enemies next turn if the unit ends its move here
+                threat_damage = view.move_threat.damage_at(position) if view.move_threat else 0
+                if threat_damage:
+                    threat_text = self.text.render(small_font, str(threat_damage), (200, 0, 0))
+                    surface.blit(threat_text, (x + cell_size - threat_text.get_width() - 5, y + 5))
+
+        if position in view.legal_attacks:
+            pygame.draw.rect(surface, (255, 0, 0), tile_rect, width=3)
+
+        if position in view.legal_ability_targets:
+            pygame.draw.rect(surface, (128, 0, 255), tile_rect, width=3)
+
+    def draw_tile(self, view: ViewState, position: Position) -> None:
+        """Repaint one tile from the overlay layer, then the unit standing on it"""
+        self.screen.blit(self.overlay_layer, self.tile_rect(position), self.layer_rect(position))
+        self.tiles_drawn += 1
+
+        piece = view.unit_positions.unit_at(position)
+        if piece:
+            self.draw_piece(view, piece)
+
+    def restore(self, rect) -> None:
+        """Repaint the layers under a screen rectangle, including any margin around a zoomed-out map"""
+        rect = pygame.Rect(rect).clip(self.rect)
+        if rect.width and rect.height:
+            self.screen.blit(self.overlay_layer, rect, rect.move(-self.rect.x, -self.rect.y))
+
+    def draw_board(self, view: ViewState) -> None:
+        """Repaint the whole view: one blit of the overlay layer, then every visible unit"""
+        self.screen.blit(self.overlay_layer, self.rect)
+        first_row, end_row, first_col, end_col = self.camera.visible_range()
+        for piece in view.unit_positions.values():
+            row, col = piece.position
+            if first_row <= row < end_row and first_col <= col < end_col:
+                self.draw_piece(view, piece)
+
+    def draw_piece(self, view: ViewState, piece) -> None:
+        tile = self.zoomed(lambda size: self.assets.unit_sprite(piece.faction, piece.unit_class, size))
+        if not tile:
+            return
+
+        cell_size = self.cell_size
+        screen = self.screen
+        x, y = self.tile_rect(piece.position).topleft
+
+        if piece is view.selected_unit:
+            selected_unit_icon = self.zoomed(lambda size: self.assets.image('selected-unit.png', size))
+            if selected_unit_icon:
+                screen.blit(selected_unit_icon, (x, y))
+            else:
+                # Fallback to green circle if image not found
+                pygame.draw.circle(screen, (0, 255, 0), (x + cell_size // 2, y + cell_size // 2), cell_size // 2, 5)
+        screen.blit(tile, (x, y))
+
+        # Draw HP indicator
+        if cell_size >= LABEL_MIN_CELL_SIZE:
+            hp_bg, hp_text = self.hp_plate(piece)
+            screen.blit(hp_bg, (x + cell_size - hp_text.get_width() - 6, y + 2))
+            screen.blit(hp_text, (x + cell_size - hp_text.get_width() - 4, y + 3))
+
+        # Attack (bottom-left) and move (bottom-right) status indicators - only for current player's units
+        if is_current_player(piece.unit_id, view.current_turn):
+            # Pre-scaled to the cell size to align with the unit tile
+            attack_icon = self.assets.status_icon("attack", piece.has_attacked, (cell_size, cell_size))
+            if attack_icon:
+                screen.blit(attack_icon, (x, y))
+            else:
+                # Fallback to colored squares if images not found, red for used attack, green for available
+                attack_indicator = self.pool.plate((15, 15), (255, 0, 0) if piece.has_attacked else (0, 255, 0), 180)
+                screen.blit(attack_indicator, (x + 2, y + cell_size - 17))
+
+            moves_done = piece.moves_remaining <= 0
+            move_icon = self.assets.status_icon("move", moves_done, (cell_size, cell_size))
+            if move_icon:
+                screen.blit(move_icon, (x, y))
+            else:
+                move_indicator = self.pool.plate((15, 15), (255, 0, 0) if moves_done else (0, 255, 0), 180)
+                screen.blit(move_indicator, (x + cell_size - 17, y + cell_size - 17))
+
+        # Draw effects indicator - use appropriate effect graphic based on number of effects
+        if self.effects_system.has_any_effects(piece.unit_id):
+            # Cap at 3 effects for graphics (use has-3-effect.png for 3+ effects)
+            effect_level = min(self.effects_system.get_effect_count(piece.unit_id), 3)
+            effect_icon = self.zoomed(lambda size: self.assets.image(f'has-{effect_level}-effect.png', size))
+            if effect_icon:
+                screen.blit(effect_icon, (x, y))
+            else:
+                # Fallback to yellow dot if image not found
+                pygame.draw.circle(screen, (255, 255, 0), (x + cell_size - 8, y + 8), 6)
+                pygame.draw.circle(screen, (0, 0, 0), (x + cell_size - 8, y + 8), 6, 1)
+
+    def hp_plate(self, piece) -> Tuple[pygame.Surface, pygame.Surface]:
+        """(translucent backdrop, text) for a unit's HP, kept until its hp changes"""
+        cached = self._hp_plates.get(piece.unit_id)
+        if cached is None or cached[0] != piece.hp:
+            hp_text = self.text.render(self.fonts["small"], str(piece.hp), (255, 255, 255))
+            backdrop = self.pool.plate((hp_text.get_width() + 4, hp_text.get_height() + 2), (0, 0, 0), 128)
+            cached = self._hp_plates[piece.unit_id] = (piece.hp, backdrop, hp_text)
+        return cached[1], cached[2]
+
+    def projectile_rects_for(self, view: ViewState) -> List[pygame.Rect]:
+        rects = []
+        for projectile in view.projectiles:
+            start_x, start_y = self.tile_rect(projectile['start']).center
+            end_x, end_y = self.tile_rect(projectile['end']).center
+            current_x = int(start_x + (end_x - start_x) * projectile['progress'])
+            current_y = int(start_y + (end_y - start_y) * projectile['progress'])
+            rects.append(pygame.Rect(current_x - 7, current_y - 7, 14, 14))
+        return rects
+
+    def draw_projectiles(self, view: ViewState) -> None:
+        for projectile, rect in zip(view.projectiles, self.projectile_rects_for(view)):
+            pygame.draw.circle(self.screen, projectile['color'], rect.center, 6)
+            pygame.draw.circle(self.screen, (255, 255, 255), rect.center, 6, 2)
+
+
+class UIRenderer:
+    """Draws the panel below the board: turn banner, unit info, buttons, messages and ability description"""
+
+    def __init__(self, screen, board_height: int, width: int, assets, fonts: Dict[str, pygame.font.Font],
+                 text: TextCache, ability_system, effects_system):
+        self.screen = screen
+        self.board_height = board_height
+        self.width = width
+        self.assets = assets
+        self.fonts = fonts
+        self.text = text
+        self.ability_system = ability_system
+        self.effects_system = effects_system
+        self.rect = pygame.Rect(0, board_height, width, screen.get_height() - board_height)
+        self.button_size = (100, 50)
+
+        # Buttons repositioned - moved back 75px left with 15px spacing (reduced from 35px)
+        self.move_button = pygame.Rect(width - 435, board_height + 65, 100, 50)
+        self.attack_button = pygame.Rect(width - 320, board_height + 65, 100, 50)
+        self.ability_button = pygame.Rect(width - 205, board_height + 65, 100, 50)
+        # End Turn button on the next line, Reset button in the upper left corner (tiny, over the board)
+        self.end_button = pygame.Rect(width - 240, board_height + 125, 100, 50)
+        self.reset_button = pygame.Rect(10, 10, 50, 25)
+        self._signature = None
+
+    def signature(self, view: ViewState) -> tuple:
+        selected_id = view.selected_unit.unit_id if view.selected_unit else None
+        # The result dicts themselves, not their ids: holding them keeps a freed dict's address from being reused
+        return (view.state_version, view.current_turn, view.mode, selected_id, view.show_message,
+                view.last_attack_result, view.last_ability_result)
+
+    def changed(self, view: ViewState) -> bool:
+        signature = self.signature(view)
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        return True
+
+    def invalidate(self) -> None:
+        self._signature = None
+
+    def draw(self, view: ViewState) -> None:
+        screen = self.screen
+        font = self.fonts["font"]
+        width, board_height = self.width, self.board_height
+        selected_unit = view.selected_unit
+
+        screen.fill((0, 0, 0), self.rect)
+        pygame.draw.rect(screen, (50, 50, 50), (0, board_height + 75, width, 125))
+
+        banner = f"Player {view.winner} Wins!" if view.winner else f"Player {view.current_turn}'s Turn"
+        turn_text = self.text.render(self.fonts["large"], banner, (200, 200, 200))
+        screen.blit(turn_text, (width // 2 - turn_text.get_width() // 2, board_height + 10))
+
+        panel_x = 20
+        panel_y = board_height + 65
+        panel_width = 300
+        panel_height = 130
+        pygame.draw.rect(screen, (80, 80, 80), (panel_x, panel_y, panel_width, panel_height))
+        pygame.draw.rect(screen, (200, 200, 200), (panel_x, panel_y, panel_width, panel_height), 2)
+
+        if selected_unit:
+            self.draw_unit_info(view, panel_x, panel_y)
+        else:
+            no_unit_text = self.text.render(font, "No unit selected", (255, 255, 255))
+            screen.blit(no_unit_text, (panel_x + 10, panel_y + 10))
+
+        can_use_ability = len(view.available_abilities) > 0
+        for button, name, available, button_mode in (
+                (self.move_button, "move", view.can_move, "move"),
+                (self.attack_button, "attack", view.can_attack, "attack"),
+                (self.ability_button, "special", can_use_ability, "ability")):
+            state = "selected" if available and view.mode == button_mode else "normal" if available else "faded"
+            button_img = self.assets.button(name, state, self.button_size)
+            if button_img:
+                screen.blit(button_img, button.topleft)
+
+        pygame.draw.rect(screen, (200, 0, 0), self.end_button)
+        end_text = self.text.render(font, "End Turn", (255, 255, 255))
+        screen.blit(end_text, (width - 230, board_height + 140))
+
+        self.draw_message(view)
+        if selected_unit:
+            self.draw_ability_description(selected_unit)
+
+    def draw_reset_button(self) -> None:
+        pygame.draw.rect(self.screen, (0, 0, 200), self.reset_button)
+        reset_text = self.text.render(self.fonts["tiny"], "Reset", (255, 255, 255))
+        self.screen.blit(reset_text, (15, 15))
+
+    def draw_unit_info(self, view: ViewState, panel_x: int, panel_y: int) -> None:
+        screen = self.screen
+        font, small_font = self.fonts["font"], self.fonts["small"]
+        selected_unit = view.selected_unit
+
+        unit_name_text = self.text.render(font, selected_unit.name, (255, 255, 255))
+
+        # Create colored text for stats - labels in 66% gray (168, 168, 168), values in white
+        effective_range = get_unit_effective_range(selected_unit, view.game_map, view.unit_positions,
+                                                   self.ability_system)
+        stat_lines = [
+            [("hp: ", (168, 168, 168)), (str(selected_unit.hp), (255, 255, 255)),
+             ("  atk: ", (168, 168, 168)), (str(selected_unit.atk), (255, 255, 255)),
+             ("  range: ", (168, 168, 168)), (str(effective_range), (255, 255, 255))],
+            [("moves: ", (168, 168, 168)), (f"{selected_unit.moves_remaining}/{selected_unit.move}", (255, 255, 255))],
+            [("attacked: ", (168, 168, 168)),
+             ('yes' if selected_unit.has_attacked else 'no',
+              (255, 0, 0) if selected_unit.has_attacked else (0, 255, 0))],
+        ]
+
+        # Show available abilities with better messaging
+        ability_name = selected_unit.ability_name
+        if view.available_abilities:
+            ability_value = (ability_name, (255, 255, 255))
+        else:
+            # Check if unit has an ability but can't use it right now
+            ability_info = self.ability_system.ability_by_id.get(selected_unit.ability_id)
+            if ability_info and ability_info.get("type") == "active":
+                ability_value = (f"{ability_name} (not currently usable)", (128, 128, 128))
+            else:
+                ability_value = (f"{ability_name} (passive)", (255, 255, 255))
+
+        unit_icon = self.assets.unit_portrait(selected_unit.faction, selected_unit.unit_class, (50, 50))
+        if unit_icon:
+            screen.blit(unit_icon, (panel_x + 10, panel_y + 15))
+
+        screen.blit(unit_name_text, (panel_x + 70, panel_y + 10))
+
+        # Stats, moves and attacked lines with colored labels and values
+        for line_y, segments in zip((panel_y + 35, panel_y + 60, panel_y + 85), stat_lines):
+            current_x = panel_x + 70
+            for text, color in segments:
+                surface = self.text.render(font, text, color)
+                screen.blit(surface, (current_x, line_y))
+                current_x += surface.get_width()
+
+        # Draw ability line with colored labels and values
+        current_x = panel_x + 70
+        ability_label = self.text.render(small_font, "ability: ", (168, 168, 168))
+        screen.blit(ability_label, (current_x, panel_y + 110))
+        current_x += ability_label.get_width()
+        screen.blit(self.text.render(small_font, ability_value[0], ability_value[1]), (current_x, panel_y + 110))
+
+    def draw_message(self, view: ViewState) -> None:
+        """Attack or ability result banner"""
+        if not view.show_message:
+            return
+
+        small_font = self.fonts["small"]
+        message_y = self.board_height + 45
+        if view.last_attack_result:
+            result = view.last_attack_result
+            result_text = f"{result['attacker']} attacks {result['target']} for {result['damage']} damage!"
+            if result['target_defeated']:
+                result_text += f" {result['target']} defeated!"
+            color = (255, 255, 0)
+        elif view.last_ability_result:
+            result_text = view.last_ability_result.get("message", "Ability used!")
+            color = (128, 0, 255)
+        else:
+            return
+
+        result_surface = self.text.render(small_font, result_text, color)
+        result_rect = result_surface.get_rect(center=(self.width // 2, message_y))
+
+        bg_rect = result_rect.inflate(10, 5)
+        pygame.draw.rect(self.screen, (0, 0, 0), bg_rect)
+        pygame.draw.rect(self.screen, color, bg_rect, 2)
+
+        self.screen.blit(result_surface, result_rect)
+
+    def draw_ability_description(self, selected_unit) -> None:
+        """Always show the selected unit's ability description, regardless of availability"""
+        small_font = self.fonts["small"]
+        ability_name = selected_unit.ability_name
+
+        # Get the full description from the ability system or use the original special text
+        ability_info = self.ability_system.ability_by_id.get(selected_unit.ability_id)
+        if ability_info:
+            ability_description = f"{ability_name}: {ability_info.get('description', selected_unit.special)}"
+        else:
+            ability_description = selected_unit.special
+
+        desc_lines = self.text.wrap(small_font, ability_description, self.width - 40)  # Leave some margin
+
+        # Calculate description height and position
+        desc_height = max(60, len(desc_lines) * 22 + 15)
+        ability_desc_y = self.board_height + 200  # Position below UI
+
+        # Draw background for description
+        pygame.draw.rect(self.screen, (80, 80, 120), (20, ability_desc_y, self.width - 40, desc_height))
+        pygame.draw.rect(self.screen, (255, 255, 255), (20, ability_desc_y, self.width - 40, desc_height), 2)
+
+        # Draw description text
+        for i, line in enumerate(desc_lines):
+            line_surface = self.text.render(small_font, line, (255, 255, 255))
+            self.screen.blit(line_surface, (25, ability_desc_y + 8 + i * 22))
+
+
+class TooltipRenderer:
+    """
+    Hover tooltips. The hovered unit comes from the occupancy grid; each tooltip is pre-rendered once per
+    (kind, tile or unit, game state, mode) and only repositioned as the cursor moves within the tile.
+    """
+
+    LINE_HEIGHT = 18
+    BACKGROUND = (40, 40, 40, 240)
+
+    def __init__(self, screen, camera: Camera, fonts: Dict[str, pygame.font.Font], text: TextCache,
+                 ability_system, effects_system, pool: Optional[SurfacePool] = None, max_entries: int = 64):
+        self.screen = screen
+        self.pool = pool if pool is not None else SurfacePool()
+        self.camera = camera
+        self.font = fonts["small"]
+        self.text = text
+        self.ability_system = ability_system
+        self.effects_system = effects_system
+        self.max_entries = max_entries
+        self._surfaces: "OrderedDict[tuple, Tuple[pygame.Surface, bool]]" = OrderedDict()
+        self.builds = 0
+
+    def hover_tile(self, mouse_pos: Tuple[int, int]) -> Optional[Position]:
+        return self.camera.screen_to_tile(mouse_pos)
+
+    def content_key(self, view: ViewState, hover_pos: Optional[Position]) -> Optional[tuple]:
+        """What the tooltip at hover_pos shows, or None when there is no tooltip"""
+        if hover_pos is None:
+            return None
+        selected_unit = view.selected_unit
+        if selected_unit:
+            if view.mode == "move" and hover_pos in view.legal_moves:
+                return ("move", hover_pos, view.legal_moves[hover_pos], view.state_version, selected_unit.unit_id)
+            if view.mode == "attack" and hover_pos in view.legal_attacks:
+                return ("attack", hover_pos, view.state_version)
+            if view.mode == "ability" and hover_pos in view.legal_ability_targets:
+                ability_name = view.available_abilities[0]["name"] if view.available_abilities else None
+                return ("ability", ability_name)
+
+        unit_id = view.unit_positions.unit_id_at(hover_pos)
+        if unit_id is not None:
+            return ("unit", unit_id, view.state_version)
+        return None
+
+    def unit_lines(self, view: ViewState, unit) -> List[str]:
+        """Unit stats with its effects merged in"""
+        effective_range = get_unit_effective_range(unit, view.game_map, view.unit_positions, self.ability_system)
+        lines = [f"{unit.name} (HP: {unit.hp}, ATK: {unit.atk}, Range: {effective_range})"]
+        if self.effects_system.has_any_effects(unit.unit_id):
+            lines.append("Effects:")
+            lines.extend(f"  {effect}" for effect in self.effects_system.get_effect_summary(unit.unit_id))
+        return lines
+
+    def build(self, view: ViewState, key: tuple, hover_pos: Position) -> Tuple[pygame.Surface, bool]:
+        """Pre-render a tooltip: (surface, is_panel). Panels sit above the cursor, single lines beside it."""
+        kind = key[0]
+        if kind == "move":
+            text = f"Click to move (Cost: {key[2]})"
+            threat = view.move_threat
+            if threat is not None and threat.threat_count(hover_pos):
+                text += f" - Threatened by {threat.threat_count(hover_pos)} ({threat.damage_at(hover_pos)} dmg)"
+            return self.single_line(text, (255, 255, 0)), False
+        if kind == "ability":
+            text = f"Click to use {key[1]}" if key[1] else "Click to use ability"
+            return self.single_line(text, (128, 0, 255)), False
+
+        unit = view.unit_positions.unit_at(hover_pos)
+        if kind == "attack":
+            lines = ["Click to attack"] + (self.unit_lines(view, unit) if unit else [])
+            return self.panel(lines, (255, 0, 0)), True
+        return self.panel(self.unit_lines(view, unit), (200, 200, 200)), True
+
+    def single_line(self, text: str, border: Tuple[int, int, int]) -> pygame.Surface:
+        text_surface = self.text.render(self.font, text, (255, 255, 255))
+        surface = self.pool.surface((text_surface.get_width() + 10, text_surface.get_height() + 6), pygame.SRCALPHA)
+        surface.fill(self.BACKGROUND)
+        pygame.draw.rect(surface, border, surface.get_rect(), 1)
+        surface.blit(text_surface, (5, 3))
+        return surface
+
+    def panel(self, lines: List[str], border: Tuple[int, int, int]) -> pygame.Surface:
+        width = max(self.text.width(self.font, line) for line in lines) + 20
+        height = len(lines) * self.LINE_HEIGHT + 10
+        surface = self.pool.surface((width, height), pygame.SRCALPHA)
+        surface.fill(self.BACKGROUND)
+        pygame.draw.rect(surface, border, surface.get_rect(), 2)
+        for i, line in enumerate(lines):
+            surface.blit(self.text.render(self.font, line, (255, 255, 255)), (10, 5 + i * self.LINE_HEIGHT))
+        return surface
+
+    def tooltip(self, view: ViewState, key: tuple, hover_pos: Position) -> Tuple[pygame.Surface, bool]:
+        cached = self._surfaces.get(key)
+        if cached is not None:
+            self._surfaces.move_to_end(key)
+            return cached
+        cached = self._surfaces[key] = self.build(view, key, hover_pos)
+        self.builds += 1
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return cached
+
+    def placement(self, surface: pygame.Surface, is_panel: bool, mouse_pos: Tuple[int, int]) -> pygame.Rect:
+        """Where the tooltip goes for this cursor position, kept inside the window"""
+        width, height = surface.get_size()
+        if is_panel:
+            x = min(mouse_pos[0] + 15, self.screen.get_width() - width - 10)
+            y = max(mouse_pos[1] - height - 15, 10)
+        else:
+            x = min(mouse_pos[0] + 10, self.screen.get_width() - width - 5)
+            y = max(mouse_pos[1] - 30, 10) - 3
+        return pygame.Rect(x, y, width, height)
+
+    def draw(self, view: ViewState, key: Optional[tuple], hover_pos: Position,
+             mouse_pos: Tuple[int, int]) -> Optional[pygame.Rect]:
+        """Blit the cached tooltip next to the cursor and return its rectangle"""
+        if key is None:
+            return None
+        surface, is_panel = self.tooltip(view, key, hover_pos)
+        rect = self.placement(surface, is_panel, mouse_pos)
+        self.screen.blit(surface, rect)
+        return rect
+
+    def clear(self) -> None:
+        self._surfaces.clear()
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+
+class GameRenderer:
+    """Paints only what changed each frame and pushes those rectangles to the display"""
+
+    def __init__(self, screen, camera: Camera, assets, fonts: Dict[str, pygame.font.Font], ability_system,
+                 effects_system, text: Optional[TextCache] = None, present: bool = True):
+        self.screen = screen
+        self.camera = camera
+        self.present = present  # False when drawing into an offscreen surface (headless snapshots, benchmarks)
+        self.text = text if text is not None else TextCache()
+        self.pool = SurfacePool()
+        self.board = BoardRenderer(screen, camera, assets, fonts, self.text, effects_system, self.pool)
+        self.ui = UIRenderer(screen, camera.viewport.bottom, screen.get_width(), assets, fonts, self.text,
+                             ability_system, effects_system)
+        self.tooltips = TooltipRenderer(screen, camera, fonts, self.text, ability_system, effects_system, self.pool)
+        self.dirty = DirtyTracker(screen.get_rect())
+        self._tooltip_key = None
+        self._tooltip_rect: Optional[pygame.Rect] = None
+        self.frames = 0
+        self.frames_drawn = 0  # Frames that pushed anything to the display
+
+        # Profiling overlay (toggled with F3): last frame's render time, pushed rectangles and allocations
+        self.show_profile = False
+        self.fps = 0.0  # Set by the game loop
+        self.last_frame: Dict[str, float] = {}
+        self.profile_font = fonts["tiny"]
+        self.profile_rect = pygame.Rect(camera.viewport.right - 200, camera.viewport.top + 10, 190, 6 * 14 + 8)
+
+    def set_map(self, game_map, background, terrain_tiles) -> None:
+        """New map (game start or reset): everything is repainted on the next frame"""
+        self.board.set_map(game_map, background, terrain_tiles)
+        self.tooltips.clear()
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self.dirty.mark_all()
+        self.ui.invalidate()
+
+    def toggle_profile(self) -> None:
+        self.show_profile = not self.show_profile
+        self.dirty.mark(self.profile_rect)
+
+    def draw_profile(self) -> None:
+        """Stats of the previous frame. Drawn with font.render directly so it doesn't count itself."""
+        stats = self.last_frame
+        lines = [
+            f"fps {self.fps:5.1f}   render {stats.get('ms', 0.0):5.2f} ms",
+            f"rects pushed {stats.get('rects', 0):.0f}   tiles {stats.get('tiles', 0):.0f}",
+            f"surfaces allocated {stats.get('surfaces', 0):.0f}",
+            f"text rendered {stats.get('text', 0):.0f}",
+            f"pooled plates {len(self.pool)}   total surfaces {self.pool.allocations}",
+            f"cached text {self.text.stats()['surfaces']}   tooltips {len(self.tooltips)}",
+        ]
+        self.screen.fill((0, 0, 0), self.profile_rect)
+        for i, line in enumerate(lines):
+            self.screen.blit(self.profile_font.render(line, True, (0, 255, 0)),
+                             (self.profile_rect.x + 4, self.profile_rect.y + 4 + i * 14))
+
+    def render(self, view: ViewState, mouse_pos: Tuple[int, int]) -> List[pygame.Rect]:
+        """Repaint the dirty parts of the screen, with the tooltip for the tile under mouse_pos"""
+        self.frames += 1
+        start = time.perf_counter()
+        allocations, text_renders, tiles_drawn = self.pool.allocations, self.text.misses, self.board.tiles_drawn
+        dirty, board = self.dirty, self.board
+        hover_pos = self.tooltips.hover_tile(mouse_pos)
+        tooltip_content = self.tooltips.content_key(view, hover_pos)
+        tooltip_key = (mouse_pos, tooltip_content) if tooltip_content else None
+
+        # Collect dirty regions: the whole view after a pan or zoom, else changed tiles; the UI panel,
+        # projectiles and the old tooltip
+        camera_moved = board.sync_camera()
+        if camera_moved:
+            dirty.mark(board.rect)
+        board.update_overlay_layer(view)
+        tiles = board.visible_changed_tiles(view)
+        for position in tiles:
+            dirty.mark(board.tile_rect(position).clip(board.rect))
+
+        ui_changed = self.ui.changed(view) or dirty.full
+        if ui_changed:
+            dirty.mark(self.ui.rect)
+
+        projectile_rects = board.projectile_rects_for(view)
+        for rect in board.projectile_rects + projectile_rects:
+            dirty.mark(rect)
+        board.projectile_rects = projectile_rects
+
+        tooltip_changed = tooltip_key != self._tooltip_key
+        if tooltip_changed and self._tooltip_rect:
+            dirty.mark(self._tooltip_rect)
+        if self.show_profile:
+            dirty.mark(self.profile_rect)
+
+        # Repaint back to front: tiles, projectiles, UI panel, reset button, tooltip
+        self.screen.set_clip(board.rect)
+        if dirty.full or camera_moved:
+            board.draw_board(view)
+        else:
+            for rect in list(dirty.rects):
+                board.restore(rect)
+                tiles.update(board.tiles_in_rect(rect))
+            for position in tiles:
+                board.draw_tile(view, position)
+        board.draw_projectiles(view)
+        self.screen.set_clip(None)
+
+        if ui_changed or dirty.collides(self.ui.rect):
+            self.ui.draw(view)
+        if dirty.collides(self.ui.reset_button):
+            self.ui.draw_reset_button()
+
+        if tooltip_changed or (self._tooltip_rect and dirty.collides(self._tooltip_rect)):
+            self._tooltip_key = tooltip_key
+            self._tooltip_rect = self.tooltips.draw(view, tooltip_content, hover_pos, mouse_pos)
+            if self._tooltip_rect:
+                dirty.mark(self._tooltip_rect)
+        if self.show_profile:
+            self.draw_profile()
+
+        full = dirty.full
+        rects = dirty.take()
+        if self.present:
+            if full:
+                pygame.display.flip()
+            elif rects:
+                pygame.display.update(rects)
+        if rects:
+            self.frames_drawn += 1
+
+        self.last_frame = {
+            "ms": (time.perf_counter() - start) * 1000.0,
+            "rects": len(rects),
+            "tiles": self.board.tiles_drawn - tiles_drawn,
+            "surfaces": self.pool.allocations - allocations,
+            "text": self.text.misses - text_renders,
+        }
+        return rects
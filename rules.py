@@ -0,0 +1,164 @@
+"""
+Rules for Fantasy Squad Tactics
+
+The turn logic shared by the game window, GameState and the simulators, with no pygame dependency:
+- Moving and attacking units, with terrain move costs, attack bonuses and damage reductions
+- Legal moves, attacks and ability targets for a unit
+"""
+
+from effects_system import can_unit_attack
+from pathfinding import find_reachable_tiles
+from range_queries import unit_positions_in_range, tiles_in_range, mask_to_positions
+from special_abilities import AbilityId, get_unit_effective_range, apply_damage_reductions
+from terrain import Terrain, MOVE_COST, ATTACK_BONUS
+
+MOVEMENT_COSTS = MOVE_COST  # Indexed by terrain code
+
+# How active abilities pick their targets
+SELF_CENTERED_ABILITIES = {AbilityId.WARCRY, AbilityId.VIGILANCE}
+AREA_TARGET_ABILITIES = {AbilityId.LURE}
+ENEMY_TARGET_ABILITIES = {AbilityId.GRAB}
+ALLY_TARGET_ABILITIES = {AbilityId.FOR_THE_KING, AbilityId.STRATEGIC_SAVANT}
+
+
+def move_unit(unit_id, new_position, unit_positions, terrain_map, movement_costs, path_cost=None):
+    """
+    Move a unit to new_position. path_cost is the route's cost from calculate_legal_moves, which already checked
+    it against the unit's move budget including abilities (Flying, Trusty Steed); without one, the destination
+    tile's terrain cost is checked against the moves remaining.
+    """
+    row, col = new_position
+    if row < 0 or row >= terrain_map.shape[0] or col < 0 or col >= terrain_map.shape[1]:
+        raise ValueError("Position out of bounds")
+
+    terrain = terrain_map[row, col]
+    cost = movement_costs[terrain]
+
+    if terrain == Terrain.LAKE:
+        raise ValueError("Terrain not passable")
+
+    unit = unit_positions[unit_id]
+    if path_cost is None and cost > unit.moves_remaining:
+        raise ValueError("Not enough movement points")
+
+    unit_positions.relocate(unit_id, new_position)
+    unit.terrain = int(terrain)
+
+
+def attack_unit(attacker_id, target_position, unit_positions, terrain_map, ability_system):
+    """
+    Performs an attack from attacker to target at target_position.
+    Returns a dictionary with attack results for UI feedback.
+    """
+    attacker = unit_positions[attacker_id]
+
+    # Check if unit has already attacked this turn
+    if attacker.has_attacked:
+        raise ValueError("Unit has already attacked this turn")
+
+    # Find the target unit at the given position
+    target_id = unit_positions.unit_id_at(target_position)
+    target = unit_positions.get(target_id) if target_id is not None else None
+
+    if not target:
+        raise ValueError("No target found at specified position")
+
+    if target.faction == attacker.faction:
+        raise ValueError("Cannot attack friendly units")
+
+    # Calculate base damage
+    base_damage = attacker.atk + ability_system.get_attack_modifications(attacker, terrain_map, unit_positions)
+
+    # Apply terrain modifiers
+    attacker_terrain = terrain_map[attacker.position[0], attacker.position[1]]
+    target_terrain = terrain_map[target.position[0], target.position[1]]
+
+    # Mountain bonus: +1 damage when attacking from mountain
+    damage_bonus = 0
+    if not ATTACK_BONUS[target_terrain]:
+        damage_bonus += int(ATTACK_BONUS[attacker_terrain])
+
+    # Apply damage reductions using ability system
+    preliminary_damage = base_damage + damage_bonus
+    final_damage = apply_damage_reductions(target, preliminary_damage, terrain_map, ability_system)
+
+    # Apply damage
+    target.hp -= final_damage
+
+    # Mark attacker as having attacked
+    attacker.has_attacked = True
+
+    # Calculate if this is a ranged attack (distance > 1)
+    distance = max(abs(attacker.position[0] - target.position[0]),
+                   abs(attacker.position[1] - target.position[1]))
+    is_ranged = distance > 1
+
+    # Prepare result info
+    result = {
+        "attacker": attacker.name,
+        "target": target.name,
+        "damage": final_damage,
+        "target_remaining_hp": target.hp,
+        "target_defeated": target.hp <= 0,
+        "terrain_bonus": damage_bonus,
+        "terrain_reduction": preliminary_damage - final_damage,
+        "is_ranged": is_ranged,
+        "attacker_pos": attacker.position,
+        "target_pos": target.position
+    }
+
+    # Remove defeated unit
+    if target.hp <= 0:
+        del unit_positions[target_id]
+
+    # Check for triggered abilities (like Double Tap)
+    if attacker.ability_id == AbilityId.DOUBLE_TAP and target.hp <= 0:
+        result["triggered_ability"] = "Double tap available"
+
+    return result
+
+
+def calculate_legal_moves(unit, terrain_map, movement_costs, unit_positions, ability_system):
+    """Return every tile the unit can reach this turn mapped to its minimum move cost."""
+    # Like the Move button, a unit with no moves left stays put; bonuses (Trusty Steed) only stretch a move
+    if unit.moves_remaining <= 0:
+        return {}
+    reachability = find_reachable_tiles(unit, terrain_map, movement_costs, unit_positions, ability_system)
+    return reachability.legal_moves()
+
+
+def calculate_effective_range(unit, terrain_map, unit_positions, ability_system):
+    """Calculate the effective range of a unit including all bonuses."""
+    return get_unit_effective_range(unit, terrain_map, unit_positions, ability_system)
+
+
+def calculate_legal_attacks(unit, terrain_map, unit_positions, ability_system, effects_system=None):
+    # Can't attack if already attacked this turn, or (given the effects) while an effect forbids it
+    if unit.has_attacked or (effects_system is not None and not can_unit_attack(unit, effects_system)):
+        return set()
+
+    effective_range = calculate_effective_range(unit, terrain_map, unit_positions, ability_system)
+    return unit_positions_in_range(unit, effective_range, unit_positions, relation="enemy")
+
+
+def calculate_legal_ability_targets(unit, ability_name, terrain_map, unit_positions, ability_system):
+    """Calculate valid targets for a special ability"""
+    ability = ability_system.get_ability_info(ability_name)
+    if not ability:
+        return set()
+
+    ability_range = ability.get("range", 0)
+    ability_id = ability["id"]
+
+    if ability_range == 0 or ability_id in SELF_CENTERED_ABILITIES:
+        return {unit.position}  # Self-targeted or area effect centred on the unit
+
+    # Different abilities target different things
+    if ability_id in AREA_TARGET_ABILITIES:
+        return mask_to_positions(tiles_in_range(unit.position, ability_range, terrain_map.shape))
+    elif ability_id in ENEMY_TARGET_ABILITIES:
+        return unit_positions_in_range(unit, ability_range, unit_positions, relation="enemy")
+    elif ability_id in ALLY_TARGET_ABILITIES:
+        return unit_positions_in_range(unit, ability_range, unit_positions, relation="ally")
+
+    return set()
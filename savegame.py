@@ -0,0 +1,132 @@
+"""
+Save Games for Fantasy Squad Tactics
+
+A complete battle as a JSON document:
+- Terrain map as one string of terrain codes per row, with the code legend stored alongside
+- Every unit still in play with its current stats, position and turn flags
+- Cast auras still on the board (Warcry) and every unit's active effects
+- The player whose turn it is
+Passive auras (Spotter) are rebuilt from the units when they are placed back on the board.
+"""
+
+import json
+from dataclasses import asdict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from auras import AURA_DEFINITIONS, AuraPulse
+from effects_system import Effect, EffectDuration, EffectType, EffectsSystem
+from game_classes import GamePiece
+from occupancy import UnitPositions
+from special_abilities import SpecialAbilitySystem
+from terrain import TERRAIN_DTYPE, Terrain
+from unit_table import UnitTable
+
+SAVE_FORMAT = 1
+
+# Stats restored after the piece is created (GamePiece starts with full moves and max HP by class)
+UNIT_STATE_FIELDS = ("max_hp", "moves_remaining", "has_attacked")
+
+
+def game_to_dict(game_map, unit_positions, current_turn: int = 1,
+                 effects_system: Optional[EffectsSystem] = None) -> Dict[str, Any]:
+    units = []
+    for unit_id, unit in unit_positions.items():
+        units.append({
+            "unit_id": unit_id,
+            "unit_class": unit.unit_class,
+            "name": unit.name,
+            "special": unit.special,
+            "faction": unit.faction,
+            "army": int(unit.table.army[unit.index]),
+            "position": list(unit.position),
+            "terrain": unit.terrain,
+            "hp": unit.hp,
+            "max_hp": unit.max_hp,
+            "atk": unit.atk,
+            "move": unit.move,
+            "moves_remaining": unit.moves_remaining,
+            "range": unit.range,
+            "has_attacked": unit.has_attacked,
+        })
+
+    effects = {}
+    if effects_system is not None:
+        for unit_id, unit_effects in effects_system.unit_effects.items():
+            if unit_effects:
+                effects[unit_id] = [dict(asdict(effect), effect_type=effect.effect_type.value,
+                                         duration=effect.duration.value) for effect in unit_effects.values()]
+
+    return {
+        "format": SAVE_FORMAT,
+        "current_turn": current_turn,
+        "terrain": [terrain.label for terrain in Terrain],
+        "map": ["".join(str(code) for code in row) for row in np.asarray(game_map).tolist()],
+        "units": units,
+        "pulses": [dict(asdict(pulse), position=list(pulse.position)) for pulse in unit_positions.auras.pulses],
+        "effects": effects,
+    }
+
+
+def game_from_dict(data: Dict[str, Any], ability_system: Optional[SpecialAbilitySystem] = None,
+                   effects_system: Optional[EffectsSystem] = None) -> Tuple[np.ndarray, UnitPositions, int]:
+    """Rebuild (game_map, unit_positions, current_turn). Effects are loaded into effects_system if given."""
+    if data.get("format") != SAVE_FORMAT:
+        raise ValueError(f"Unsupported save format: {data.get('format')}")
+    if data["terrain"] != [terrain.label for terrain in Terrain]:
+        raise ValueError("Save was written with different terrain codes")
+
+    game_map = np.array([[int(code) for code in row] for row in data["map"]], dtype=TERRAIN_DTYPE)
+    ability_system = ability_system or SpecialAbilitySystem()
+    unit_positions = UnitPositions(game_map.shape, UnitTable(capacity=len(data["units"])))
+
+    for record in data["units"]:
+        piece = GamePiece(
+            unit_id=record["unit_id"],
+            unit_class=record["unit_class"],
+            name=record["name"],
+            hp=record["hp"],
+            move=record["move"],
+            range=record["range"],
+            atk=record["atk"],
+            special=record["special"],
+            position=tuple(record["position"]),
+            terrain=record["terrain"],
+            faction=record["faction"],
+            table=unit_positions.table,
+            army=record["army"]
+        )
+        for field in UNIT_STATE_FIELDS:
+            getattr(unit_positions.table, field)[piece.index] = record[field]
+        ability_system.bind_ability(piece)
+        unit_positions[record["unit_id"]] = piece
+    unit_positions.table.version += 1
+
+    auras = unit_positions.auras
+    for pulse in data.get("pulses", []):
+        if pulse["aura"] not in AURA_DEFINITIONS:
+            continue  # An aura this version cannot cast
+        auras.restore_pulse(AuraPulse(pulse["aura"], pulse["faction"], tuple(pulse["position"]),
+                                      pulse["source_unit_id"], pulse["turns_remaining"]))
+
+    if effects_system is not None:
+        effects_system.clear()
+        for unit_id, effects in data.get("effects", {}).items():
+            for effect in effects:
+                effects_system.add_effect(unit_id, Effect(**dict(effect, effect_type=EffectType(effect["effect_type"]),
+                                                                 duration=EffectDuration(effect["duration"]))))
+
+    return game_map, unit_positions, data["current_turn"]
+
+
+def save_game(path: str, game_map, unit_positions, current_turn: int = 1,
+              effects_system: Optional[EffectsSystem] = None) -> None:
+    with open(path, "w") as save_file:
+        json.dump(game_to_dict(game_map, unit_positions, current_turn, effects_system), save_file, indent=1)
+
+
+def load_game(path: str, ability_system: Optional[SpecialAbilitySystem] = None,
+              effects_system: Optional[EffectsSystem] = None) -> Tuple[np.ndarray, UnitPositions, int]:
+    with open(path) as save_file:
+        return game_from_dict(json.load(save_file), ability_system, effects_system)
@@ -0,0 +1,152 @@
+"""
+Search State Checks for Fantasy Squad Tactics
+
+Regression checks for the state search builds on, over random playouts that include abilities:
+- Make/unmake: random continuations are applied and taken back with undo_to(), and must leave the state
+  exactly as it was (unit table, board, auras, effects and turn)
+- Zobrist keys: every key read is checked against a full recomputation (the FST_DEBUG_ZOBRIST=1 mode), must
+  come back after undo, must match a clone's and a saved-and-loaded game's, and must not be shared by two
+  different positions
+- Clones: playing on a clone leaves the original untouched
+
+Exits with status 1 on any failure, e.g.:
+    python search_checks.py --games 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import warnings
+
+import numpy as np
+
+from assets import resource_path
+from effects_system import EffectsSystem
+from game_state import GameState
+from savegame import load_game, save_game
+from undo_log import UndoLog
+from unit_table import COLUMNS
+from zobrist import enable_zobrist_checks
+
+
+def exact_state(game: GameState) -> tuple:
+    """Everything make/unmake must restore, including dead units' rows and iteration order"""
+    unit_positions, effects_system = game.unit_positions, game.effects_system
+    table, auras = unit_positions.table, unit_positions.auras
+    return (
+        {column: getattr(table, column)[:table.size].tolist() for column in COLUMNS},
+        [(unit_id, unit.index) for unit_id, unit in unit_positions.items()],
+        dict(unit_positions._positions),
+        unit_positions.occupancy.cells.tolist(),
+        {key: field.tolist() for key, field in auras.fields.items() if field.any()},  # Empty fields are created lazily
+        dict(auras.sources),
+        [(pulse.aura, pulse.faction, pulse.position, pulse.source_unit_id, pulse.turns_remaining)
+         for pulse in auras.pulses],
+        {unit_id: [(name, effect.effect_type, effect.value, effect.turns_remaining, effect.source_unit_id)
+                   for name, effect in effects.items()] for unit_id, effects in effects_system.unit_effects.items()},
+        game.current_turn,
+        game.turns_played,
+    )
+
+
+def position(game: GameState) -> tuple:
+    """What a position key covers: live units by id (HP by bucket), effects, cast auras and the side to move"""
+    return (
+        sorted((unit_id, unit.position, unit.hp // game.hp_bucket, unit.moves_remaining, unit.has_attacked)
+               for unit_id, unit in game.unit_positions.items()),
+        sorted((unit_id, sorted((effect.name, effect.value, effect.turns_remaining) for effect in effects.values()))
+               for unit_id, effects in game.effects_system.unit_effects.items() if effects),
+        sorted((pulse.aura, pulse.faction, pulse.position, pulse.source_unit_id, pulse.turns_remaining)
+               for pulse in game.unit_positions.auras.pulses),
+        game.current_turn,
+    )
+
+
+def saved_and_loaded(game: GameState) -> GameState:
+    handle, path = tempfile.mkstemp(suffix=".json")
+    os.close(handle)
+    try:
+        save_game(path, game.game_map, game.unit_positions, game.current_turn, game.effects_system)
+        effects_system = EffectsSystem()
+        game_map, unit_positions, current_turn = load_game(path, effects_system=effects_system)
+        return GameState(game_map, unit_positions, current_turn, effects_system=effects_system,
+                         hp_bucket=game.hp_bucket)
+    finally:
+        os.remove(path)
+
+
+def check_game(seed: int, size: int, army_points: int, hp_bucket: int, steps: int, failures: list) -> int:
+    """Play one random game, checking every step. Returns the number of actions applied."""
+    random.seed(seed)
+    np.random.seed(seed)
+    game = GameState.new_game(resource_path("factions.json"), size, size, army_points, hp_bucket=hp_bucket)
+    undo_log = UndoLog()
+    game.track_changes(undo_log)
+    rng = random.Random(seed)
+    seen = {}  # Key -> position
+    actions = 0
+
+    def fail(message):
+        failures.append(f"game {seed}, step {step}: {message}")
+
+    for step in range(steps):
+        if game.game_over:
+            break
+        before, key, mark = exact_state(game), game.position_key(), undo_log.mark()
+
+        for _ in range(2):
+            for _ in range(rng.randint(1, 5)):
+                if game.game_over:
+                    break
+                game.apply(rng.choice(game.legal_actions()))
+                actions += 1
+                other = seen.setdefault(game.position_key(), position(game))
+                if other != position(game):
+                    fail("two different positions share a key")
+            game.undo_to(mark)
+            if exact_state(game) != before:
+                fail("undo_to() did not restore the state")
+            if game.position_key() != key:
+                fail("undo_to() did not restore the key")
+
+        clone = game.clone()
+        if clone.position_key() != key:
+            fail("a clone has a different key")
+        if not clone.game_over:
+            clone.apply(rng.choice(clone.legal_actions()))
+            if exact_state(game) != before:
+                fail("playing on a clone changed the original")
+        if step % 10 == 0 and saved_and_loaded(game).position_key() != key:
+            fail("a saved and loaded game has a different key")
+
+        game.apply(rng.choice(game.legal_actions()))
+        actions += 1
+    return actions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check make/unmake, cloning and Zobrist keys on random games")
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--steps", type=int, default=100, help="Actions played per game")
+    parser.add_argument("--size", type=int, default=10, help="Map rows and columns")
+    parser.add_argument("--points", type=int, default=30, help="Army points per side")
+    parser.add_argument("--hp-bucket", type=int, default=1, help="HP values per Zobrist bucket")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    enable_zobrist_checks()  # Same as FST_DEBUG_ZOBRIST=1: every key read is recomputed in full
+    warnings.filterwarnings("ignore", message="Ability .* is not in the ability registry")
+    failures = []
+    actions = sum(check_game(args.seed + game, args.size, args.points, args.hp_bucket, args.steps, failures)
+                  for game in range(args.games))
+
+    for failure in failures[:20]:
+        print(failure)
+    print(f"{args.games} games, {actions} actions checked, {len(failures)} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
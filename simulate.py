@@ -0,0 +1,198 @@
+"""
+Match Simulator for Fantasy Squad Tactics
+
+Plays complete matches headlessly to measure faction balance:
+- Every ordered pairing of the factions in factions.json (each faction plays both sides) at each army budget
+- Armies from build_army and maps from generate_game_map, played out by GameState with pluggable policies
+- Matches fan out across a ProcessPoolExecutor; each match seeds its own generators from the base seed and
+  its index, so results don't depend on which worker ran it or in what order
+- Results stream to a JSON-lines file as they finish, then win rates, average game length and games
+  per second are printed
+
+Example:
+    python simulate.py --games 50 --points 20 40 --policy greedy --out results.jsonl
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+import warnings
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from itertools import permutations
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from assets import resource_path
+from game_state import GameState
+from policies import POLICIES
+from populate import DEFAULT_TERRAIN_WEIGHTS, build_army, generate_game_map, load_factions, place_units_on_map
+from special_abilities import SpecialAbilitySystem
+
+MAX_TURNS = 200  # A match still undecided after this many turns is a draw
+
+
+@dataclass(frozen=True)
+class MatchSpec:
+    """Everything needed to replay one match"""
+    index: int
+    seed: int
+    factions: Tuple[str, str]  # Army 1, army 2
+    army_points: int
+    height: int
+    width: int
+    policies: Tuple[str, str]
+    max_turns: int = MAX_TURNS
+
+
+def match_specs(faction_names: List[str], points: List[int], games: int, height: int, width: int,
+                policies: Tuple[str, str], seed: int = 0, max_turns: int = MAX_TURNS) -> Iterator[MatchSpec]:
+    index = 0
+    for army_points in points:
+        for pairing in permutations(faction_names, 2):
+            for _ in range(games):
+                yield MatchSpec(index, seed * 1_000_003 + index, pairing, army_points, height, width, policies,
+                                max_turns)
+                index += 1
+
+
+def setup_match(spec: MatchSpec, factions: Dict[str, dict]) -> GameState:
+    """Seed the generators for this match and deploy both armies on a fresh map"""
+    random.seed(spec.seed)
+    np.random.seed(spec.seed % 2 ** 32)
+    army1 = build_army(factions[spec.factions[0]], spec.army_points)
+    army2 = build_army(factions[spec.factions[1]], spec.army_points)
+    game_map = generate_game_map(spec.height, spec.width, DEFAULT_TERRAIN_WEIGHTS)
+    ability_system = SpecialAbilitySystem()
+    unit_positions = place_units_on_map(game_map, army1, army2, ability_system=ability_system)
+    game = GameState(game_map, unit_positions, ability_system=ability_system)
+    game.refresh_effects()
+    return game
+
+
+def play_match(spec: MatchSpec, factions: Dict[str, dict]) -> dict:
+    """Play one match to the end (or to max_turns) and summarise it"""
+    start = time.perf_counter()
+    try:
+        game = setup_match(spec, factions)
+    except ValueError as error:
+        return dict(asdict(spec), error=str(error))  # The armies don't fit on the map
+    rng = random.Random(spec.seed)
+    policies = [POLICIES[name] for name in spec.policies]
+    actions = 0
+    while not game.game_over and game.turns_played < spec.max_turns:
+        game.apply(policies[game.current_turn - 1](game, rng))
+        actions += 1
+
+    winner = game.winner
+    return dict(asdict(spec),
+                winner=winner,
+                winning_faction=spec.factions[winner - 1] if winner else None,
+                turns=game.turns_played,
+                actions=actions,
+                survivors=[len(game.units_of(army)) for army in (1, 2)],
+                seconds=time.perf_counter() - start)
+
+
+# Worker processes load the factions once and keep them here
+_worker_factions: Optional[Dict[str, dict]] = None
+
+
+def _init_worker(faction_file: str) -> None:
+    global _worker_factions
+    _worker_factions = {faction["name"]: faction for faction in load_factions(faction_file)}
+    # Every match would repeat the same warnings about specials that have no implementation yet
+    warnings.filterwarnings("ignore", message="Ability .* is not in the ability registry")
+
+
+def _play_in_worker(spec: MatchSpec) -> dict:
+    return play_match(spec, _worker_factions)
+
+
+def run_matches(specs: List[MatchSpec], faction_file: str, workers: int, out_file) -> List[dict]:
+    """Play every match, writing each result as a JSON line as soon as it finishes"""
+    results = []
+
+    def record(result):
+        results.append(result)
+        out_file.write(json.dumps(result) + "\n")
+        out_file.flush()
+
+    if workers <= 1:
+        _init_worker(faction_file)
+        for spec in specs:
+            record(_play_in_worker(spec))
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(faction_file,)) as pool:
+        for future in as_completed([pool.submit(_play_in_worker, spec) for spec in specs]):
+            record(future.result())
+    return results
+
+
+def summarize(results: List[dict], elapsed: float) -> None:
+    """Print win rates per pairing and per faction, average game length and throughput"""
+    failed = [result for result in results if "error" in result]
+    if failed:
+        print(f"{len(failed)} matches could not be set up, e.g. {failed[0]['error']}")
+    results = [result for result in results if "error" not in result]
+
+    pairings = defaultdict(lambda: [0, 0, 0])  # (points, faction 1, faction 2) -> [army 1 wins, army 2 wins, draws]
+    faction_totals = defaultdict(lambda: [0, 0])  # (points, faction) -> [wins, games]
+    for result in results:
+        first, second = result["factions"]
+        points = result["army_points"]
+        pairings[(points, first, second)][result["winner"] - 1 if result["winner"] else 2] += 1
+        for faction in (first, second):
+            faction_totals[(points, faction)][1] += 1
+        if result["winning_faction"]:
+            faction_totals[(points, result["winning_faction"])][0] += 1
+
+    print(f"{'points':>6}  {'army 1':<36} {'army 2':<36} {'games':>5} {'1 wins':>7} {'2 wins':>7} {'draws':>6}")
+    for (points, first, second), (wins1, wins2, draws) in sorted(pairings.items()):
+        games = wins1 + wins2 + draws
+        print(f"{points:>6}  {first:<36} {second:<36} {games:>5} {wins1 / games:>7.1%} {wins2 / games:>7.1%} "
+              f"{draws / games:>6.1%}")
+
+    print(f"\n{'points':>6}  {'faction':<36} {'games':>5} {'win rate':>8}")
+    for (points, faction), (wins, games) in sorted(faction_totals.items()):
+        print(f"{points:>6}  {faction:<36} {games:>5} {wins / games:>8.1%}")
+
+    games = len(results)
+    if games:
+        print(f"\n{games} games in {elapsed:.1f}s: {games / elapsed:.1f} games/s, "
+              f"average length {sum(result['turns'] for result in results) / games:.1f} turns")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Play Fantasy Squad Tactics matches headlessly for faction balance")
+    parser.add_argument("--games", type=int, default=10, help="Matches per ordered faction pairing and budget")
+    parser.add_argument("--points", type=int, nargs="+", default=[20], help="Army point budgets to test")
+    parser.add_argument("--height", type=int, default=10, help="Map rows")
+    parser.add_argument("--width", type=int, default=10, help="Map columns")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy", help="Policy for both armies")
+    parser.add_argument("--policy2", choices=sorted(POLICIES), help="Different policy for army 2")
+    parser.add_argument("--max-turns", type=int, default=MAX_TURNS, help="Turns before a match is a draw")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (1 runs inline)")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed; each match derives its own from it")
+    parser.add_argument("--factions", default=resource_path("factions.json"), help="Factions file")
+    parser.add_argument("--out", default="results.jsonl", help="JSON-lines file the results stream to")
+    args = parser.parse_args(argv)
+
+    faction_names = [faction["name"] for faction in load_factions(args.factions)]
+    specs = list(match_specs(faction_names, args.points, args.games, args.height, args.width,
+                             (args.policy, args.policy2 or args.policy), args.seed, args.max_turns))
+
+    print(f"Playing {len(specs)} matches on {args.workers} workers, writing {args.out}")
+    start = time.perf_counter()
+    with open(args.out, "w") as out_file:
+        results = run_matches(specs, args.factions, args.workers, out_file)
+    summarize(sorted(results, key=lambda result: result["index"]), time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
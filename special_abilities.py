@@ -9,8 +9,45 @@ This module handles all unit special abilities, categorized by type:
 """
 
 import random
+import warnings
+from enum import IntEnum
 from typing import Dict, List, Tuple, Set, Optional, Any
 
+from terrain import RANGE_BONUS, DEFENSE_BONUS, MOVE_COST
+
+
+class AbilityId(IntEnum):
+    """Integer ids for registered abilities, resolved once per unit when the army is placed"""
+    NONE = 0  # No ability, or one the registry doesn't know yet
+    SPOTTER = 1
+    DOUBLE_TAP = 2
+    SWORD_AND_BOARD = 3
+    TRUSTY_STEED = 4
+    ALL_SHES_GOT = 5
+    FOR_THE_KING = 6
+    STRATEGIC_SAVANT = 7
+    VIGILANCE = 8
+    LURE = 9
+    MOBILE_STRIKE = 10
+    FLYING = 11
+    TRAMPLE = 12
+    GRAB = 13
+    WARCRY = 14
+    SMASH = 15
+
+
+# Unknown ability names already reported, so each is warned about once per run
+_reported_unknown_abilities: Set[str] = set()
+
+
+def parse_ability_name(special: str) -> str:
+    """Extract the ability name from a unit's special text ("Name - text" or "Name: text")"""
+    name = special
+    for separator in (" - ", ":"):
+        if separator in name:
+            name = name.split(separator)[0]
+    return name.strip().replace("’", "'")
+
 
 class SpecialAbilitySystem:
     """Manages all special abilities in the game"""
@@ -22,53 +59,71 @@ class SpecialAbilitySystem:
         self.combat_modifiers = {}
         self.ability_registry = self._build_ability_registry()
 
+        # Compiled lookups built from the registry, so dispatch is keyed by AbilityId
+        self.ability_ids: Dict[str, AbilityId] = {name: info["id"] for name, info in self.ability_registry.items()}
+        self.ability_by_id: Dict[AbilityId, Dict[str, Any]] = {info["id"]: info for info in self.ability_registry.values()}
+        self.ability_names: Dict[AbilityId, str] = {info["id"]: name for name, info in self.ability_registry.items()}
+        self.active_handlers = {
+            info["id"]: getattr(self, info["handler"])
+            for info in self.ability_registry.values() if info.get("handler")
+        }
+
     def _build_ability_registry(self) -> Dict[str, Dict[str, Any]]:
         """Build registry of all special abilities with their properties"""
         return {
             # Kingdom of Cantrell
             "Spotter": {
+                "id": AbilityId.SPOTTER,
                 "type": "passive",
                 "description": "Friendly units within range 4 have +1 effective range",
                 "range": 4,
                 "effect": "range_boost"
             },
             "Double tap": {
+                "id": AbilityId.DOUBLE_TAP,
                 "type": "triggered",
                 "description": "On successful hit, may make extra 1 damage attack vs another unit in range",
                 "trigger": "successful_attack",
                 "effect": "bonus_attack"
             },
             "Sword & Board": {
+                "id": AbilityId.SWORD_AND_BOARD,
                 "type": "conditional_passive",
                 "description": "If unit doesn't move, negates first damage point next turn",
                 "condition": "no_movement",
                 "effect": "damage_reduction"
             },
             "Trusty Steed": {
+                "id": AbilityId.TRUSTY_STEED,
                 "type": "conditional_passive",
                 "description": "If unit doesn't attack, +1 move this turn",
                 "condition": "no_attack",
                 "effect": "movement_boost"
             },
             "All She's Got": {
+                "id": AbilityId.ALL_SHES_GOT,
                 "type": "active",
                 "description": "+1 range this turn, but can't move/attack next turn",
                 "cost": "skip_next_turn",
                 "effect": "range_boost_with_penalty"
             },
             "For the King!": {
+                "id": AbilityId.FOR_THE_KING,
                 "type": "active",
                 "description": "Grant friendly unit extra move + melee attack bonus",
                 "range": 4,
                 "effect": "ally_boost"
             },
             "Strategic Savant": {
+                "id": AbilityId.STRATEGIC_SAVANT,
                 "type": "active",
                 "description": "Grant extra attack to friendly unit, bonus move if target defeated",
                 "range": 4,
                 "effect": "tactical_strike"
             },
             "Vigilance": {
+                "id": AbilityId.VIGILANCE,
+                "handler": "_execute_vigilance",
                 "type": "active",
                 "description": "Grant First Strike to nearby allies",
                 "range": 2,
@@ -77,27 +132,34 @@ class SpecialAbilitySystem:
 
             # Fae Armies
             "Lure": {
+                "id": AbilityId.LURE,
+                "handler": "_execute_lure",
                 "type": "active",
                 "description": "Force enemies within 5 squares to move 2 squares toward satyr",
                 "range": 5,
                 "effect": "forced_movement"
             },
             "Mobile Strike": {
+                "id": AbilityId.MOBILE_STRIKE,
                 "type": "active",
                 "description": "Attack then move 2 extra tiles",
                 "effect": "attack_and_move"
             },
             "Flying": {
+                "id": AbilityId.FLYING,
                 "type": "passive",
                 "description": "Can fly over water, move through any terrain for 1 point",
                 "effect": "flight"
             },
             "Trample": {
+                "id": AbilityId.TRAMPLE,
                 "type": "active",
                 "description": "Move through enemy dealing damage, end on open tile",
                 "effect": "trample_attack"
             },
             "Grab": {
+                "id": AbilityId.GRAB,
+                "handler": "_execute_grab",
                 "type": "active",
                 "description": "Pull enemy from 2 tiles away, deal 2 damage",
                 "range": 2,
@@ -106,12 +168,16 @@ class SpecialAbilitySystem:
 
             # Orc, Goblin, Ogre, and Troll Hordes
             "Warcry": {
+                "id": AbilityId.WARCRY,
+                "handler": "_execute_warcry",
                 "type": "active",
                 "description": "Grant all friendly units within 3 squares +1 ATK and +1 effective range for one turn",
                 "range": 3,
                 "effect": "area_buff"
             },
             "Smash": {
+                "id": AbilityId.SMASH,
+                "handler": "_execute_smash",
                 "type": "active",
                 "description": "Deal 2 damage to all adjacent enemy units",
                 "range": 1,
@@ -122,6 +188,21 @@ class SpecialAbilitySystem:
             # This is a framework that can be expanded
         }
 
+    def resolve_ability(self, special: str) -> Tuple[AbilityId, str]:
+        """Parse a unit's special text once into (ability id, ability name). Unknown abilities are reported once."""
+        ability_name = parse_ability_name(special)
+        ability_id = self.ability_ids.get(ability_name, AbilityId.NONE)
+
+        if ability_id == AbilityId.NONE and ability_name and ability_name not in _reported_unknown_abilities:
+            _reported_unknown_abilities.add(ability_name)
+            warnings.warn(f"Ability '{ability_name}' is not in the ability registry and will have no effect")
+
+        return ability_id, ability_name
+
+    def bind_ability(self, unit) -> None:
+        """Resolve a GamePiece's special text into its ability_id and ability_name"""
+        unit.ability_id, unit.ability_name = self.resolve_ability(unit.special)
+
     def get_ability_info(self, ability_name: str) -> Optional[Dict[str, Any]]:
         """Get information about a specific ability"""
         return self.ability_registry.get(ability_name)
@@ -158,8 +239,8 @@ class SpecialAbilitySystem:
 
         return True
 
-    def apply_passive_effects(self, unit, terrain_map, unit_positions) -> Dict[str, Any]:
-        """Apply all passive effects for a unit and return modifications"""
+    def apply_passive_effects(self, unit, terrain_map, unit_positions, next_turn: bool = False) -> Dict[str, Any]:
+        """Apply all passive effects for a unit and return modifications (next_turn: as its next turn starts)"""
         modifications = {
             "range_bonus": 0,
             "move_bonus": 0,
@@ -167,49 +248,37 @@ class SpecialAbilitySystem:
             "special_movement": []
         }
 
-        ability_name = unit.special.split(" - ")[0] if " - " in unit.special else unit.special
-        ability = self.get_ability_info(ability_name)
-
-        if not ability:
-            return modifications
+        ability_id = unit.ability_id
 
         # Handle specific passive abilities
-        if ability_name == "Flying":
+        if ability_id == AbilityId.FLYING:
             modifications["special_movement"].append("flight")
 
-        elif ability_name == "Trusty Steed" and not unit.has_attacked:
+        elif ability_id == AbilityId.TRUSTY_STEED and (next_turn or not unit.has_attacked):
             modifications["move_bonus"] = 1
 
-        elif ability_name == "Sword & Board" and unit.moves_remaining == unit.move:
+        elif ability_id == AbilityId.SWORD_AND_BOARD and (next_turn or unit.moves_remaining == unit.move):
             modifications["damage_reduction"] = 1
 
         return modifications
 
     def get_range_modifications(self, unit, terrain_map, unit_positions) -> int:
         """Calculate range modifications from abilities and other units"""
-        range_bonus = 0
-
-        # Check for Spotter ability from nearby units
-        for other_unit in unit_positions.values():
-            if (other_unit.faction == unit.faction and
-                other_unit != unit and
-                "Spotter" in other_unit.special):
-
-                distance = max(abs(unit.position[0] - other_unit.position[0]),
-                             abs(unit.position[1] - other_unit.position[1]))
-                if distance <= 4:
-                    range_bonus += 1
+        # Spotter and Warcry coverage is kept up to date by the board's aura fields
+        return unit_positions.auras.range_bonus(unit)
 
-        return range_bonus
+    def get_attack_modifications(self, unit, terrain_map, unit_positions) -> int:
+        """Calculate attack modifications from abilities and other units"""
+        return unit_positions.auras.attack_bonus(unit)
 
     def get_available_active_abilities(self, unit, terrain_map, unit_positions) -> List[Dict[str, Any]]:
-        """Get list of active abilities this unit can currently use"""
+        """Get list of active abilities this unit can currently use (only those with an implementation)"""
         available = []
 
-        ability_name = unit.special.split(" - ")[0] if " - " in unit.special else unit.special
-        ability = self.get_ability_info(ability_name)
+        ability = self.ability_by_id.get(unit.ability_id)
 
-        if ability and self.is_active_ability(ability_name):
+        if ability and ability.get("type") == "active" and unit.ability_id in self.active_handlers:
+            ability_name = self.ability_names[unit.ability_id]
             if self.can_use_ability(unit, ability_name, {}):
                 available.append({
                     "name": ability_name,
@@ -226,37 +295,23 @@ class SpecialAbilitySystem:
         ability = self.get_ability_info(ability_name)
         if not ability or not self.can_use_ability(unit, ability_name, {}):
             return {"success": False, "message": "Cannot use ability"}
+        handler = self.active_handlers.get(ability["id"])
+        if ability.get("type") == "active" and handler is None:
+            return {"success": False, "message": f"{ability_name} is not implemented yet"}
 
         # Mark that ability was used (most abilities count as attacking)
-        if ability_name not in ["Trusty Steed"]:  # Some abilities don't prevent attacking
+        if ability["id"] != AbilityId.TRUSTY_STEED:  # Some abilities don't prevent attacking
             unit.has_attacked = True
 
         result = {"success": True, "effects": []}
 
         # Execute specific abilities
-        if ability_name == "Lure":
-            result.update(self._execute_lure(unit, terrain_map, unit_positions))
-
-        elif ability_name == "Mobile Strike":
-            result.update(self._execute_mobile_strike(unit, target_pos, terrain_map, unit_positions))
-
-        elif ability_name == "Trample":
-            result.update(self._execute_trample(unit, target_pos, terrain_map, unit_positions))
-
-        elif ability_name == "Grab":
-            result.update(self._execute_grab(unit, target_pos, terrain_map, unit_positions))
-
-        elif ability_name == "Warcry":
-            result.update(self._execute_warcry(unit, terrain_map, unit_positions))
-
-        elif ability_name == "Smash":
-            result.update(self._execute_smash(unit, terrain_map, unit_positions))
-
-        # Add more ability executions as needed
+        if handler:
+            result.update(handler(unit, target_pos, terrain_map, unit_positions))
 
         return result
 
-    def _execute_lure(self, unit, terrain_map, unit_positions) -> Dict[str, Any]:
+    def _execute_lure(self, unit, target_pos, terrain_map, unit_positions) -> Dict[str, Any]:
         """Execute Satyr's Lure ability"""
         affected_units = []
 
@@ -273,12 +328,10 @@ class SpecialAbilitySystem:
                     new_pos = (target.position[0] + dy, target.position[1] + dx)
 
                     # Validate new position
-                    if (0 <= new_pos[0] < terrain_map.shape[0] and
-                        0 <= new_pos[1] < terrain_map.shape[1] and
-                        not any(u.position == new_pos for u in unit_positions.values())):
+                    if self._can_enter(new_pos, terrain_map, unit_positions):
 
-                        target.position = new_pos
-                        target.terrain = terrain_map[new_pos[0], new_pos[1]]
+                        unit_positions.relocate(target.unit_id, new_pos)
+                        target.terrain = int(terrain_map[new_pos[0], new_pos[1]])
                         affected_units.append(target.name)
 
         return {
@@ -305,21 +358,25 @@ class SpecialAbilitySystem:
     def _execute_grab(self, unit, target_pos, terrain_map, unit_positions) -> Dict[str, Any]:
         """Execute Forest Lord's Grab ability"""
         # Find target at position
-        target = None
-        for u in unit_positions.values():
-            if u.position == target_pos and u.faction != unit.faction:
-                target = u
-                break
+        target = unit_positions.unit_at(target_pos) if target_pos else None
+        if target and target.faction == unit.faction:
+            target = None
 
         if not target:
             return {"success": False, "message": "No valid target"}
 
         # Pull target to adjacent square and deal damage
         target.hp -= 2
-        # Position target adjacent to Forest Lord (simplified)
-        adjacent_pos = (unit.position[0] + 1, unit.position[1])  # This needs proper calculation
-        target.position = adjacent_pos
-        target.terrain = terrain_map[adjacent_pos[0], adjacent_pos[1]]
+        already_adjacent = max(abs(unit.position[0] - target.position[0]),
+                               abs(unit.position[1] - target.position[1])) <= 1
+        if target.hp <= 0:
+            del unit_positions[target.unit_id]
+        elif not already_adjacent:
+            # Position target on the free square adjacent to the Forest Lord that is closest to it
+            adjacent_pos = self._closest_free_adjacent(unit.position, target.position, terrain_map, unit_positions)
+            if adjacent_pos:
+                unit_positions.relocate(target.unit_id, adjacent_pos)
+                target.terrain = int(terrain_map[adjacent_pos[0], adjacent_pos[1]])
 
         return {
             "message": f"{unit.name} grabs {target.name} for 2 damage",
@@ -327,17 +384,12 @@ class SpecialAbilitySystem:
             "target_moved": True
         }
 
-    def _execute_warcry(self, unit, terrain_map, unit_positions) -> Dict[str, Any]:
+    def _execute_warcry(self, unit, target_pos, terrain_map, unit_positions) -> Dict[str, Any]:
         """Execute Gorak's Warcry ability"""
-        affected_units = []
+        unit_positions.auras.add_pulse("Warcry", unit)
 
-        for ally in unit_positions.values():
-            if ally.faction == unit.faction and ally != unit:
-                distance = max(abs(unit.position[0] - ally.position[0]),
-                             abs(unit.position[1] - ally.position[1]))
-                if distance <= 3:
-                    # This would need integration with effects system to apply buffs
-                    affected_units.append(ally.name)
+        affected_units = [ally.name for ally in unit_positions.values()
+                          if ally.faction == unit.faction and unit_positions.auras.bonus_count("Warcry", ally)]
 
         return {
             "message": f"{unit.name} rallies {len(affected_units)} allies with a mighty warcry!",
@@ -345,7 +397,22 @@ class SpecialAbilitySystem:
             "buff_applied": "attack_and_range_bonus"
         }
 
-    def _execute_smash(self, unit, terrain_map, unit_positions) -> Dict[str, Any]:
+    def _execute_vigilance(self, unit, target_pos, terrain_map, unit_positions) -> Dict[str, Any]:
+        """Execute Sir Gideon's Vigilance ability"""
+        # Used in place of both move and attack
+        unit.moves_remaining = 0
+        unit_positions.auras.add_pulse("Vigilance", unit)
+
+        affected_units = [ally.name for ally in unit_positions.values()
+                          if ally.faction == unit.faction and unit_positions.auras.bonus_count("Vigilance", ally)]
+
+        return {
+            "message": f"{unit.name} grants First Strike to {len(affected_units)} allies",
+            "affected_units": affected_units,
+            "buff_applied": "first_strike"
+        }
+
+    def _execute_smash(self, unit, target_pos, terrain_map, unit_positions) -> Dict[str, Any]:
         """Execute Ogre Brute's Smash ability"""
         damaged_units = []
 
@@ -358,21 +425,18 @@ class SpecialAbilitySystem:
                 adjacent_pos = (unit.position[0] + dr, unit.position[1] + dc)
 
                 # Find enemy units at adjacent positions
-                for target in unit_positions.values():
-                    if (target.position == adjacent_pos and
-                        target.faction != unit.faction):
-
-                        target.hp -= 2
-                        damaged_units.append({
-                            "name": target.name,
-                            "damage": 2,
-                            "remaining_hp": target.hp
-                        })
-
-                        # Remove defeated units
-                        if target.hp <= 0:
-                            # This would need integration with main game to properly remove units
-                            pass
+                target = unit_positions.unit_at(adjacent_pos)
+                if target and target.faction != unit.faction:
+                    target.hp -= 2
+                    damaged_units.append({
+                        "name": target.name,
+                        "damage": 2,
+                        "remaining_hp": target.hp
+                    })
+
+                    # Remove defeated units
+                    if target.hp <= 0:
+                        del unit_positions[target.unit_id]
 
         return {
             "message": f"{unit.name} smashes nearby enemies for 2 damage each!",
@@ -380,6 +444,24 @@ class SpecialAbilitySystem:
             "total_enemies_hit": len(damaged_units)
         }
 
+    @staticmethod
+    def _can_enter(pos, terrain_map, unit_positions) -> bool:
+        """Whether a unit can be put on pos: on the map, passable (not Lake) and unoccupied"""
+        return (0 <= pos[0] < terrain_map.shape[0] and 0 <= pos[1] < terrain_map.shape[1] and
+                MOVE_COST[terrain_map[pos[0], pos[1]]] != float("inf") and unit_positions.unit_at(pos) is None)
+
+    @classmethod
+    def _closest_free_adjacent(cls, center, toward, terrain_map, unit_positions) -> Optional[Tuple[int, int]]:
+        """Enterable square next to center that is closest (Chebyshev) to toward, or None"""
+        candidates = []
+        for dr in [-1, 0, 1]:
+            for dc in [-1, 0, 1]:
+                pos = (center[0] + dr, center[1] + dc)
+                if (dr != 0 or dc != 0) and cls._can_enter(pos, terrain_map, unit_positions):
+                    distance = max(abs(pos[0] - toward[0]), abs(pos[1] - toward[1]))
+                    candidates.append((distance, pos))
+        return min(candidates)[1] if candidates else None
+
 
 # Helper functions for integration with main game
 def get_unit_effective_range(unit, terrain_map, unit_positions, ability_system):
@@ -387,8 +469,7 @@ def get_unit_effective_range(unit, terrain_map, unit_positions, ability_system):
     base_range = unit.range
 
     # Terrain bonus (Mountain)
-    if terrain_map[unit.position[0], unit.position[1]] == "Mountain":
-        base_range += 1
+    base_range += int(RANGE_BONUS[terrain_map[unit.position[0], unit.position[1]]])
 
     # Ability bonuses
     range_bonus = ability_system.get_range_modifications(unit, terrain_map, unit_positions)
@@ -401,8 +482,7 @@ def apply_damage_reductions(unit, incoming_damage, terrain_map, ability_system):
     final_damage = incoming_damage
 
     # Terrain reduction (Forest)
-    if terrain_map[unit.position[0], unit.position[1]] == "Forest":
-        final_damage -= 1
+    final_damage -= int(DEFENSE_BONUS[terrain_map[unit.position[0], unit.position[1]]])
 
     # Ability reductions
     modifications = ability_system.apply_passive_effects(unit, terrain_map, {})
@@ -411,7 +491,7 @@ def apply_damage_reductions(unit, incoming_damage, terrain_map, ability_system):
     return max(1, final_damage)  # Minimum 1 damage
 
 
-def get_movement_modifications(unit, terrain_map, unit_positions, ability_system):
+def get_movement_modifications(unit, terrain_map, unit_positions, ability_system, next_turn: bool = False):
     """Get movement modifications from abilities"""
-    modifications = ability_system.apply_passive_effects(unit, terrain_map, unit_positions)
+    modifications = ability_system.apply_passive_effects(unit, terrain_map, unit_positions, next_turn)
     return modifications["move_bonus"], modifications["special_movement"]
\ No newline at end of file
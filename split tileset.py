@@ -54,9 +54,10 @@ def split_tileset(tileset_path, json_path, output_dir):
 
         faction_start_row += faction_tile_count // 4
 
-# Example usage
-split_tileset(
-    tileset_path="graphics/tileset.png",
-    json_path="factions.json",
-    output_dir="graphics"
-)
+if __name__ == "__main__":
+    # Regenerates the individual tiles; run build_atlas.py afterwards to repack them
+    split_tileset(
+        tileset_path="graphics/tileset.png",
+        json_path="factions.json",
+        output_dir="graphics"
+    )
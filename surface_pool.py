@@ -0,0 +1,47 @@
+"""
+Surface Pool for Fantasy Squad Tactics
+
+Keeps surface allocation out of the frame loop:
+- Solid and translucent plates (HP backdrops, fallback status indicators) built once per size and colour
+- Every surface the renderer creates goes through the pool, so allocations can be counted per frame
+- Returned plates are shared; blit them, don't draw on them
+"""
+
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+Size = Tuple[int, int]
+Color = Tuple[int, int, int]
+
+
+class SurfacePool:
+    """Shared plates keyed by (size, colour, alpha) plus an allocation counter"""
+
+    def __init__(self):
+        self._plates: Dict[Tuple[Size, Color, Optional[int]], pygame.Surface] = {}
+        self.allocations = 0  # Surfaces created through the pool since startup
+
+    def surface(self, size: Size, flags: int = 0, depth_source: Optional[pygame.Surface] = None) -> pygame.Surface:
+        """A new surface (layers, tooltips); counted, not pooled"""
+        self.allocations += 1
+        if depth_source is not None:
+            return pygame.Surface(size, flags, depth_source)
+        return pygame.Surface(size, flags)
+
+    def plate(self, size: Size, color: Color, alpha: Optional[int] = None) -> pygame.Surface:
+        """Filled rectangle of size and colour, with surface alpha if given, built on first use"""
+        key = (size, color, alpha)
+        plate = self._plates.get(key)
+        if plate is None:
+            plate = self._plates[key] = self.surface(size)
+            plate.fill(color)
+            if alpha is not None:
+                plate.set_alpha(alpha)
+        return plate
+
+    def clear(self) -> None:
+        self._plates.clear()
+
+    def __len__(self) -> int:
+        return len(self._plates)
@@ -0,0 +1,69 @@
+"""
+Terrain for Fantasy Squad Tactics
+
+Terrain maps are stored as small integer codes (uint8) rather than strings:
+- Terrain enum shared by the map generator, rules and renderer
+- Lookup tables indexed by terrain code (move cost, defense, range, attack, healing)
+- A name view for code that still wants terrain names (console map, tooltips)
+"""
+
+from enum import IntEnum
+
+import numpy as np
+
+
+class Terrain(IntEnum):
+    """Terrain codes. Order matches the tiles in graphics/tileset.png"""
+    PLAINS = 0
+    FOREST = 1
+    MOUNTAIN = 2
+    LAKE = 3
+    RIVER = 4
+    FARM = 5
+    VILLAGE = 6
+    CITY = 7
+
+    @property
+    def label(self) -> str:
+        """Display name, also used for the tile graphic file name"""
+        return self.name.title()
+
+
+TERRAIN_DTYPE = np.uint8
+
+TERRAIN_NAMES = np.array([terrain.label for terrain in Terrain])
+
+# Lookup tables indexed by terrain code; use table[terrain_map] for whole-map lookups
+MOVE_COST = np.array([1, 2, 3, np.inf, 3, 1, 1, 2], dtype=np.float64)
+DEFENSE_BONUS = np.array([0, 1, 0, 0, 0, 0, 0, 0], dtype=np.int8)  # Forest negates 1 damage
+RANGE_BONUS = np.array([0, 0, 1, 0, 0, 0, 0, 0], dtype=np.int8)  # Mountain gives +1 range
+ATTACK_BONUS = np.array([0, 0, 1, 0, 0, 0, 0, 0], dtype=np.int8)  # Mountain gives +1 damage vs lower ground
+HEALING = np.array([0, 0, 0, 0, 0, 1, 0, 0], dtype=np.int8)  # Farm heals 1 HP per turn
+
+
+def terrain_code(name: str) -> Terrain:
+    """Convert a terrain name such as "Plains" to its code"""
+    return Terrain[name.upper()]
+
+
+def terrain_name(code) -> str:
+    """Convert a terrain code to its display name"""
+    return str(TERRAIN_NAMES[code])
+
+
+class TerrainNameView:
+    """Read-only view of a terrain code map that yields terrain names instead of codes"""
+
+    def __init__(self, terrain_map):
+        self.codes = terrain_map
+
+    @property
+    def shape(self):
+        return self.codes.shape
+
+    def __getitem__(self, key):
+        return TERRAIN_NAMES[self.codes[key]]
+
+    def __array__(self, dtype=None, copy=None):
+        names = TERRAIN_NAMES[self.codes]
+        return names if dtype is None else names.astype(dtype)
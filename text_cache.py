@@ -0,0 +1,117 @@
+"""
+Text Cache for Fantasy Squad Tactics
+
+Keeps rendered text out of the frame loop:
+- FontRegistry opens each (font file, size) once
+- TextCache memoizes rendered surfaces by (font, string, color) with LRU eviction
+- Text widths and word-wrapped lines are memoized by (font, text) and (font, text, width)
+"""
+
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import pygame
+
+from assets import resource_path
+
+FONT_FILE = resource_path('IMFellEnglishSC-Regular.ttf')
+# Font sizes the renderers look up by name
+GAME_FONT_SIZES = {"font": 24, "small": 18, "large": 35, "tiny": 12}
+
+Color = Tuple[int, int, int]
+
+
+class FontRegistry:
+    """Each font face/size is opened once and shared"""
+
+    def __init__(self, default_file: str = FONT_FILE):
+        self.default_file = default_file
+        self._fonts: Dict[Tuple[str, int], pygame.font.Font] = {}
+
+    def get(self, size: int, file: str = None) -> pygame.font.Font:
+        key = (file or self.default_file, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = pygame.font.Font(key[0], size)
+        return font
+
+    def game_fonts(self) -> Dict[str, pygame.font.Font]:
+        """The named fonts the board, UI and tooltip renderers draw with"""
+        return {name: self.get(size) for name, size in GAME_FONT_SIZES.items()}
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces. Returned surfaces are shared; blit them, don't draw on them."""
+
+    def __init__(self, max_entries: int = 1024, max_wraps: int = 128):
+        self.max_entries = max_entries
+        self.max_wraps = max_wraps
+        self._surfaces: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self._widths: Dict[tuple, int] = {}
+        self._wraps: "OrderedDict[tuple, Tuple[str, ...]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font: pygame.font.Font, text: str, color: Color, antialias: bool = True) -> pygame.Surface:
+        key = (font, text, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self._surfaces[key] = font.render(text, antialias, color)
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def width(self, font: pygame.font.Font, text: str) -> int:
+        """Rendered width of text, without rendering it"""
+        key = (font, text)
+        width = self._widths.get(key)
+        if width is None:
+            if len(self._widths) >= self.max_entries:
+                self._widths.clear()
+            width = self._widths[key] = font.size(text)[0]
+        return width
+
+    def wrap(self, font: pygame.font.Font, text: str, max_width: int) -> Tuple[str, ...]:
+        """Split text into lines no wider than max_width (a single long word gets its own line)"""
+        key = (font, text, max_width)
+        lines = self._wraps.get(key)
+        if lines is not None:
+            self._wraps.move_to_end(key)
+            return lines
+
+        wrapped = []
+        current_line = ""
+        for word in text.split():
+            test_line = current_line + (" " if current_line else "") + word
+            if font.size(test_line)[0] <= max_width:
+                current_line = test_line
+            else:
+                if current_line:
+                    wrapped.append(current_line)
+                current_line = word
+        if current_line:
+            wrapped.append(current_line)
+
+        lines = self._wraps[key] = tuple(wrapped)
+        if len(self._wraps) > self.max_wraps:
+            self._wraps.popitem(last=False)
+        return lines
+
+    def clear(self) -> None:
+        self._surfaces.clear()
+        self._widths.clear()
+        self._wraps.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "surfaces": len(self._surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,129 @@
+"""
+Threat Maps for Fantasy Squad Tactics
+
+Answers "which tiles can the enemy hit next turn, and how hard" for a faction:
+- Reachable tiles of every enemy unit as at the start of its next turn: full movement, and Trusty Steed's
+  extra move even if it has attacked this turn
+- Effective range from each of those tiles (base range, Mountain bonus, Spotter and Warcry auras)
+- Potential damage per tile and the units threatening each tile
+- Cached per faction until the map, a unit, an aura or an effect changes
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from legal_cache import game_state_version
+from pathfinding import find_reachable_tiles
+from range_queries import chebyshev_dilate
+from terrain import ATTACK_BONUS, DEFENSE_BONUS, RANGE_BONUS
+
+Position = Tuple[int, int]
+
+
+@dataclass
+class ThreatMap:
+    """Incoming threat against one faction"""
+    faction: str  # The threatened faction
+    unit_ids: List[str]  # Enemy units, in the order of masks
+    masks: np.ndarray  # (N, H, W) bool: can unit n attack this tile next turn
+    damage: np.ndarray  # (H, W) int: summed potential damage to a unit standing on each tile
+
+    def threat_count(self, position: Position) -> int:
+        return int(np.count_nonzero(self.masks[:, position[0], position[1]]))
+
+    def damage_at(self, position: Position) -> int:
+        return int(self.damage[position])
+
+    def is_threatened(self, position: Position) -> bool:
+        return bool(self.damage[position])
+
+    def threatening_units(self, position: Position) -> List[str]:
+        """Ids of the enemy units that can attack this tile next turn"""
+        return [self.unit_ids[i] for i in np.flatnonzero(self.masks[:, position[0], position[1]])]
+
+    def safe_mask(self) -> np.ndarray:
+        """(H, W) boolean mask of tiles no enemy can attack next turn"""
+        return self.damage == 0
+
+
+def unit_threat(unit, terrain_map, movement_costs, unit_positions, ability_system) -> np.ndarray:
+    """
+    (H, W) int grid of the damage this unit could deal to a unit on each tile next turn (0 = out of reach).
+    Takes the best tile to attack from; terrain defense on the target tile is applied, abilities are not.
+    """
+    reachability = find_reachable_tiles(unit, terrain_map, movement_costs, unit_positions, ability_system,
+                                        next_turn=True)
+    rows, cols = np.array(list(reachability.costs), dtype=np.intp).T
+    origin_terrain = terrain_map[rows, cols]
+
+    auras = unit_positions.auras
+    in_warcry = (auras.bonus_field("Warcry", unit)[rows, cols] > 0).astype(np.int32)
+    ranges = unit.range + RANGE_BONUS[origin_terrain] + auras.bonus_field("Spotter", unit)[rows, cols] + in_warcry
+    base_damage = unit.atk + in_warcry
+    mountain_bonus = ATTACK_BONUS[origin_terrain]
+
+    # Attacking a unit that itself stands on bonus terrain gives no Mountain bonus
+    target_on_bonus_terrain = ATTACK_BONUS[terrain_map] > 0
+
+    # Few distinct (range, damage, bonus) combinations exist, so dilate one origin mask per combination
+    damage = np.zeros(terrain_map.shape, dtype=np.int32)
+    groups = np.stack([ranges, base_damage, mountain_bonus], axis=1)
+    for radius, group_damage, bonus in np.unique(groups, axis=0):
+        selected = np.all(groups == (radius, group_damage, bonus), axis=1)
+        origins = np.zeros(terrain_map.shape, dtype=bool)
+        origins[rows[selected], cols[selected]] = True
+        reach = chebyshev_dilate(origins, int(radius))
+        tile_damage = np.where(target_on_bonus_terrain, group_damage, group_damage + bonus)
+        damage = np.where(reach, np.maximum(damage, tile_damage), damage)
+
+    # Forest defense on the target tile, minimum 1 damage as in apply_damage_reductions
+    return np.where(damage > 0, np.maximum(damage - DEFENSE_BONUS[terrain_map], 1), 0)
+
+
+def build_threat_map(faction: str, terrain_map, movement_costs, unit_positions, ability_system) -> ThreatMap:
+    unit_ids = [unit_id for unit_id, unit in unit_positions.items() if unit.faction != faction]
+    grids = [unit_threat(unit_positions[unit_id], terrain_map, movement_costs, unit_positions, ability_system)
+             for unit_id in unit_ids]
+
+    if grids:
+        stacked = np.stack(grids)
+        return ThreatMap(faction, unit_ids, stacked > 0, stacked.sum(axis=0))
+    return ThreatMap(faction, unit_ids, np.zeros((0,) + terrain_map.shape, dtype=bool),
+                     np.zeros(terrain_map.shape, dtype=np.int32))
+
+
+class ThreatMaps:
+    """Threat maps per faction, rebuilt only after the map, a unit, an aura or an effect changes"""
+
+    def __init__(self, movement_costs, ability_system, effects_system=None):
+        self.movement_costs = movement_costs
+        self.ability_system = ability_system
+        self.effects_system = effects_system
+        self._cache: Dict[str, Tuple[tuple, ThreatMap]] = {}
+        self.builds = 0
+
+    def state_key(self, terrain_map, unit_positions) -> tuple:
+        """The map's contents and the versions of everything else a threat map reads (no id()s, which get reused)"""
+        return (np.asarray(terrain_map).tobytes(),) + game_state_version(unit_positions, self.effects_system)
+
+    def for_faction(self, faction: str, terrain_map, unit_positions) -> ThreatMap:
+        """Threat against a faction's units, from the cache when nothing relevant changed"""
+        key = self.state_key(terrain_map, unit_positions)
+        cached = self._cache.get(faction)
+        if cached is None or cached[0] != key:
+            threat = build_threat_map(faction, terrain_map, self.movement_costs, unit_positions, self.ability_system)
+            cached = self._cache[faction] = (key, threat)
+            self.builds += 1
+        return cached[1]
+
+    def for_unit(self, unit, terrain_map, unit_positions) -> ThreatMap:
+        """Threat against the unit's faction"""
+        return self.for_faction(unit.faction, terrain_map, unit_positions)
+
+    def invalidate(self, faction: Optional[str] = None) -> None:
+        if faction is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(faction, None)
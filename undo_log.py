@@ -0,0 +1,41 @@
+"""
+Undo Log for Fantasy Squad Tactics
+
+Make/unmake support for search over a GameState:
+- While a log is attached (GameState.track_changes), every change to unit stats, positions, auras, effects
+  and the turn records how to reverse it
+- mark() names the current point; undo_to(mark) reverses everything recorded since, newest first, in time
+  proportional to the number of changes
+- Version counters keep increasing on undo, so caches keyed on them never serve a value from a
+  different state that happened to share a version number
+"""
+
+from typing import Any, Callable, List, Tuple
+
+
+class UndoLog:
+    """Stack of (restore function, arguments) entries"""
+
+    def __init__(self):
+        self._entries: List[Tuple[Callable[..., None], Tuple[Any, ...]]] = []
+
+    def record(self, restore: Callable[..., None], *args) -> None:
+        """Push the call that puts back what is about to change"""
+        self._entries.append((restore, args))
+
+    def mark(self) -> int:
+        return len(self._entries)
+
+    def undo_to(self, mark: int) -> None:
+        """Reverse every change recorded after mark"""
+        entries = self._entries
+        while len(entries) > mark:
+            restore, args = entries.pop()
+            restore(*args)
+
+    def clear(self) -> None:
+        """Forget recorded changes, keeping the current state"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
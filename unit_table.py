@@ -0,0 +1,155 @@
+"""
+Unit Table for Fantasy Squad Tactics
+
+Stores unit stats for a whole battle as parallel NumPy columns (struct of arrays):
+- One row per unit, addressed by a stable index that GamePiece views hold on to
+- Faction and unit class stored as small integer codes
+- Whole-army operations (turn reset, terrain healing) as single vectorized statements
+- Writes record their old values in an attached UndoLog (see undo_log.py) and update an attached Zobrist key
+  (see zobrist.py); clone() copies the columns
+"""
+
+import copy
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Column name -> dtype
+COLUMNS = {
+    "hp": np.int32,
+    "max_hp": np.int32,
+    "atk": np.int32,
+    "move": np.int32,
+    "moves_remaining": np.int32,
+    "range": np.int32,
+    "row": np.int32,
+    "col": np.int32,
+    "terrain": np.uint8,
+    "faction": np.int16,
+    "unit_class": np.int16,
+    "army": np.int8,
+    "has_attacked": np.bool_,
+    "alive": np.bool_,
+}
+
+# Original max HP by class, used for Farm healing; other classes heal up to their starting HP
+MAX_HP_BY_CLASS = {
+    "Scout": 7, "Ranger": 10, "Melee": 15, "Heavy": 22, "Artillery": 12, "Leader": 24
+}
+
+
+class UnitTable:
+    """Parallel arrays of unit stats. Rows are never reused, so indices stay valid after a unit dies."""
+
+    def __init__(self, capacity: int = 16):
+        self.capacity = max(1, capacity)
+        self.size = 0
+        for name, dtype in COLUMNS.items():
+            setattr(self, name, np.zeros(self.capacity, dtype=dtype))
+
+        self.faction_names: List[str] = []
+        self.class_names: List[str] = []
+        self._faction_codes: Dict[str, int] = {}
+        self._class_codes: Dict[str, int] = {}
+        self.unit_ids: List[Optional[str]] = []  # Row -> unit id, for keys that must not depend on row order
+        self.version = 0  # Bumped on every write to any row
+        self.undo_log = None  # UndoLog that writes record their old values in, while a search is running
+        self.zobrist = None  # ZobristHash told about every write, once a position key has been asked for
+
+    def _grow(self) -> None:
+        self.capacity *= 2
+        for name in COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(self.capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+
+    def faction_code(self, faction_name: str) -> int:
+        if faction_name not in self._faction_codes:
+            self._faction_codes[faction_name] = len(self.faction_names)
+            self.faction_names.append(faction_name)
+        return self._faction_codes[faction_name]
+
+    def class_code(self, class_name: str) -> int:
+        if class_name not in self._class_codes:
+            self._class_codes[class_name] = len(self.class_names)
+            self.class_names.append(class_name)
+        return self._class_codes[class_name]
+
+    def add(self, unit_class: str, hp: int, move: int, range: int, atk: int, position, terrain: int,
+            faction: str, army: int = 0, unit_id: Optional[str] = None) -> int:
+        """Append a unit and return its row index"""
+        if self.size == self.capacity:
+            self._grow()
+
+        index = self.size
+        self.size += 1
+
+        self.hp[index] = hp
+        self.max_hp[index] = MAX_HP_BY_CLASS.get(unit_class, hp)
+        self.atk[index] = atk
+        self.move[index] = move
+        self.moves_remaining[index] = move
+        self.range[index] = range
+        self.row[index], self.col[index] = position
+        self.terrain[index] = terrain
+        self.faction[index] = self.faction_code(faction)
+        self.unit_class[index] = self.class_code(unit_class)
+        self.army[index] = army
+        self.has_attacked[index] = False
+        self.alive[index] = True
+        self.unit_ids.append(unit_id)
+        self.version += 1
+        if self.zobrist is not None:
+            self.zobrist.on_unit_added(self, index)
+        return index
+
+    def clone(self) -> "UnitTable":
+        """Copy of the table with its own columns"""
+        clone = copy.copy(self)
+        for name in COLUMNS:
+            setattr(clone, name, getattr(self, name).copy())
+        clone.faction_names, clone.class_names = list(self.faction_names), list(self.class_names)
+        clone.unit_ids = list(self.unit_ids)
+        clone._faction_codes, clone._class_codes = dict(self._faction_codes), dict(self._class_codes)
+        clone.undo_log = clone.zobrist = None
+        return clone
+
+    def set(self, column: str, index, value) -> None:
+        """Write one cell (or the cells at an index array) of a column"""
+        array = getattr(self, column)
+        old = array[index].copy() if self.undo_log is not None or self.zobrist is not None else None
+        if self.undo_log is not None:
+            self.undo_log.record(self._restore, column, index, old)
+        array[index] = value
+        self.version += 1
+        if self.zobrist is not None:
+            self.zobrist.on_unit_write(self, column, index, old)
+
+    def _restore(self, column: str, index, value) -> None:
+        array = getattr(self, column)
+        old = array[index].copy() if self.zobrist is not None else None
+        array[index] = value
+        self.version += 1
+        if self.zobrist is not None:
+            self.zobrist.on_unit_write(self, column, index, old)
+
+    def live_mask(self) -> np.ndarray:
+        """Boolean mask over rows [0, size) of units still in play"""
+        return self.alive[:self.size]
+
+    def army_mask(self, army: int) -> np.ndarray:
+        return self.live_mask() & (self.army[:self.size] == army)
+
+    def start_turn(self, army: int) -> None:
+        """Restore movement and attacks for every live unit of an army"""
+        rows = np.flatnonzero(self.army_mask(army))
+        self.set("moves_remaining", rows, self.move[rows])
+        self.set("has_attacked", rows, False)
+
+    def apply_healing(self, healing_table: np.ndarray) -> None:
+        """Heal every live unit by its terrain's healing value, capped at max HP"""
+        n = self.size
+        healing = healing_table[self.terrain[:n]]
+        rows = np.flatnonzero(self.live_mask() & (healing > 0) & (self.hp[:n] < self.max_hp[:n]))
+        self.set("hp", rows, np.minimum(self.hp[rows] + healing[rows], self.max_hp[rows]))
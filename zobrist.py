@@ -0,0 +1,180 @@
+"""
+Zobrist Hashing for Fantasy Squad Tactics
+
+A 64-bit key for "this exact game position", for transposition tables and caches:
+- XOR of one key per feature: each live unit's row, column, HP (optionally bucketed), moves remaining and
+  attack flag, each unit's active effects, each cast aura pulse, and the side to move
+- Units are identified by their unit id, so a position keeps its key however its UnitTable rows are ordered
+  (a loaded save packs the rows of dead units away)
+- Feature keys are derived from the feature by splitmix64 rather than read from a random table, so they
+  need no table sized to the map or the HP range and are the same in every process
+- Kept up to date by hooks in UnitTable, EffectsSystem and AuraFields, undo included: O(1) per stat write,
+  and an effect or pulse change rehashes only that unit's effects or the few live pulses
+- Optional checking of every incremental key against a full recomputation
+"""
+
+import hashlib
+import os
+from functools import lru_cache
+from typing import Dict, Optional
+
+import numpy as np
+
+MASK = (1 << 64) - 1
+
+# Verify the incremental key against a full recomputation whenever it is read. Slow, meant for debugging.
+DEBUG_ZOBRIST_CHECKS = os.environ.get("FST_DEBUG_ZOBRIST") == "1"
+
+
+def enable_zobrist_checks(enabled: bool = True) -> None:
+    """Turn the Zobrist key checker on or off"""
+    global DEBUG_ZOBRIST_CHECKS
+    DEBUG_ZOBRIST_CHECKS = enabled
+
+
+# Unit table columns in the key -> feature code
+UNIT_FEATURES = {"row": 1, "col": 2, "hp": 3, "moves_remaining": 4, "has_attacked": 5}
+EFFECT_FEATURE = 6
+PULSE_FEATURE = 7
+SIDE_TO_MOVE = 8
+
+
+def splitmix64(value: int) -> int:
+    value = (value + 0x9E3779B97F4A7C15) & MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK
+    return value ^ (value >> 31)
+
+
+@lru_cache(maxsize=None)
+def text_code(text: str) -> int:
+    """Stable 64-bit code for a name (str hashes change between processes)"""
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+
+@lru_cache(maxsize=1 << 16)
+def feature_key(*parts: int) -> int:
+    key = 0
+    for part in parts:
+        key = splitmix64(key ^ (part & MASK))
+    return key
+
+
+SIDE_TO_MOVE_KEY = feature_key(SIDE_TO_MOVE)
+
+
+class ZobristHash:
+    """Incrementally maintained key of the units, effects and auras of one battle"""
+
+    def __init__(self, hp_bucket: int = 1):
+        self.hp_bucket = hp_bucket  # HP values hashed as hp // hp_bucket; 1 keeps positions exact
+        self.value = 0  # Everything but the side to move
+        self._effect_keys: Dict[str, int] = {}  # unit_id -> XOR of its effects' keys
+        self._pulse_key = 0
+        self._unit_positions = None
+        self._effects_system = None
+
+    def attach(self, unit_positions, effects_system) -> None:
+        """Compute the key from scratch and keep it current from now on"""
+        self._unit_positions, self._effects_system = unit_positions, effects_system
+        unit_positions.table.zobrist = self
+        unit_positions.auras.zobrist = self
+        effects_system.zobrist = self
+        self.value = self.recompute()
+        self._effect_keys = {unit_id: self._effects_key(unit_id, effects)
+                             for unit_id, effects in effects_system.unit_effects.items()}
+        self._pulse_key = self._pulses_key(unit_positions.auras.pulses)
+
+    def detach(self) -> None:
+        if self._unit_positions is not None:
+            self._unit_positions.table.zobrist = None
+            self._unit_positions.auras.zobrist = None
+            self._effects_system.zobrist = None
+        self._unit_positions = self._effects_system = None
+
+    def key(self, current_turn: int) -> int:
+        """The position's key with the army to move folded in"""
+        if DEBUG_ZOBRIST_CHECKS:
+            self.check()
+        return self.value ^ (SIDE_TO_MOVE_KEY if current_turn == 2 else 0)
+
+    # Feature keys
+
+    def _unit_feature(self, table, column: str, row: int, value) -> int:
+        value = int(value)
+        if column == "hp":
+            value //= self.hp_bucket
+        return feature_key(UNIT_FEATURES[column], text_code(table.unit_ids[row] or f"row {row}"), value)
+
+    def _unit_key(self, table, row: int) -> int:
+        """XOR of every feature of one unit"""
+        key = 0
+        for column in UNIT_FEATURES:
+            key ^= self._unit_feature(table, column, row, getattr(table, column)[row])
+        return key
+
+    @staticmethod
+    def _effects_key(unit_id: str, effects: Optional[dict]) -> int:
+        key = 0
+        for effect in (effects or {}).values():
+            key ^= feature_key(EFFECT_FEATURE, text_code(unit_id), text_code(effect.name), int(effect.value),
+                               effect.turns_remaining)
+        return key
+
+    @staticmethod
+    def _pulses_key(pulses) -> int:
+        key = 0
+        for pulse in pulses:
+            key ^= feature_key(PULSE_FEATURE, text_code(pulse.aura), text_code(pulse.faction), pulse.position[0],
+                               pulse.position[1], pulse.turns_remaining, text_code(pulse.source_unit_id))
+        return key
+
+    def recompute(self) -> int:
+        """The key computed from scratch (without the side to move)"""
+        table = self._unit_positions.table
+        key = 0
+        for row in np.flatnonzero(table.live_mask()):
+            key ^= self._unit_key(table, row)
+        for unit_id, effects in self._effects_system.unit_effects.items():
+            key ^= self._effects_key(unit_id, effects)
+        return key ^ self._pulses_key(self._unit_positions.auras.pulses)
+
+    def check(self) -> None:
+        """Raise AssertionError if the incremental key has drifted from a full recomputation"""
+        expected = self.recompute()
+        assert self.value == expected, f"Incremental Zobrist key {self.value:#x} != recomputed {expected:#x}"
+
+    # Change hooks
+
+    def on_unit_write(self, table, column: str, index, old) -> None:
+        """Called by UnitTable after it overwrites old with new values at index (a row or an array of rows)"""
+        if column != "alive" and column not in UNIT_FEATURES:
+            return
+        if isinstance(index, np.ndarray):  # Whole-army writes: turn resets, healing
+            for row, old_value in zip(index.tolist(), old.tolist()):
+                self._unit_changed(table, column, row, old_value)
+        else:
+            self._unit_changed(table, column, index, old)
+
+    def _unit_changed(self, table, column: str, row: int, old) -> None:
+        if column == "alive":
+            if bool(old) != bool(table.alive[row]):
+                self.value ^= self._unit_key(table, row)
+        elif table.alive[row]:
+            self.value ^= self._unit_feature(table, column, row, old) ^ \
+                self._unit_feature(table, column, row, getattr(table, column)[row])
+
+    def on_unit_added(self, table, row: int) -> None:
+        self.value ^= self._unit_key(table, row)
+
+    def on_effects_changed(self, unit_id: str, effects: Optional[dict]) -> None:
+        """Called by EffectsSystem after any change to a unit's effects"""
+        key = self._effects_key(unit_id, effects)
+        self.value ^= self._effect_keys.get(unit_id, 0) ^ key
+        self._effect_keys[unit_id] = key
+
+    def on_pulses_changed(self, pulses) -> None:
+        """Called by AuraFields after a pulse is cast, counts down, expires or is undone"""
+        key = self._pulses_key(pulses)
+        self.value ^= self._pulse_key ^ key
+        self._pulse_key = key